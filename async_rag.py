@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Async RAG Pipeline
+asyncio version of rag_query for scripted evaluation runs: AsyncIndex/AsyncGroq
+clients, many questions in flight at once under a rate-limit semaphore.
+
+Retrieval-cache hits skip the vector query entirely: cached results are
+dropped whenever the index version changes, so a hit is already current.
+Identical retrievals/completions in flight at once share one upstream call,
+which is cancelled once no question is waiting for it any more.
+
+Usage:
+  python async_rag.py                              - Run every 100_terror_questions_part*.txt
+  python async_rag.py <file> [<file> ...]          - Run specific Q&A question files
+  Options: --concurrency N  --limit N  --output results.json
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import asyncio
+import inspect
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from groq import AsyncGroq
+import qa_parser
+from local_vector import LocalIndex, LOCAL_INDEX_PATH
+from retrieval_cache import RetrievalCache, print_cache_stats
+from single_flight import AsyncSingleFlight, flight_key, print_flight_stats
+from context_packer import ContextPacker, print_packer_stats
+from latency_stats import percentile
+
+# Load environment variables from .env.local
+load_dotenv('.env.local')
+
+# Constants
+GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+RAG_CONCURRENCY = int(os.getenv('RAG_CONCURRENCY', 8))
+QUESTION_FILES = "100_terror_questions_part*.txt"
+TOP_K = 3
+
+SYSTEM_PROMPT = "You are Lovely Pearl B. Alan, a BSIT student at St. Paul University Philippines. Answer all questions in FIRST PERSON as if YOU are Lovely speaking directly about YOUR OWN background, skills, and experience. Always use 'I', 'my', 'me' - NEVER refer to Lovely in third person. Be honest and natural - you're a talented student with real achievements, currently pursuing your degree and looking for opportunities to grow."
+
+
+def open_async_index(backend=None):
+    """AsyncIndex for Upstash; the in-process local index is used as-is"""
+    backend = (backend or os.getenv('VECTOR_BACKEND', 'upstash')).lower()
+    if backend == 'local':
+        return LocalIndex(os.getenv('LOCAL_INDEX_PATH', LOCAL_INDEX_PATH))
+
+    from upstash_vector import AsyncIndex
+    return AsyncIndex.from_env()
+
+
+def build_prompt(question, results, packer: Optional[ContextPacker] = None) -> Optional[str]:
+    """Same context/prompt layout as rag_query in chat_digitaltwin.py (packed to a token budget when a packer is given)"""
+    if packer is not None:
+        top_docs, _ = packer.pack(results)
+    else:
+        top_docs = []
+        for result in results or []:
+            metadata = result.metadata or {}
+            content = metadata.get('content', '')
+            if content:
+                top_docs.append(f"{metadata.get('title', 'Information')}: {content}")
+    if not top_docs:
+        return None
+
+    context = "\n\n".join(top_docs)
+    return f"""Based on the following information about you (Lovely Pearl B. Alan), answer the question in FIRST PERSON.
+
+Important: You ARE Lovely. Use "I", "my", "me" throughout your answer. Never refer to yourself in third person.
+
+Your Information:
+{context}
+
+Question: {question}
+
+Answer as Lovely herself:"""
+
+
+class AsyncRAG:
+    """Concurrent retrieval + generation with a shared semaphore for rate limiting"""
+
+    def __init__(self, index=None, groq_client=None, model=DEFAULT_MODEL, concurrency=RAG_CONCURRENCY,
+                 retrieval_cache=None):
+        self.index = index or open_async_index()
+        self.groq = groq_client or AsyncGroq(api_key=GROQ_API_KEY)
+        self.model = model
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.retrieval_cache = retrieval_cache if retrieval_cache is not None else RetrievalCache()
+        self.retrieval_flight = AsyncSingleFlight("retrieval")
+        self.generation_flight = AsyncSingleFlight("generation")
+        self.context_packer = ContextPacker()
+
+    async def query_vectors(self, question, top_k=TOP_K):
+        results = await self.retrieval_flight.do(flight_key(question, top_k=top_k), self._search, question, top_k)
+        if results:
+            self.retrieval_cache.put(question, results, top_k=top_k)
+        return results
+
+    async def _search(self, question, top_k):
+        async with self.semaphore:
+            if inspect.iscoroutinefunction(self.index.query):
+                return await self.index.query(data=question, top_k=top_k, include_metadata=True)
+            return await asyncio.to_thread(self.index.query, data=question, top_k=top_k, include_metadata=True)
+
+    async def generate(self, prompt) -> str:
+        """Identical prompts in flight at once (same question and context) share one completion"""
+        return await self.generation_flight.do(flight_key(prompt, model=self.model), self._generate, prompt)
+
+    async def _generate(self, prompt) -> str:
+        async with self.semaphore:
+            completion = await self.groq.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=500
+            )
+        return completion.choices[0].message.content.strip()
+
+    async def rag_query(self, question) -> Dict[str, Any]:
+        """Answer one question; returns the answer with per-stage timings"""
+        start = time.perf_counter()
+        result = {"question": question, "answer": None, "retrieval_cached": False, "error": None}
+        try:
+            results = self.retrieval_cache.get(question, top_k=TOP_K)
+            if results:
+                result["retrieval_cached"] = True
+            else:
+                results = await self.query_vectors(question)
+            result["retrieval_seconds"] = time.perf_counter() - start
+            result["sources"] = [r.id for r in results or []]
+
+            prompt = build_prompt(question, results, self.context_packer)
+            result["answer"] = (await self.generate(prompt) if prompt
+                                else "I don't have specific information about that topic.")
+        except Exception as e:
+            result["error"] = str(e)
+        result["total_seconds"] = time.perf_counter() - start
+        return result
+
+    async def batch_rag_query(self, questions: List[str]) -> List[Dict[str, Any]]:
+        """Run many questions concurrently; results come back in input order"""
+        return await asyncio.gather(*(self.rag_query(question) for question in questions))
+
+
+async def batch_rag_query(questions: List[str], concurrency=RAG_CONCURRENCY, **options) -> List[Dict[str, Any]]:
+    """Convenience wrapper creating a pipeline for one batch"""
+    return await AsyncRAG(concurrency=concurrency, **options).batch_rag_query(questions)
+
+
+def load_questions(paths) -> List[str]:
+    questions = []
+    for path in paths:
+        questions.extend(pair.question for pair in qa_parser.iter_qa_file(path))
+    return questions
+
+
+async def run_files(paths, concurrency=RAG_CONCURRENCY, limit=None, output=None):
+    questions = load_questions(paths)[:limit]
+    print(f"🚀 Running {len(questions)} questions from {len(paths)} file(s) with concurrency {concurrency}...")
+
+    pipeline = AsyncRAG(concurrency=concurrency)
+    start = time.perf_counter()
+    results = await pipeline.batch_rag_query(questions)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r["error"]]
+    latencies = [r["total_seconds"] for r in results if not r["error"]]
+    print(f"\n📊 {len(results) - len(failed)}/{len(results)} answered in {elapsed:.2f}s "
+          f"({len(results) / elapsed if elapsed else 0:.1f} questions/sec)")
+    print(f"⏱️ Latency p50 {percentile(latencies, 50):.2f}s, p95 {percentile(latencies, 95):.2f}s")
+    print_cache_stats(pipeline.retrieval_cache)
+    print_flight_stats(pipeline.retrieval_flight, pipeline.generation_flight)
+    print_packer_stats(pipeline.context_packer)
+    for r in failed[:5]:
+        print(f"   ❌ {r['question'][:60]}: {r['error']}")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Results saved to {output}")
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    options = {"concurrency": RAG_CONCURRENCY, "limit": None, "output": None}
+    paths = []
+    while args:
+        arg = args.pop(0)
+        if arg in ("--concurrency", "--limit"):
+            options[arg[2:]] = int(args.pop(0))
+        elif arg == "--output":
+            options["output"] = args.pop(0)
+        else:
+            paths.append(arg)
+
+    paths = paths or sorted(glob.glob(QUESTION_FILES))
+    if not paths:
+        print(f"❌ No question files found ({QUESTION_FILES})")
+        return
+    if not GROQ_API_KEY:
+        print("❌ GROQ_API_KEY not found in .env file")
+        return
+
+    asyncio.run(run_files(paths, **options))
+
+
+if __name__ == "__main__":
+    main()
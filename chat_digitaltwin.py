@@ -6,19 +6,55 @@ Based on Binal's production implementation
 - Groq: Ultra-fast LLM inference
 """
 
+import time
+_IMPORT_START = time.perf_counter()
+
 import os
-import json
+import sys
 from dotenv import load_dotenv
-from upstash_vector import Index
-from groq import Groq
+import rag_client
 
 # Load environment variables from .env.local
 load_dotenv('.env.local')
 
+# Thin-client mode: hand the session to a running rag_service.py before any SDK, index or cache is loaded
+if __name__ == "__main__" and "--stream" not in sys.argv and os.getenv('CHAT_STREAM', '0') != '1':
+    _service = rag_client.connect(sys.argv)
+    if _service:
+        print("🤖 Your Digital Twin - AI Profile Assistant")
+        rag_client.chat_session(_service, learn=False)
+        sys.exit(0)
+
+from retrieval_cache import RetrievalCache
+from semantic_cache import SemanticCache
+from llm_stream import TokenPrinter, stream_chat_completion, print_stream_stats
+from chat_startup import run_concurrently, print_startup_times, setup_vector_database
+from chat_stats import print_all_stats
+from single_flight import SingleFlight, flight_key
+from context_packer import ContextPacker, print_pack_report
+from diversify import ResultDiversifier
+from rerank import Reranker, print_rerank_report
+from hybrid_search import HYBRID_SEARCH_ENABLED, get_hybrid_retriever
+
 # Constants
 JSON_FILE = "data/digitaltwin.json"
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 DEFAULT_MODEL = "llama-3.1-8b-instant"
+STREAM_RESPONSES = os.getenv('CHAT_STREAM', '0') == '1'
+
+# Repeated questions reuse their retrieval results until the index changes
+retrieval_cache = RetrievalCache()
+# Answers to already-answered (or paraphrased) questions skip retrieval and generation
+semantic_cache = SemanticCache()
+# Identical questions in flight at the same time (e.g. in rag_service.py) share one upstream call
+retrieval_flight = SingleFlight("retrieval")
+generation_flight = SingleFlight("generation")
+# Retrieved documents are deduplicated and packed into CONTEXT_TOKEN_BUDGET prompt tokens
+context_packer = ContextPacker()
+# Near-identical stored answers collapse to one; top_k is an upper bound, not a fixed count
+diversifier = ResultDiversifier()
+# Second-stage scoring of the candidate pool; per-query latency is printed so it can be turned off
+reranker = Reranker()
 
 def setup_groq_client():
     """Setup Groq client"""
@@ -27,6 +63,8 @@ def setup_groq_client():
         return None
     
     try:
+        # Deferred: the SDK import is the slowest part of startup and runs in parallel with the index setup
+        from groq import Groq
         client = Groq(api_key=GROQ_API_KEY)
         print("✅ Groq client initialized successfully!")
         return client
@@ -34,108 +72,63 @@ def setup_groq_client():
         print(f"❌ Error initializing Groq client: {str(e)}")
         return None
 
-def setup_vector_database():
-    """Setup Upstash Vector database with built-in embeddings"""
-    print("🔄 Setting up Upstash Vector database...")
-    
-    try:
-        index = Index.from_env()
-        print("✅ Connected to Upstash Vector successfully!")
-        
-        # Check current vector count
-        try:
-            info = index.info()
-            current_count = getattr(info, 'vector_count', 0)
-            print(f"📊 Current vectors in database: {current_count}")
-        except:
-            current_count = 0
-        
-        # Load data if database is empty
-        if current_count == 0:
-            print("📝 Loading your professional profile...")
-            
-            try:
-                # Try different encodings
-                encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'cp1252']
-                profile_data = None
-                
-                for encoding in encodings:
-                    try:
-                        with open(JSON_FILE, "r", encoding=encoding) as f:
-                            profile_data = json.load(f)
-                        break
-                    except (UnicodeDecodeError, json.JSONDecodeError):
-                        continue
-                
-                if not profile_data:
-                    print(f"❌ Could not decode {JSON_FILE}")
-                    return None
-                    
-            except FileNotFoundError:
-                print(f"❌ {JSON_FILE} not found!")
-                return None
-            
-            # Prepare vectors from content chunks
-            vectors = []
-            content_chunks = profile_data.get('content_chunks', [])
-            
-            if not content_chunks:
-                print("❌ No content chunks found in profile data")
-                return None
-            
-            for chunk in content_chunks:
-                enriched_text = f"{chunk['title']}: {chunk['content']}"
-                
-                vectors.append((
-                    chunk['id'],
-                    enriched_text,
-                    {
-                        "title": chunk['title'],
-                        "type": chunk['type'],
-                        "content": chunk['content'],
-                        "category": chunk.get('metadata', {}).get('category', ''),
-                        "tags": ','.join(chunk.get('metadata', {}).get('tags', []))
-                    }
-                ))
-            
-            # Upload vectors
-            index.upsert(vectors=vectors)
-            print(f"✅ Successfully uploaded {len(vectors)} content chunks!")
-        
-        return index
-        
-    except Exception as e:
-        print(f"❌ Error setting up database: {str(e)}")
-        return None
-
 def query_vectors(index, query_text, top_k=3):
-    """Query Upstash Vector for similar vectors"""
+    """Query the vector database (fused with BM25 keyword hits), reusing cached results for repeated questions.
+    A larger candidate pool is reranked (optional cross-encoder/lexical stage) and reduced to at
+    most top_k diverse documents (adaptive k + MMR)."""
+    cached = retrieval_cache.get(query_text, top_k=top_k)
+    if cached is not None:
+        return cached
+    
+    def search():
+        pool = max(diversifier.pool(top_k), reranker.pool(top_k))
+        if HYBRID_SEARCH_ENABLED:
+            candidates = get_hybrid_retriever(index).search(query_text, top_k=pool)
+        else:
+            candidates = index.query(
+                data=query_text,
+                top_k=pool,
+                include_metadata=True
+            )
+        candidates, report = reranker.rerank(query_text, candidates)
+        print_rerank_report(report)
+        return diversifier.select(candidates, top_k)
+    
     try:
-        results = index.query(
-            data=query_text,
-            top_k=top_k,
-            include_metadata=True
-        )
+        results = retrieval_flight.do(flight_key(query_text, top_k=top_k, hybrid=HYBRID_SEARCH_ENABLED), search)
+        if results:
+            retrieval_cache.put(query_text, results, top_k=top_k)
         return results
     except Exception as e:
         print(f"❌ Error querying vectors: {str(e)}")
         return None
 
-def generate_response_with_groq(client, prompt, model=DEFAULT_MODEL):
-    """Generate response using Groq"""
+def generate_response_with_groq(client, prompt, model=DEFAULT_MODEL, on_token=None):
+    """Generate response using Groq (streamed token by token to on_token when given)"""
+    messages = [
+        {
+            "role": "system",
+            "content": "You are Lovely Pearl B. Alan, a BSIT student at St. Paul University Philippines. Answer all questions in FIRST PERSON as if YOU are Lovely speaking directly about YOUR OWN background, skills, and experience. Always use 'I', 'my', 'me' - NEVER refer to Lovely in third person. Be honest and natural - you're a talented student with real achievements, currently pursuing your degree and looking for opportunities to grow."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+    
     try:
-        completion = client.chat.completions.create(
+        if on_token:
+            stats = stream_chat_completion(client, model, messages, temperature=0.7, max_tokens=500,
+                                           on_token=on_token)
+            print_stream_stats(stats)
+            return stats["text"].strip()
+        
+        # Only non-streamed calls are coalesced: a streaming caller needs its own tokens
+        completion = generation_flight.do(
+            flight_key(prompt, model=model, temperature=0.7, max_tokens=500),
+            client.chat.completions.create,
             model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are Lovely Pearl B. Alan, a BSIT student at St. Paul University Philippines. Answer all questions in FIRST PERSON as if YOU are Lovely speaking directly about YOUR OWN background, skills, and experience. Always use 'I', 'my', 'me' - NEVER refer to Lovely in third person. Be honest and natural - you're a talented student with real achievements, currently pursuing your degree and looking for opportunities to grow."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
+            messages=messages,
             temperature=0.7,
             max_tokens=500
         )
@@ -145,9 +138,16 @@ def generate_response_with_groq(client, prompt, model=DEFAULT_MODEL):
     except Exception as e:
         return f"❌ Error generating response: {str(e)}"
 
-def rag_query(index, groq_client, question):
+def rag_query(index, groq_client, question, on_token=None):
     """Perform RAG query using Upstash Vector + Groq"""
     try:
+        # Step 0: Reuse the stored answer for a question we've already answered
+        cached = semantic_cache.lookup(question)
+        if cached:
+            print(f"\n⚡ Answered from semantic cache (matches '{cached['question'][:50]}', "
+                  f"similarity {cached['similarity']:.3f})")
+            return cached["answer"]
+        
         # Step 1: Query vector database
         results = query_vectors(index, question, top_k=3)
         
@@ -157,16 +157,13 @@ def rag_query(index, groq_client, question):
         # Step 2: Extract relevant content
         print("\n🧠 Searching your professional profile...")
         
-        top_docs = []
         for result in results:
             metadata = result.metadata or {}
-            title = metadata.get('title', 'Information')
-            content = metadata.get('content', '')
-            score = result.score
-            
-            print(f"🔹 Found: {title} (Relevance: {score:.3f})")
-            if content:
-                top_docs.append(f"{title}: {content}")
+            print(f"🔹 Found: {metadata.get('title', 'Information')} (Relevance: {result.score:.3f})")
+        
+        # Drop sentences repeated across documents and keep the best passages within the token budget
+        top_docs, report = context_packer.pack(results)
+        print_pack_report(report)
         
         if not top_docs:
             return "I found some information but couldn't extract details."
@@ -186,7 +183,9 @@ Question: {question}
 
 Answer as Lovely herself:"""
         
-        response = generate_response_with_groq(groq_client, prompt)
+        response = generate_response_with_groq(groq_client, prompt, on_token=on_token)
+        if response and not response.startswith("❌"):
+            semantic_cache.add(question, response)
         return response
     
     except Exception as e:
@@ -200,21 +199,36 @@ def main():
     print(f"⚡ AI Inference: Groq ({DEFAULT_MODEL})")
     print("📋 Data Source: Your Professional Profile\n")
     
-    # Setup clients
-    groq_client = setup_groq_client()
-    if not groq_client:
-        return
+    # Module imports (and module-level setup) up to here; everything below is client init
+    import_seconds = time.perf_counter() - _IMPORT_START
+    stream = STREAM_RESPONSES or "--stream" in sys.argv
+    if "--no-semantic-cache" in sys.argv:
+        semantic_cache.enabled = False
+    if "--no-rerank" in sys.argv:
+        reranker.enabled = False
     
-    index = setup_vector_database()
-    if not index:
+    # Setup clients - Groq, the vector index and the semantic cache are independent
+    init_start = time.perf_counter()
+    ready, steps = run_concurrently({
+        "groq": setup_groq_client,
+        "vector": lambda: setup_vector_database(check_index="--check-index" in sys.argv),
+        "semantic cache": lambda: semantic_cache.seed_from_profile(JSON_FILE)
+    })
+    groq_client, index, seeded = ready["groq"], ready["vector"], ready["semantic cache"]
+    if not groq_client or not index:
         return
     
+    if semantic_cache.enabled:
+        print(f"⚡ Semantic answer cache: {seeded} known Q&A pairs "
+              f"(threshold {semantic_cache.threshold:.2f})")
+    
+    print_startup_times(import_seconds, time.perf_counter() - init_start, steps)
     print("✅ Your Digital Twin is ready!\n")
     
     # Interactive chat loop
     print("🤖 Chat with your AI Digital Twin!")
     print("Ask questions about your experience, skills, projects, or career goals.")
-    print("Type 'exit' to quit.\n")
+    print("Type 'stats' for cache statistics, 'exit' to quit.\n")
     
     print("💭 Try asking:")
     print("  - 'Tell me about your work experience'")
@@ -227,11 +241,24 @@ def main():
         question = input("You: ")
         if question.lower() in ["exit", "quit"]:
             print("👋 Thanks for chatting with your Digital Twin!")
+            print_all_stats(retrieval_cache, semantic_cache, retrieval_flight, generation_flight,
+                            context_packer, diversifier, reranker)
             break
         
+        if question.strip().lower() == "stats":
+            print_all_stats(retrieval_cache, semantic_cache, retrieval_flight, generation_flight,
+                            context_packer, diversifier, reranker)
+            print()
+            continue
+        
         if question.strip():
-            answer = rag_query(index, groq_client, question)
-            print(f"🤖 Digital Twin: {answer}\n")
+            # Streamed answers are printed as they arrive; cached or error answers print here
+            printer = TokenPrinter() if stream else None
+            answer = rag_query(index, groq_client, question, on_token=printer)
+            if printer and printer.started and not answer.startswith("❌"):
+                print()
+            else:
+                print(f"🤖 Digital Twin: {answer}\n")
 
 if __name__ == "__main__":
     main()
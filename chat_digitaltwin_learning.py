@@ -4,20 +4,65 @@ Digital Twin RAG Application with Learning Capability
 Automatically saves every Q&A interaction to improve over time
 """
 
+import time
+_IMPORT_START = time.perf_counter()
+
 import os
-import json
-from datetime import datetime
+import sys
 from dotenv import load_dotenv
-from upstash_vector import Index
-from groq import Groq
+import rag_client
 
 # Load environment variables from .env.local
 load_dotenv('.env.local')
 
+# Thin-client mode: hand the session to a running rag_service.py before any SDK, index or cache is loaded
+if __name__ == "__main__" and "--stream" not in sys.argv and os.getenv('CHAT_STREAM', '0') != '1':
+    _service = rag_client.connect(sys.argv)
+    if _service:
+        print("🤖 Your Digital Twin - AI Profile Assistant (Learning Mode)")
+        rag_client.chat_session(_service, learn=True)
+        sys.exit(0)
+
+from datetime import datetime
+from retrieval_cache import RetrievalCache
+from semantic_cache import SemanticCache
+from llm_stream import TokenPrinter, stream_chat_completion, print_stream_stats
+from chat_startup import run_concurrently, print_startup_times, setup_vector_database
+from chat_stats import print_all_stats
+from single_flight import SingleFlight, flight_key
+from context_packer import ContextPacker, print_pack_report
+from diversify import ResultDiversifier
+from rerank import Reranker, print_rerank_report
+from hybrid_search import HYBRID_SEARCH_ENABLED, get_hybrid_retriever, learned_qa_id
+from qa_store import get_qa_store
+from qa_index import QuestionIndex
+from qa_persistence import QAPersistenceWorker, print_persistence_stats
+
 # Constants
 JSON_FILE = "data/digitaltwin.json"
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 DEFAULT_MODEL = "llama-3.1-8b-instant"
+STREAM_RESPONSES = os.getenv('CHAT_STREAM', '0') == '1'
+
+# Learned Q&A persistence (append-only by default; compacted into JSON_FILE on exit) and the
+# normalized-question index for constant-time repeat detection - both opened in main by setup_qa_store
+qa_store_backend = None
+question_index = None
+# Repeated questions reuse their retrieval results until the index changes
+retrieval_cache = RetrievalCache()
+# Answers to already-answered (or paraphrased) questions skip retrieval and generation
+semantic_cache = SemanticCache()
+# Identical questions in flight at the same time (e.g. in rag_service.py) share one upstream call
+retrieval_flight = SingleFlight("retrieval")
+generation_flight = SingleFlight("generation")
+# Retrieved documents are deduplicated and packed into CONTEXT_TOKEN_BUDGET prompt tokens
+context_packer = ContextPacker()
+# Near-identical stored answers collapse to one; top_k is an upper bound, not a fixed count
+diversifier = ResultDiversifier()
+# Second-stage scoring of the candidate pool; per-query latency is printed so it can be turned off
+reranker = Reranker()
+# Background writer for learned Q&A (started in main once the index is connected)
+persistence_worker = None
 
 def setup_groq_client():
     """Setup Groq client"""
@@ -26,6 +71,8 @@ def setup_groq_client():
         return None
     
     try:
+        # Deferred: the SDK import is the slowest part of startup and runs in parallel with the index setup
+        from groq import Groq
         client = Groq(api_key=GROQ_API_KEY)
         print("✅ Groq client initialized successfully!")
         return client
@@ -33,95 +80,71 @@ def setup_groq_client():
         print(f"❌ Error initializing Groq client: {str(e)}")
         return None
 
-def setup_vector_database():
-    """Setup Upstash Vector database with built-in embeddings"""
-    print("🔄 Setting up Upstash Vector database...")
-    
-    try:
-        index = Index.from_env()
-        print("✅ Connected to Upstash Vector successfully!")
-        
-        # Check current vector count
-        try:
-            info = index.info()
-            current_count = getattr(info, 'vector_count', 0)
-            print(f"📊 Current vectors in database: {current_count}")
-        except:
-            current_count = 0
-        
-        # Load data if database is empty
-        if current_count == 0:
-            print("📝 Loading your professional profile...")
-            
-            try:
-                with open(JSON_FILE, "r", encoding="utf-8") as f:
-                    profile_data = json.load(f)
-                    
-            except FileNotFoundError:
-                print(f"❌ {JSON_FILE} not found!")
-                return None
-            
-            # Prepare vectors from content chunks
-            vectors = []
-            content_chunks = profile_data.get('content_chunks', [])
-            
-            if not content_chunks:
-                print("❌ No content chunks found in profile data")
-                return None
-            
-            for chunk in content_chunks:
-                enriched_text = f"{chunk['title']}: {chunk['content']}"
-                
-                vectors.append((
-                    chunk['id'],
-                    enriched_text,
-                    {
-                        "title": chunk['title'],
-                        "type": chunk['type'],
-                        "content": chunk['content'],
-                        "category": chunk.get('metadata', {}).get('category', ''),
-                        "tags": ','.join(chunk.get('metadata', {}).get('tags', []))
-                    }
-                ))
-            
-            # Upload vectors
-            index.upsert(vectors=vectors)
-            print(f"✅ Successfully uploaded {len(vectors)} content chunks!")
-        
-        return index
-        
-    except Exception as e:
-        print(f"❌ Error setting up database: {str(e)}")
-        return None
+def setup_qa_store():
+    """Open the Q&A store and question index; returns the entries not yet compacted into JSON_FILE"""
+    global qa_store_backend, question_index
+    qa_store_backend = get_qa_store(json_file=JSON_FILE)
+    pending = list(qa_store_backend.pending())
+    question_index = QuestionIndex(json_file=JSON_FILE, pending_entries=pending)
+    return pending
 
 def query_vectors(index, query_text, top_k=3):
-    """Query Upstash Vector for similar vectors"""
+    """Query the vector database (fused with BM25 keyword hits), reusing cached results for repeated questions.
+    A larger candidate pool is reranked (optional cross-encoder/lexical stage) and reduced to at
+    most top_k diverse documents (adaptive k + MMR)."""
+    cached = retrieval_cache.get(query_text, top_k=top_k)
+    if cached is not None:
+        return cached
+    
+    def search():
+        pool = max(diversifier.pool(top_k), reranker.pool(top_k))
+        if HYBRID_SEARCH_ENABLED:
+            candidates = get_hybrid_retriever(index).search(query_text, top_k=pool)
+        else:
+            candidates = index.query(
+                data=query_text,
+                top_k=pool,
+                include_metadata=True
+            )
+        candidates, report = reranker.rerank(query_text, candidates)
+        print_rerank_report(report)
+        return diversifier.select(candidates, top_k)
+    
     try:
-        results = index.query(
-            data=query_text,
-            top_k=top_k,
-            include_metadata=True
-        )
+        results = retrieval_flight.do(flight_key(query_text, top_k=top_k, hybrid=HYBRID_SEARCH_ENABLED), search)
+        if results:
+            retrieval_cache.put(query_text, results, top_k=top_k)
         return results
     except Exception as e:
         print(f"❌ Error querying vectors: {str(e)}")
         return None
 
-def generate_response_with_groq(client, prompt, model=DEFAULT_MODEL):
-    """Generate response using Groq"""
+def generate_response_with_groq(client, prompt, model=DEFAULT_MODEL, on_token=None):
+    """Generate response using Groq (streamed token by token to on_token when given)"""
+    messages = [
+        {
+            "role": "system",
+            "content": "You are Lovely Pearl B. Alan, a BSIT student at St. Paul University Philippines. Answer all questions in FIRST PERSON as if YOU are Lovely speaking directly about YOUR OWN background, skills, and experience. Always use 'I', 'my', 'me' - NEVER refer to Lovely in third person. Be honest and natural - you're a talented student with real achievements, currently pursuing your degree and looking for opportunities to grow."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+    
     try:
-        completion = client.chat.completions.create(
+        if on_token:
+            stats = stream_chat_completion(client, model, messages, temperature=0.7, max_tokens=500,
+                                           on_token=on_token)
+            print_stream_stats(stats)
+            return stats["text"].strip()
+        
+        # Only non-streamed calls are coalesced: a streaming caller needs its own tokens
+        completion = generation_flight.do(
+            flight_key(prompt, model=model, temperature=0.7, max_tokens=500),
+            client.chat.completions.create,
             model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are Lovely Pearl B. Alan, a BSIT student at St. Paul University Philippines. Answer all questions in FIRST PERSON as if YOU are Lovely speaking directly about YOUR OWN background, skills, and experience. Always use 'I', 'my', 'me' - NEVER refer to Lovely in third person. Be honest and natural - you're a talented student with real achievements, currently pursuing your degree and looking for opportunities to grow."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
+            messages=messages,
             temperature=0.7,
             max_tokens=500
         )
@@ -151,105 +174,65 @@ def categorize_question(question):
     return "general"
 
 def save_qa_to_json(question, answer, category):
-    """Save Q&A pair to JSON file"""
+    """Save Q&A pair through the configured Q&A store (see qa_store.py)"""
     try:
-        # Load current profile
-        with open(JSON_FILE, "r", encoding="utf-8") as f:
-            profile_data = json.load(f)
-        
-        # Ensure interview_qa section exists
-        if "interview_qa" not in profile_data:
-            profile_data["interview_qa"] = {
-                "questions_answered": 0,
-                "last_updated": None,
-                "categories": {
-                    "personal": [],
-                    "technical": [],
-                    "projects": [],
-                    "leadership": [],
-                    "behavioral": [],
-                    "career": [],
-                    "general": []
-                }
-            }
+        return qa_store_backend.record(question, answer, category)
         
-        # Create Q&A entry
-        qa_entry = {
+    except Exception as e:
+        print(f"⚠️ Error saving to JSON: {str(e)}")
+        return False
+
+def build_learned_qa_vector(question, answer, category):
+    """Build the vector tuple for a learned Q&A pair"""
+    # Deterministic ID so a repeated question overwrites its previous answer
+    qa_id = learned_qa_id(question, category)
+    
+    # Create enriched text
+    enriched_text = f"Interview Question: {question}\n\nAnswer: {answer}"
+    
+    return (
+        qa_id,
+        enriched_text,
+        {
+            "type": "interview_qa",
             "question": question,
             "answer": answer,
             "category": category,
-            "added_date": datetime.now().isoformat(),
-            "times_asked": 1
+            "title": f"Q&A: {question[:50]}",
+            "content": answer,
+            "tags": f"interview,qa,{category}",
+            "added_date": datetime.now().isoformat()
         }
-        
-        # Check if question already exists
-        existing_category = profile_data["interview_qa"]["categories"].get(category, [])
-        question_exists = False
-        
-        for existing_qa in existing_category:
-            if existing_qa["question"].lower() == question.lower():
-                existing_qa["times_asked"] += 1
-                existing_qa["answer"] = answer  # Update with latest answer
-                question_exists = True
-                break
-        
-        if not question_exists:
-            # Add new Q&A
-            if category not in profile_data["interview_qa"]["categories"]:
-                profile_data["interview_qa"]["categories"][category] = []
-            
-            profile_data["interview_qa"]["categories"][category].append(qa_entry)
-            profile_data["interview_qa"]["questions_answered"] = profile_data["interview_qa"].get("questions_answered", 0) + 1
-        
-        # Update metadata
-        profile_data["interview_qa"]["last_updated"] = datetime.now().isoformat()
-        
-        # Save back to file
-        with open(JSON_FILE, "w", encoding="utf-8") as f:
-            json.dump(profile_data, f, indent=2, ensure_ascii=False)
-        
-        return True
-        
-    except Exception as e:
-        print(f"⚠️ Error saving to JSON: {str(e)}")
-        return False
+    )
 
 def save_qa_to_vector_db(index, question, answer, category):
     """Save Q&A pair to Upstash Vector Database"""
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        qa_id = f"qa_{category}_{timestamp}"
-        
-        # Create enriched text
-        enriched_text = f"Interview Question: {question}\n\nAnswer: {answer}"
-        
-        # Prepare vector
-        vector = (
-            qa_id,
-            enriched_text,
-            {
-                "type": "interview_qa",
-                "question": question,
-                "answer": answer,
-                "category": category,
-                "title": f"Q&A: {question[:50]}",
-                "content": answer,
-                "tags": f"interview,qa,{category}",
-                "added_date": datetime.now().isoformat()
-            }
-        )
-        
         # Upload to vector database
-        index.upsert(vectors=[vector])
+        index.upsert(vectors=[build_learned_qa_vector(question, answer, category)])
         return True
         
     except Exception as e:
         print(f"⚠️ Error saving to vector DB: {str(e)}")
         return False
 
-def rag_query(index, groq_client, question, save_response=True):
+def rag_query(index, groq_client, question, save_response=True, on_token=None):
     """Perform RAG query using Upstash Vector + Groq"""
     try:
+        # Step 0: Reuse the stored answer for a question we've already answered
+        cached = semantic_cache.lookup(question)
+        if cached:
+            print(f"\n⚡ Answered from semantic cache (matches '{cached['question'][:50]}', "
+                  f"similarity {cached['similarity']:.3f})")
+            if save_response:
+                # Count the repeat; the answer (and its vector) are unchanged
+                match = question_index.record(question, categorize_question(question))
+                if persistence_worker:
+                    persistence_worker.submit(match["question"], cached["answer"], match["category"], vector=False)
+                else:
+                    save_qa_to_json(match["question"], cached["answer"], match["category"])
+            return cached["answer"]
+        
         # Step 1: Query vector database
         results = query_vectors(index, question, top_k=3)
         
@@ -259,16 +242,13 @@ def rag_query(index, groq_client, question, save_response=True):
         # Step 2: Extract relevant content
         print("\n🧠 Searching your professional profile...")
         
-        top_docs = []
         for result in results:
             metadata = result.metadata or {}
-            title = metadata.get('title', 'Information')
-            content = metadata.get('content', '')
-            score = result.score
-            
-            print(f"🔹 Found: {title} (Relevance: {score:.3f})")
-            if content:
-                top_docs.append(f"{title}: {content}")
+            print(f"🔹 Found: {metadata.get('title', 'Information')} (Relevance: {result.score:.3f})")
+        
+        # Drop sentences repeated across documents and keep the best passages within the token budget
+        top_docs, report = context_packer.pack(results)
+        print_pack_report(report)
         
         if not top_docs:
             return "I found some information but couldn't extract details."
@@ -288,12 +268,29 @@ Question: {question}
 
 Answer as Lovely herself:"""
         
-        response = generate_response_with_groq(groq_client, prompt)
+        response = generate_response_with_groq(groq_client, prompt, on_token=on_token)
+        if response and not response.startswith("❌"):
+            semantic_cache.add(question, response)
         
         # Step 4: Save Q&A pair (if enabled)
         if save_response and response and not response.startswith("❌"):
-            category = categorize_question(question)
-            print(f"\n💾 Learning from this interaction (category: {category})...")
+            # Resolve repeats (in any category) to the question already on file
+            match = question_index.record(question, categorize_question(question))
+            category = match["category"]
+            if match["is_new"]:
+                print(f"\n💾 Learning from this interaction (category: {category})...")
+            else:
+                print(f"\n💾 Seen before as '{match['question'][:50]}' in {category} "
+                      f"(asked {match['times_asked']} times), updating answer...")
+            question = match["question"]
+            if HYBRID_SEARCH_ENABLED:
+                get_hybrid_retriever(index).add(learned_qa_id(question, category), question, response, category)
+            
+            if persistence_worker:
+                # Saved in the background so the next question isn't blocked on disk and network
+                depth = persistence_worker.submit(question, response, category)
+                print(f"🧠 Queued for saving (queue depth: {depth})")
+                return response
             
             # Save to JSON
             if save_qa_to_json(question, response, category):
@@ -310,8 +307,33 @@ Answer as Lovely herself:"""
     except Exception as e:
         return f"❌ Error during query: {str(e)}"
 
+def compact_qa_store():
+    """Merge Q&A saved this session into the JSON profile"""
+    if not qa_store_backend:
+        return
+    try:
+        merged = qa_store_backend.compact()
+        question_index.mark_synced()
+        if merged:
+            print(f"💾 Compacted {merged} saved Q&A entries into {JSON_FILE}")
+    except Exception as e:
+        print(f"⚠️ Error compacting Q&A store: {str(e)} (entries are kept for the next compaction)")
+
+def finish_session(qa_count):
+    """Flush background saves, compact the Q&A store and print session statistics"""
+    if persistence_worker:
+        if persistence_worker.depth:
+            print(f"💾 Flushing {persistence_worker.depth} queued Q&A saves...")
+        persistence_worker.close()
+        print_persistence_stats(persistence_worker)
+    print(f"🧠 Learned from {qa_count} new questions this session.")
+    compact_qa_store()
+    print_all_stats(retrieval_cache, semantic_cache, retrieval_flight, generation_flight,
+                    context_packer, diversifier, reranker)
+
 def main():
     """Main application loop"""
+    global persistence_worker
     print("🤖 Your Digital Twin - AI Profile Assistant (Learning Mode)")
     print("=" * 60)
     print("🔗 Vector Storage: Upstash (built-in embeddings)")
@@ -319,21 +341,39 @@ def main():
     print("📋 Data Source: Your Professional Profile")
     print("🧠 Auto-Learning: Every Q&A is saved for future improvement\n")
     
-    # Setup clients
-    groq_client = setup_groq_client()
-    if not groq_client:
-        return
+    # Module imports (and module-level setup) up to here; everything below is client init
+    import_seconds = time.perf_counter() - _IMPORT_START
+    stream = STREAM_RESPONSES or "--stream" in sys.argv
+    if "--no-semantic-cache" in sys.argv:
+        semantic_cache.enabled = False
+    if "--no-rerank" in sys.argv:
+        reranker.enabled = False
     
-    index = setup_vector_database()
-    if not index:
+    # Setup clients - Groq, the vector index and the semantic cache are independent
+    init_start = time.perf_counter()
+    ready, steps = run_concurrently({
+        "groq": setup_groq_client,
+        "vector": lambda: setup_vector_database(check_index="--check-index" in sys.argv),
+        # The semantic cache is seeded from the same pending entries the question index is built from
+        "q&a store": lambda: semantic_cache.seed_from_profile(JSON_FILE, setup_qa_store())
+    })
+    groq_client, index, seeded = ready["groq"], ready["vector"], ready["q&a store"]
+    if not groq_client or not index:
         return
     
+    if semantic_cache.enabled:
+        print(f"⚡ Semantic answer cache: {seeded} known Q&A pairs "
+              f"(threshold {semantic_cache.threshold:.2f})")
+    
+    persistence_worker = QAPersistenceWorker(qa_store_backend, index, build_vector=build_learned_qa_vector)
+    
+    print_startup_times(import_seconds, time.perf_counter() - init_start, steps)
     print("✅ Your Digital Twin is ready!\n")
     
     # Interactive chat loop
     print("🤖 Chat with your AI Digital Twin!")
     print("Every question and answer will be saved to improve future responses.")
-    print("Type 'exit' to quit.\n")
+    print("Type 'stats' for cache statistics, 'exit' to quit.\n")
     
     print("💭 Try asking:")
     print("  - 'Tell me about your work experience'")
@@ -344,18 +384,33 @@ def main():
     
     qa_count = 0
     
-    while True:
-        question = input("You: ")
-        if question.lower() in ["exit", "quit"]:
-            print(f"\n👋 Thanks for chatting with your Digital Twin!")
-            print(f"🧠 Learned from {qa_count} new questions this session.")
-            print("Your digital twin is smarter now! 🚀")
-            break
-        
-        if question.strip():
-            answer = rag_query(index, groq_client, question, save_response=True)
-            print(f"🤖 Digital Twin: {answer}\n")
-            qa_count += 1
+    try:
+        while True:
+            question = input("You: ")
+            if question.lower() in ["exit", "quit"]:
+                print(f"\n👋 Thanks for chatting with your Digital Twin!")
+                break
+            
+            if question.strip().lower() == "stats":
+                print_all_stats(retrieval_cache, semantic_cache, retrieval_flight, generation_flight,
+                                context_packer, diversifier, reranker, persistence_worker)
+                print()
+                continue
+            
+            if question.strip():
+                # Streamed answers are printed as they arrive; cached or error answers print here
+                printer = TokenPrinter() if stream else None
+                answer = rag_query(index, groq_client, question, save_response=True, on_token=printer)
+                if printer and printer.started and not answer.startswith("❌"):
+                    print()
+                else:
+                    print(f"🤖 Digital Twin: {answer}\n")
+                qa_count += 1
+    except (KeyboardInterrupt, EOFError):
+        print("\n\n👋 Interrupted - saving what you've learned so far...")
+    
+    finish_session(qa_count)
+    print("Your digital twin is smarter now! 🚀")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Chat Startup
+Fast-start helpers for the chat CLIs. Groq setup (including the deferred SDK
+import), vector index setup and semantic-cache seeding run concurrently, and
+the import/init time of each step is reported before the first prompt.
+
+setup_vector_database is shared by chat_digitaltwin.py,
+chat_digitaltwin_learning.py and rag_service.py: it connects the configured
+index and seeds it from the profile when it is empty.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+import profile_loader
+from local_vector import get_index, is_seeded, mark_seeded
+
+# Constants
+JSON_FILE = "data/digitaltwin.json"
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Run independent setup steps in parallel; returns (results, seconds) keyed by step name"""
+
+    def timed(task):
+        start = time.perf_counter()
+        return task(), time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="chat-init") as pool:
+        futures = {name: pool.submit(timed, task) for name, task in tasks.items()}
+        results, seconds = {}, {}
+        for name, future in futures.items():
+            results[name], seconds[name] = future.result()
+    return results, seconds
+
+
+def print_startup_times(import_seconds, init_seconds, steps: Dict[str, float]):
+    breakdown = ", ".join(f"{name} {value * 1000:.0f}ms" for name, value in steps.items())
+    print(f"⏱️ Startup: imports {import_seconds * 1000:.0f}ms, init {init_seconds * 1000:.0f}ms "
+          f"({breakdown}) - ready in {(import_seconds + init_seconds) * 1000:.0f}ms")
+
+
+def setup_vector_database(check_index=False, json_file=JSON_FILE):
+    """Setup the vector database (Upstash, or the local index with VECTOR_BACKEND=local)"""
+    print("🔄 Setting up vector database...")
+
+    try:
+        index = get_index()
+        print(f"✅ Connected to {index.backend} vector index successfully!")
+
+        # Skip the info() round trip once this index is known to hold the profile
+        if not check_index and is_seeded(index.backend):
+            print("📊 Vector database already seeded (use --check-index to verify)")
+            return index
+
+        # Check current vector count
+        try:
+            info = index.info()
+            current_count = getattr(info, 'vector_count', 0)
+            print(f"📊 Current vectors in database: {current_count}")
+            if current_count:
+                mark_seeded(index.backend)
+        except:
+            current_count = 0
+
+        # Load data if database is empty
+        if current_count == 0:
+            print("📝 Loading your professional profile...")
+
+            try:
+                content_chunks = profile_loader.content_chunks(json_file)
+            except FileNotFoundError:
+                print(f"❌ {json_file} not found!")
+                return None
+            except ValueError:
+                print(f"❌ Could not decode {json_file}")
+                return None
+
+            # Prepare vectors from content chunks
+            vectors = []
+
+            if not content_chunks:
+                print("❌ No content chunks found in profile data")
+                return None
+
+            for chunk in content_chunks:
+                enriched_text = f"{chunk['title']}: {chunk['content']}"
+
+                vectors.append((
+                    chunk['id'],
+                    enriched_text,
+                    {
+                        "title": chunk['title'],
+                        "type": chunk['type'],
+                        "content": chunk['content'],
+                        "category": chunk.get('metadata', {}).get('category', ''),
+                        "tags": ','.join(chunk.get('metadata', {}).get('tags', []))
+                    }
+                ))
+
+            # Upload vectors
+            index.upsert(vectors=vectors)
+            mark_seeded(index.backend)
+            print(f"✅ Successfully uploaded {len(vectors)} content chunks!")
+
+        return index
+
+    except Exception as e:
+        print(f"❌ Error setting up database: {str(e)}")
+        return None
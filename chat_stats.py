@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Chat Stats
+One place for the statistics block printed by the chat CLIs (the 'stats'
+command and on exit) and by rag_service.py on shutdown.
+"""
+
+from retrieval_cache import print_cache_stats
+from semantic_cache import print_semantic_stats
+from single_flight import print_flight_stats
+from context_packer import print_packer_stats
+from diversify import print_diversity_stats
+from rerank import print_rerank_stats
+from qa_persistence import print_persistence_stats
+
+
+def print_all_stats(retrieval_cache, semantic_cache, retrieval_flight, generation_flight, context_packer,
+                    diversifier, reranker, persistence_worker=None):
+    print_cache_stats(retrieval_cache)
+    print_semantic_stats(semantic_cache)
+    print_flight_stats(retrieval_flight, generation_flight)
+    print_packer_stats(context_packer)
+    print_diversity_stats(diversifier)
+    print_rerank_stats(reranker)
+    if persistence_worker:
+        print_persistence_stats(persistence_worker)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Context Packer
+Builds the "Your Information" block of the rag_query prompt within a token
+budget instead of pasting every retrieved document in full:
+
+1. Sentences repeated across retrieved documents (near-duplicates by word
+   overlap, e.g. a stored answer and the learned Q&A saved from it) are kept
+   only in the highest-scoring document
+2. The remaining passages are packed into CONTEXT_TOKEN_BUDGET tokens by a
+   0/1 knapsack on relevance score (value) vs. token count (weight); leftover
+   budget is filled with the leading sentences of the best passage that did
+   not fit whole
+3. Every query reports the prompt tokens saved
+
+Tokens are counted with tiktoken when installed (cl100k_base), otherwise with
+a word/punctuation estimate; counts are cached per sentence, since the same
+stored answers come back query after query.
+
+CONTEXT_PACKING=0 restores the plain join of every retrieved document.
+"""
+
+import os
+import re
+import math
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # optional, exact token counts
+    tiktoken = None
+
+# Constants
+CONTEXT_PACKING_ENABLED = os.getenv('CONTEXT_PACKING', '1') != '0'
+CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', 600))
+CONTEXT_DEDUP_THRESHOLD = float(os.getenv('CONTEXT_DEDUP_THRESHOLD', 0.8))
+TIKTOKEN_ENCODING = "cl100k_base"
+TOKEN_CACHE_SIZE = 16384
+# Knapsack weights are rounded up to this many tokens to keep the table small
+KNAPSACK_GRANULARITY = 8
+PASSAGE_SEPARATOR = "\n\n"
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[A-Z0-9])|\n+")
+_WORD = re.compile(r"\w+", re.UNICODE)
+_ESTIMATE_TOKEN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None and tiktoken is not None:
+            _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+    return _encoding
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # About one BPE token per 4 characters of a word (at least one); punctuation counts as its own token,
+    # so long unbroken runs (URLs, base64) are not undercounted
+    return sum(max(1, math.ceil(len(token) / 4)) for token in _ESTIMATE_TOKEN.findall(text))
+
+
+def tokenizer_name() -> str:
+    return f"tiktoken {TIKTOKEN_ENCODING}" if tiktoken is not None else "word estimate"
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE.split(text) if sentence.strip()]
+
+
+def sentence_signature(sentence: str) -> frozenset:
+    return frozenset(word.lower() for word in _WORD.findall(sentence))
+
+
+def is_near_duplicate(signature: frozenset, seen: List[frozenset], threshold) -> bool:
+    if not signature:
+        return True
+    for other in seen:
+        overlap = len(signature & other)
+        if overlap and overlap / len(signature | other) >= threshold:
+            return True
+    return False
+
+
+class Passage:
+    """One retrieved document, reduced to the sentences not already seen in a better-scoring one"""
+
+    def __init__(self, title, score, sentences: List[str]):
+        self.title = title
+        self.score = score
+        self.sentences = sentences
+        self.sentence_tokens = [count_tokens(sentence) for sentence in sentences]
+        self.title_tokens = count_tokens(f"{title}:")
+
+    @property
+    def tokens(self) -> int:
+        return self.title_tokens + sum(self.sentence_tokens)
+
+    def text(self, sentences=None) -> str:
+        return f"{self.title}: {' '.join(self.sentences[:sentences])}"
+
+    def prefix_fitting(self, budget) -> int:
+        """How many leading sentences fit in budget tokens (0 if not even the first)"""
+        used, count = self.title_tokens, 0
+        for tokens in self.sentence_tokens:
+            if used + tokens > budget:
+                break
+            used += tokens
+            count += 1
+        return count
+
+
+def knapsack(passages: List[Passage], budget) -> List[int]:
+    """Indices of the subset with the highest total score within budget tokens"""
+    capacity = budget // KNAPSACK_GRANULARITY
+    weights = [-(-passage.tokens // KNAPSACK_GRANULARITY) for passage in passages]
+    best = [0.0] * (capacity + 1)
+    keep = [[False] * (capacity + 1) for _ in passages]
+    for i, passage in enumerate(passages):
+        weight, value = weights[i], max(passage.score, 1e-6)
+        for c in range(capacity, weight - 1, -1):
+            if best[c - weight] + value > best[c]:
+                best[c] = best[c - weight] + value
+                keep[i][c] = True
+
+    chosen, c = [], capacity
+    for i in range(len(passages) - 1, -1, -1):
+        if keep[i][c]:
+            chosen.append(i)
+            c -= weights[i]
+    return sorted(chosen)
+
+
+class ContextPacker:
+    """Deduplicates and budget-packs retrieved documents; keeps running token-savings totals"""
+
+    def __init__(self, budget=CONTEXT_TOKEN_BUDGET, dedup_threshold=CONTEXT_DEDUP_THRESHOLD,
+                 enabled=CONTEXT_PACKING_ENABLED):
+        self.budget = budget
+        self.dedup_threshold = dedup_threshold
+        self.enabled = enabled
+        self.queries = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.lock = threading.Lock()
+
+    def passages(self, results) -> Tuple[List[Passage], int]:
+        """Passages in score order with cross-document duplicate sentences removed"""
+        ranked = sorted(results or [], key=lambda r: r.score or 0.0, reverse=True)
+        passages, seen, duplicates = [], [], 0
+        for result in ranked:
+            metadata = result.metadata or {}
+            content = metadata.get('content', '')
+            if not content:
+                continue
+            kept = []
+            for sentence in split_sentences(content):
+                signature = sentence_signature(sentence)
+                if is_near_duplicate(signature, seen, self.dedup_threshold):
+                    duplicates += 1
+                    continue
+                seen.append(signature)
+                kept.append(sentence)
+            if kept:
+                passages.append(Passage(metadata.get('title', 'Information'), result.score or 0.0, kept))
+        return passages, duplicates
+
+    def pack(self, results) -> Tuple[List[str], Dict[str, Any]]:
+        """(top_docs, report) - top_docs are "title: content" strings in score order"""
+        full_docs = []
+        for result in results or []:
+            metadata = result.metadata or {}
+            content = metadata.get('content', '')
+            if content:
+                full_docs.append(f"{metadata.get('title', 'Information')}: {content}")
+        tokens_before = count_tokens(PASSAGE_SEPARATOR.join(full_docs))
+
+        if not self.enabled or not full_docs:
+            return full_docs, self._record({"enabled": False, "tokens_before": tokens_before,
+                                            "tokens_after": tokens_before, "duplicates_removed": 0,
+                                            "passages_kept": len(full_docs), "passages_dropped": 0})
+
+        passages, duplicates = self.passages(results)
+        chosen = knapsack(passages, self.budget)
+        top_docs = {i: passages[i].text() for i in chosen}
+
+        # Spend what is left on the best passage that did not fit whole
+        remaining = self.budget - sum(passages[i].tokens for i in chosen)
+        for i, passage in enumerate(passages):
+            if i in top_docs:
+                continue
+            count = passage.prefix_fitting(remaining)
+            if count:
+                top_docs[i] = passage.text(count)
+            break
+        if not top_docs and passages:
+            # Even the best passage's first sentence is over budget; an overfull prompt beats an empty one
+            top_docs[0] = passages[0].text(1)
+
+        top_docs = [top_docs[i] for i in sorted(top_docs)]
+        tokens_after = count_tokens(PASSAGE_SEPARATOR.join(top_docs))
+        return top_docs, self._record({"enabled": True, "tokens_before": tokens_before,
+                                       "tokens_after": tokens_after, "duplicates_removed": duplicates,
+                                       "passages_kept": len(top_docs),
+                                       "passages_dropped": len(full_docs) - len(top_docs)})
+
+    def _record(self, report) -> Dict[str, Any]:
+        report["tokens_saved"] = report["tokens_before"] - report["tokens_after"]
+        with self.lock:
+            self.queries += 1
+            self.tokens_before += report["tokens_before"]
+            self.tokens_after += report["tokens_after"]
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            saved = self.tokens_before - self.tokens_after
+            return {
+                "enabled": self.enabled,
+                "budget": self.budget,
+                "tokenizer": tokenizer_name(),
+                "queries": self.queries,
+                "tokens_before": self.tokens_before,
+                "tokens_after": self.tokens_after,
+                "tokens_saved": saved,
+                "saved_rate": saved / self.tokens_before if self.tokens_before else 0.0,
+                "token_cache": count_tokens.cache_info().currsize
+            }
+
+
+def print_pack_report(report: Optional[Dict[str, Any]]):
+    if not report or not report["enabled"]:
+        return
+    print(f"✂️ Context: {report['tokens_before']} → {report['tokens_after']} tokens "
+          f"({report['tokens_saved']} saved, {report['duplicates_removed']} duplicate sentences removed, "
+          f"{report['passages_dropped']} passages dropped)")
+
+
+def print_packer_stats(packer: ContextPacker):
+    stats = packer.stats()
+    if not stats["enabled"]:
+        print("✂️ Context packing disabled")
+        return
+    print(f"✂️ Context packing ({stats['tokenizer']}, budget {stats['budget']}): "
+          f"{stats['tokens_saved']} prompt tokens saved over {stats['queries']} queries "
+          f"({stats['saved_rate']:.0%})")
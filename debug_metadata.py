@@ -1,15 +1,11 @@
-import os
-from upstash_vector import Index
+from local_vector import get_index
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv('.env.local')
 
-# Initialize Upstash Vector
-index = Index(
-    url=os.getenv('UPSTASH_VECTOR_REST_URL'),
-    token=os.getenv('UPSTASH_VECTOR_REST_TOKEN')
-)
+# Initialize the vector index (Upstash by default, VECTOR_BACKEND=local for the in-process index)
+index = get_index()
 
 # Test the exact query
 query = "What was your role in TechFusion?"
@@ -1,15 +1,11 @@
-import os
-from upstash_vector import Index
+from local_vector import get_index
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv('.env.local')
 
-# Initialize Upstash Vector
-index = Index(
-    url=os.getenv('UPSTASH_VECTOR_REST_URL'),
-    token=os.getenv('UPSTASH_VECTOR_REST_TOKEN')
-)
+# Initialize the vector index (Upstash by default, VECTOR_BACKEND=local for the in-process index)
+index = get_index()
 
 # OLD vectors to delete (conflicting with corrections)
 old_vectors_to_delete = [
@@ -39,15 +35,16 @@ print("=" * 80)
 deleted_count = 0
 not_found_count = 0
 
-for vector_id in old_vectors_to_delete:
-    try:
-        print(f"\n🗑️  Attempting to delete: {vector_id}")
-        index.delete(ids=[vector_id])
-        deleted_count += 1
-        print(f"   ✅ Deleted successfully")
-    except Exception as e:
-        not_found_count += 1
-        print(f"   ℹ️  Not found or already deleted: {str(e)}")
+# One batched request instead of one round trip per ID (see vector_gc.py for predicate-based cleanup)
+try:
+    print(f"\n🗑️  Deleting {len(old_vectors_to_delete)} vectors in one batch...")
+    result = index.delete(ids=old_vectors_to_delete)
+    deleted_count = getattr(result, 'deleted', len(old_vectors_to_delete))
+    not_found_count = len(old_vectors_to_delete) - deleted_count
+    print(f"   ✅ Batch delete complete")
+except Exception as e:
+    not_found_count = len(old_vectors_to_delete)
+    print(f"   ❌ Error deleting vectors: {str(e)}")
 
 print("\n" + "=" * 80)
 print("DELETION SUMMARY")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Result Diversification
+Post-processing for query_vectors: a larger candidate pool is retrieved and
+reduced to the few documents worth putting in the prompt.
+
+- Adaptive k: the number of documents (at most the requested top_k) is cut at
+  the first score gap that stands out from the pool's gap distribution
+  (gap > mean + ADAPTIVE_K_GAP_STD * std), so one clear winner comes back alone
+- Maximal marginal relevance: documents are picked greedily by
+  lambda * relevance - (1 - lambda) * max similarity to those already picked,
+  and near-identical ones (learned answers saved back into the index) are
+  skipped outright
+
+Document similarity uses the local embedder (embeddings.py, disk-cached) on
+the document text, so it works the same for vector, BM25 and fused hits.
+
+MMR=0 turns diversification off (plain top_k, no candidate pool).
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Sequence
+import numpy as np
+from embeddings import embed
+
+# Constants
+MMR_ENABLED = os.getenv('MMR', '1') != '0'
+MMR_LAMBDA = float(os.getenv('MMR_LAMBDA', 0.7))
+MMR_POOL_SIZE = int(os.getenv('MMR_POOL_SIZE', 10))
+MMR_DUPLICATE_THRESHOLD = float(os.getenv('MMR_DUPLICATE_THRESHOLD', 0.95))
+ADAPTIVE_K_GAP_STD = float(os.getenv('ADAPTIVE_K_GAP_STD', 1.0))
+ADAPTIVE_K_MIN = 1
+
+
+def result_text(result) -> str:
+    metadata = result.metadata or {}
+    return metadata.get('content') or getattr(result, 'data', None) or metadata.get('title') or result.id
+
+
+def relevance(results) -> np.ndarray:
+    """Scores rescaled to [0, 1] within the pool (vector, BM25 and RRF scores differ in range)"""
+    scores = np.array([result.score or 0.0 for result in results], dtype=np.float32)
+    spread = scores.max() - scores.min()
+    return (scores - scores.min()) / spread if spread > 0 else np.ones_like(scores)
+
+
+def adaptive_k(scores: Sequence[float], max_k, min_k=ADAPTIVE_K_MIN, gap_std=ADAPTIVE_K_GAP_STD) -> int:
+    """Cut before the first outstanding drop in the (descending) score list"""
+    ordered = sorted((score or 0.0 for score in scores), reverse=True)
+    max_k = min(max_k, len(ordered))
+    if max_k <= min_k or len(ordered) < 3:
+        return max_k
+    gaps = np.diff(ordered) * -1
+    threshold = gaps.mean() + gap_std * gaps.std()
+    for position in range(min_k - 1, max_k - 1):
+        if gaps[position] > threshold:
+            return position + 1
+    return max_k
+
+
+def mmr(results, vectors: np.ndarray, k, lambda_=MMR_LAMBDA,
+        duplicate_threshold=MMR_DUPLICATE_THRESHOLD):
+    """(picked indices in pick order, near-duplicates skipped)"""
+    scores = relevance(results)
+    similarity = vectors @ vectors.T
+    picked, skipped = [], set()
+    while len(picked) < k:
+        best, best_value = None, -np.inf
+        for i in range(len(results)):
+            if i in picked or i in skipped:
+                continue
+            redundancy = similarity[i, picked].max() if picked else 0.0
+            if redundancy >= duplicate_threshold:
+                skipped.add(i)
+                continue
+            value = lambda_ * scores[i] - (1 - lambda_) * redundancy
+            if value > best_value:
+                best, best_value = i, value
+        if best is None:
+            break
+        picked.append(best)
+    return picked, len(skipped)
+
+
+class ResultDiversifier:
+    """Adaptive-k MMR selection over a retrieval candidate pool, with running counts"""
+
+    def __init__(self, enabled=MMR_ENABLED, pool_size=MMR_POOL_SIZE, lambda_=MMR_LAMBDA,
+                 duplicate_threshold=MMR_DUPLICATE_THRESHOLD, gap_std=ADAPTIVE_K_GAP_STD):
+        self.enabled = enabled
+        self.pool_size = pool_size
+        self.lambda_ = lambda_
+        self.duplicate_threshold = duplicate_threshold
+        self.gap_std = gap_std
+        self.calls = 0
+        self.candidates = 0
+        self.returned = 0
+        self.duplicates = 0
+        self.lock = threading.Lock()
+
+    def pool(self, top_k) -> int:
+        """How many candidates to retrieve for a top_k request"""
+        return max(top_k, self.pool_size) if self.enabled else top_k
+
+    def select(self, results, top_k) -> List[Any]:
+        results = list(results or [])
+        if not self.enabled or len(results) <= 1:
+            return results[:top_k]
+
+        k = adaptive_k([r.score for r in results], top_k, gap_std=self.gap_std)
+        vectors = embed([result_text(r) for r in results])
+        picked, duplicates = mmr(results, vectors, k, self.lambda_, self.duplicate_threshold)
+        with self.lock:
+            self.calls += 1
+            self.candidates += len(results)
+            self.returned += len(picked)
+            self.duplicates += duplicates
+        return [results[i] for i in picked]
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "calls": self.calls,
+                "candidates": self.candidates,
+                "returned": self.returned,
+                "duplicates_skipped": self.duplicates,
+                "avg_returned": self.returned / self.calls if self.calls else 0.0
+            }
+
+
+def print_diversity_stats(diversifier: ResultDiversifier):
+    stats = diversifier.stats()
+    if not stats["enabled"]:
+        print("🎯 MMR diversification disabled")
+        return
+    print(f"🎯 MMR: {stats['returned']} documents from {stats['candidates']} candidates over "
+          f"{stats['calls']} searches (avg {stats['avg_returned']:.1f}/query, "
+          f"{stats['duplicates_skipped']} near-duplicates skipped)")
@@ -6,15 +6,29 @@ Updates the Upstash Vector database with enhanced profile data
 
 import json
 import os
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any
 from dotenv import load_dotenv
+from retrieval_cache import bump_index_version
+from profile_loader import get_profile
 
 # Load environment variables from .env.local
 load_dotenv('.env.local')
 
+# Upload engine limits (Upstash accepts up to 1000 vectors per request)
+MAX_BATCH_BYTES = int(os.getenv('UPSTASH_MAX_BATCH_BYTES', 512 * 1024))
+MAX_BATCH_VECTORS = int(os.getenv('UPSTASH_MAX_BATCH_VECTORS', 1000))
+MAX_UPLOAD_WORKERS = int(os.getenv('UPSTASH_UPLOAD_WORKERS', 4))
+
 class DigitalTwinEmbedder:
-    def __init__(self):
+    def __init__(self, max_batch_bytes=MAX_BATCH_BYTES, max_batch_vectors=MAX_BATCH_VECTORS,
+                 max_workers=MAX_UPLOAD_WORKERS):
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_vectors = max_batch_vectors
+        self.max_workers = max(1, max_workers)
         self.upstash_url = os.getenv('UPSTASH_VECTOR_REST_URL')
         self.upstash_token = os.getenv('UPSTASH_VECTOR_REST_TOKEN')
         
@@ -28,26 +42,27 @@ class DigitalTwinEmbedder:
                 'Authorization': f'Bearer {self.upstash_token}',
                 'Content-Type': 'application/json'
             }
+            self.session = self._create_session()
             print("✅ Upstash credentials loaded successfully")
 
+    def _create_session(self) -> requests.Session:
+        """Create a pooled HTTP session shared by all upload workers"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        return session
+
     def load_profile_data(self) -> Dict[str, Any]:
         """Load the enhanced digital twin profile"""
         try:
-            # Try utf-8-sig first to handle BOM, then other encodings
-            encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'cp1252']
-            
-            for encoding in encodings:
-                try:
-                    with open('data/digitaltwin.json', 'r', encoding=encoding) as f:
-                        profile_data = json.load(f)
-                    print(f"✅ Loaded enhanced profile data: {len(str(profile_data))} characters (encoding: {encoding})")
-                    return profile_data
-                except (UnicodeDecodeError, json.JSONDecodeError):
-                    continue
-            
+            profile = get_profile()
+            print(f"✅ Loaded enhanced profile data: {profile.stamp[1]} bytes (encoding: {profile.encoding})")
+            return profile.data
+        except ValueError:
             print("❌ Error: Could not decode JSON file with any supported encoding")
             return {}
-                
         except FileNotFoundError:
             print("❌ Error: digitaltwin.json not found in data/ directory")
             return {}
@@ -221,34 +236,102 @@ class DigitalTwinEmbedder:
             print("💡 When valid Upstash credentials are provided, these chunks will be uploaded automatically")
             return True
         
-        success_count = 0
+        batches = self.build_batches(chunks)
+        print(f"🚀 Uploading {len(chunks)} chunks in {len(batches)} batch(es) "
+              f"with {min(self.max_workers, len(batches))} worker(s)...")
+        
+        start = time.perf_counter()
+        reports = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._upload_batch, batch_no, batch)
+                for batch_no, batch in enumerate(batches, 1)
+            ]
+            for future in as_completed(futures):
+                report = future.result()
+                reports.append(report)
+                if report['ok']:
+                    print(f"✅ Batch {report['batch']}: {report['count']} chunks "
+                          f"({report['bytes']} bytes) in {report['seconds']:.2f}s")
+                else:
+                    print(f"❌ Batch {report['batch']} failed: {report['error']}")
+        elapsed = time.perf_counter() - start
+        
+        reports.sort(key=lambda r: r['batch'])
+        self.last_upload_report = reports
+        if any(report['ok'] for report in reports):
+            bump_index_version()
+        self.print_upload_report(reports, len(chunks), elapsed)
+        
+        return all(report['ok'] for report in reports)
+
+    def build_batches(self, chunks: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Group chunks into multi-vector payloads under the configured size limits"""
+        batches = []
+        current, current_bytes = [], 2  # account for the enclosing JSON array brackets
         
         for chunk in chunks:
-            # Prepare the upsert request
-            upsert_data = {
+            vector = {
                 "id": chunk['id'],
                 "data": chunk['content'],
                 "metadata": chunk['metadata']
             }
+            size = len(json.dumps(vector, ensure_ascii=False).encode('utf-8')) + 1
             
-            try:
-                response = requests.post(
-                    f"{self.upstash_url}/upsert",
-                    headers=self.headers,
-                    json=upsert_data
-                )
-                
-                if response.status_code == 200:
-                    success_count += 1
-                    print(f"✅ Uploaded chunk {chunk['id']}: {chunk['metadata']['section']}")
-                else:
-                    print(f"❌ Failed to upload {chunk['id']}: {response.status_code} - {response.text}")
-                    
-            except requests.RequestException as e:
-                print(f"❌ Network error uploading {chunk['id']}: {e}")
+            if current and (current_bytes + size > self.max_batch_bytes
+                            or len(current) >= self.max_batch_vectors):
+                batches.append(current)
+                current, current_bytes = [], 2
+            
+            current.append(vector)
+            current_bytes += size
+        
+        if current:
+            batches.append(current)
+        return batches
+
+    def _upload_batch(self, batch_no: int, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Upload one multi-vector batch and return its report"""
+        body = json.dumps(batch, ensure_ascii=False).encode('utf-8')
+        report = {
+            'batch': batch_no,
+            'ids': [vector['id'] for vector in batch],
+            'count': len(batch),
+            'bytes': len(body),
+            'ok': False,
+            'error': None,
+            'seconds': 0.0
+        }
+        
+        start = time.perf_counter()
+        try:
+            response = self.session.post(f"{self.upstash_url}/upsert", data=body)
+            if response.status_code == 200:
+                report['ok'] = True
+            else:
+                report['error'] = f"{response.status_code} - {response.text}"
+        except requests.RequestException as e:
+            report['error'] = f"Network error: {e}"
+        report['seconds'] = time.perf_counter() - start
+        
+        return report
+
+    def print_upload_report(self, reports: List[Dict[str, Any]], total_chunks: int, elapsed: float):
+        """Print the per-batch success/failure report"""
+        uploaded = sum(r['count'] for r in reports if r['ok'])
+        total_bytes = sum(r['bytes'] for r in reports if r['ok'])
         
-        print(f"\n📊 Upload Summary: {success_count}/{len(chunks)} chunks uploaded successfully")
-        return success_count == len(chunks)
+        print("\n📊 Upload Report")
+        print("-" * 60)
+        for r in reports:
+            status = "✅" if r['ok'] else "❌"
+            print(f"{status} Batch {r['batch']}: {r['count']} chunks, {r['bytes']} bytes, {r['seconds']:.2f}s")
+            if not r['ok']:
+                print(f"   Failed IDs: {', '.join(r['ids'])}")
+        print("-" * 60)
+        throughput = total_bytes / elapsed / 1024 if elapsed > 0 else 0.0
+        print(f"📊 Upload Summary: {uploaded}/{total_chunks} chunks uploaded successfully "
+              f"in {elapsed:.2f}s ({throughput:.1f} KB/s)")
 
     def update_vector_database(self) -> bool:
         """Main method to update the vector database"""
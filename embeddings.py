@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Local Embeddings
+CPU embedding provider for the local vector index and the push scripts, with an
+on-disk cache so no text is ever embedded twice.
+
+- ONNX sentence model (e.g. all-MiniLM-L6-v2 exported to model.onnx + tokenizer.json)
+  when EMBEDDING_MODEL_DIR exists and onnxruntime/tokenizers are installed
+- Hashing fallback otherwise: signed feature hashing of word unigrams and bigrams
+
+Cache layout (data/embedding_cache/<model>.f32 + <model>.keys): a flat float32
+file read through np.memmap, plus one sha256(model id, text) key per row. Appends
+from several processes are serialized by a lock on <model>.lock.
+
+Usage:
+  python embeddings.py status      - Show the active model and cache size
+  python embeddings.py "some text" - Embed text and print the first dimensions
+"""
+
+import os
+import re
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+# Constants
+EMBEDDING_MODEL_DIR = os.getenv('EMBEDDING_MODEL_DIR', 'models/all-MiniLM-L6-v2')
+EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', 'data/embedding_cache')
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 32))
+HASHING_DIMENSION = 384
+MAX_SEQUENCE_LENGTH = 256
+# sha256 hex digest + newline
+KEY_LINE_LENGTH = 65
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock on a sidecar file (fcntl on POSIX, msvcrt on Windows)"""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class HashingEmbedder:
+    """Signed feature hashing of unigrams + bigrams with sublinear term frequency"""
+
+    def __init__(self, dimension=HASHING_DIMENSION):
+        self.dimension = dimension
+        self.model_id = f"hashing-v1-{dimension}"
+
+    def _bucket(self, feature):
+        digest = hashlib.md5(feature.encode('utf-8')).digest()
+        return int.from_bytes(digest[:4], 'little') % self.dimension, 1.0 if digest[4] & 1 else -1.0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.lower())
+            counts = {}
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                counts[feature] = counts.get(feature, 0) + 1
+            for feature, count in counts.items():
+                bucket, sign = self._bucket(feature)
+                matrix[row, bucket] += sign * (1.0 + np.log(count))
+        return normalize_rows(matrix)
+
+
+class OnnxEmbedder:
+    """Mean-pooled ONNX sentence-transformer running on the CPU"""
+
+    def __init__(self, model_dir=EMBEDDING_MODEL_DIR):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQUENCE_LENGTH)
+        self.tokenizer.enable_padding()
+        self.session = onnxruntime.InferenceSession(os.path.join(model_dir, "model.onnx"),
+                                                    providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+        self.model_id = f"onnx-{os.path.basename(os.path.normpath(model_dir))}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        hidden = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return normalize_rows(pooled)
+
+
+class EmbeddingCache:
+    """Append-only memory-mapped float32 store keyed by sha256(model id, text)"""
+
+    def __init__(self, model_id, dimension, directory=EMBEDDING_CACHE_DIR):
+        self.model_id = model_id
+        self.dimension = dimension
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r"[^\w.-]+", "_", model_id)
+        self.vectors_file = os.path.join(directory, f"{slug}.f32")
+        self.keys_file = os.path.join(directory, f"{slug}.keys")
+        self.lock_file = os.path.join(directory, f"{slug}.lock")
+        self.rows: Dict[str, int] = {}
+        self.matrix = None
+        self._load()
+        self._remap()
+
+    def _load(self) -> int:
+        """Read the keys on disk; returns the row count both files agree on"""
+        keys = []
+        if os.path.exists(self.keys_file):
+            with open(self.keys_file, "r", encoding="ascii") as f:
+                # Only complete lines count; a torn write can leave a partial last key
+                keys = [line[:-1] for line in f if line.endswith("\n") and len(line) == KEY_LINE_LENGTH]
+        # Vectors are written before keys, so a torn write leaves extra vectors, never missing ones
+        stored = os.path.getsize(self.vectors_file) // (4 * self.dimension) if os.path.exists(self.vectors_file) else 0
+        count = min(len(keys), stored)
+        self.rows = {key: row for row, key in enumerate(keys[:count])}
+        return count
+
+    def key(self, text) -> str:
+        return hashlib.sha256(f"{self.model_id}\0{text}".encode('utf-8')).hexdigest()
+
+    def _remap(self):
+        count = len(self.rows)
+        self.matrix = (np.memmap(self.vectors_file, dtype=np.float32, mode='r', shape=(count, self.dimension))
+                       if count else np.zeros((0, self.dimension), dtype=np.float32))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, key) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        return None if row is None else np.array(self.matrix[row])
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), self.dimension)
+        # Other processes (chat CLIs, push scripts, the RAG service) append to the same files
+        with file_lock(self.lock_file):
+            count = self._load()
+            new = [i for i, key in enumerate(keys) if key not in self.rows]
+            if new:
+                # Drop only a torn tail (measured on disk) so rows stay aligned with keys
+                with open(self.vectors_file, "ab") as f:
+                    f.truncate(count * 4 * self.dimension)
+                    f.write(vectors[new].tobytes())
+                with open(self.keys_file, "a", encoding="ascii") as f:
+                    f.truncate(count * KEY_LINE_LENGTH)
+                    f.write("".join(f"{keys[i]}\n" for i in new))
+                for i in new:
+                    self.rows[keys[i]] = len(self.rows)
+        self._remap()
+
+
+class CachedEmbedder:
+    """Wraps a model so repeated texts are read from the disk cache instead of recomputed"""
+
+    def __init__(self, model, cache_dir=EMBEDDING_CACHE_DIR, batch_size=EMBEDDING_BATCH_SIZE):
+        self.model = model
+        self.model_id = model.model_id
+        self.dimension = model.dimension
+        self.batch_size = batch_size
+        self.cache = EmbeddingCache(model.model_id, model.dimension, cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        # The chat CLIs embed from their startup and background-save threads too
+        self.lock = threading.Lock()
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        with self.lock:
+            return self._embed(texts)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        result = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        missing: Dict[str, List[int]] = {}
+
+        for position, text in enumerate(texts):
+            vector = self.cache.get(self.cache.key(text)) if self.cache is not None else None
+            if vector is not None:
+                result[position] = vector
+                self.hits += 1
+            else:
+                missing.setdefault(text, []).append(position)
+
+        unique = list(missing)
+        for start in range(0, len(unique), self.batch_size):
+            batch = unique[start:start + self.batch_size]
+            vectors = self.model.embed(batch)
+            self.misses += len(batch)
+            if self.cache is not None:
+                self.cache.put_many([self.cache.key(text) for text in batch], vectors)
+            for text, vector in zip(batch, vectors):
+                result[missing[text]] = vector
+        return result
+
+    def __call__(self, texts):
+        return self.embed(texts)
+
+
+def load_model(model_dir=EMBEDDING_MODEL_DIR):
+    """ONNX model if one is installed locally, otherwise the hashing fallback"""
+    if os.path.exists(os.path.join(model_dir, "model.onnx")):
+        try:
+            return OnnxEmbedder(model_dir)
+        except ImportError:
+            print("⚠️ onnxruntime/tokenizers not installed - using hashing embeddings")
+    return HashingEmbedder()
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder() -> CachedEmbedder:
+    """Process-wide cached embedder"""
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = CachedEmbedder(load_model())
+    return _embedder
+
+
+def embed(texts: Iterable[str]) -> np.ndarray:
+    """Embed texts with the process-wide cached embedder (rows are L2-normalized)"""
+    return get_embedder().embed(texts)
+
+
+if __name__ == "__main__":
+    import sys
+
+    embedder = get_embedder()
+    if len(sys.argv) < 2 or sys.argv[1] == "status":
+        print(f"🧠 Model: {embedder.model_id} ({embedder.dimension} dimensions)")
+        print(f"💾 Cached embeddings: {len(embedder.cache)} in {embedder.cache.vectors_file}")
+    else:
+        vector = embedder.embed([" ".join(sys.argv[1:])])[0]
+        print(f"🧠 {embedder.model_id}: [{', '.join(f'{v:.4f}' for v in vector[:8])}, ...]")
+        print(f"💾 Cache hits: {embedder.hits}, misses: {embedder.misses}")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Retrieval Evaluation Harness
+Replays the Q:/A: corpora through the chat apps' retrieval pipeline
+(query_vectors in chat_digitaltwin.py: hybrid search, rerank, MMR) and reports
+retrieval quality and per-stage latency as a JSON report that can be diffed
+between runs.
+
+- Quality: recall@1/3/5/k and MRR. A result counts as relevant if its ID is
+  listed for the question in --expected (JSON: {"question": ["id", ...]}),
+  or if its stored text/metadata contains the question itself
+- Latency: p50/p95/p99 per stage - embed (local backend only; Upstash embeds
+  server-side), search, and generate (with --generate). --no-cache times the
+  embedding model without the disk cache and clears the retrieval cache before
+  every question
+- Generation errors (with --generate) are recorded per question in the report
+
+Usage:
+  python eval_retrieval.py                                 - Evaluate the default corpora
+  python eval_retrieval.py <file> [<file> ...]             - Evaluate specific Q&A files
+  Options: --top-k N  --limit N  --expected ids.json  --generate  --no-cache
+           --output report.json  --compare previous_report.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import contextlib
+from datetime import datetime
+from typing import Any, Dict, List
+from dotenv import load_dotenv
+import qa_parser
+from qa_index import normalize_question
+from local_vector import get_index
+import chat_digitaltwin as pipeline
+from async_rag import SYSTEM_PROMPT, DEFAULT_MODEL, build_prompt
+from latency_stats import percentile
+
+# Load environment variables from .env.local
+load_dotenv('.env.local')
+
+# Constants
+DEFAULT_CORPORA = ["work_related_qa_100.txt", "100_terror_questions_complete.txt", "recruiter_qa_database.txt"]
+REPORT_DIR = "data/eval"
+DEFAULT_TOP_K = 5
+RECALL_AT = (1, 3, 5)
+
+
+def result_text(result) -> str:
+    metadata = result.metadata or {}
+    parts = [getattr(result, "data", None) or "", metadata.get("question", ""), metadata.get("title", ""), metadata.get("content", "")]
+    return normalize_question(" ".join(str(part) for part in parts))
+
+
+def first_relevant_rank(question, results, expected_ids=()) -> int:
+    """1-based rank of the first relevant result, 0 if none"""
+    normalized = normalize_question(question)
+    for rank, result in enumerate(results, 1):
+        if result.id in expected_ids or (normalized and normalized in result_text(result)):
+            return rank
+    return 0
+
+
+def latency_summary(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    return {
+        "count": len(values),
+        "mean_ms": round(1000 * sum(values) / len(values), 3),
+        "p50_ms": round(1000 * percentile(values, 50), 3),
+        "p95_ms": round(1000 * percentile(values, 95), 3),
+        "p99_ms": round(1000 * percentile(values, 99), 3)
+    }
+
+
+def quality_summary(ranks: List[int], top_k) -> Dict[str, float]:
+    total = len(ranks) or 1
+    summary = {f"recall@{k}": round(sum(1 for r in ranks if 0 < r <= k) / total, 4)
+               for k in sorted(set(RECALL_AT + (top_k,))) if k <= top_k}
+    summary["mrr"] = round(sum(1.0 / r for r in ranks if r) / total, 4)
+    summary["questions"] = len(ranks)
+    return summary
+
+
+def evaluate(paths, top_k=DEFAULT_TOP_K, limit=None, expected=None, generate=False, no_cache=False) -> Dict[str, Any]:
+    index = get_index()
+    local = index.backend == 'local'
+    embedder = index.embed if local else None
+    # --no-cache times the model itself; otherwise repeated runs mostly time disk-cache reads
+    embed_model = getattr(embedder, "model", embedder) if no_cache else embedder
+    groq_client = None
+    if generate:
+        from groq import Groq
+        groq_client = Groq(api_key=os.getenv('GROQ_API_KEY'))
+
+    expected = expected or {}
+    timings = {"embed": [], "search": [], "generate": []}
+    rows = []
+
+    for path in paths:
+        pairs = list(qa_parser.iter_qa_file(path))[:limit]
+        print(f"🔎 {path}: {len(pairs)} questions")
+        for pair in pairs:
+            row = {"file": path, "question": pair.question}
+
+            if local:
+                start = time.perf_counter()
+                embed_model.embed([pair.question])
+                timings["embed"].append(time.perf_counter() - start)
+
+            # Same retrieval as the chat apps: hybrid fusion, rerank and adaptive-k MMR
+            if no_cache:
+                pipeline.retrieval_cache.clear()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = pipeline.query_vectors(index, pair.question, top_k=top_k) or []
+            timings["search"].append(time.perf_counter() - start)
+
+            row["top_ids"] = [r.id for r in results]
+            row["rank"] = first_relevant_rank(pair.question, results,
+                                              expected.get(pair.question, expected.get(normalize_question(pair.question), ())))
+
+            if groq_client:
+                prompt = build_prompt(pair.question, results, pipeline.context_packer)
+                if prompt:
+                    start = time.perf_counter()
+                    try:
+                        groq_client.chat.completions.create(
+                            model=DEFAULT_MODEL,
+                            messages=[{"role": "system", "content": SYSTEM_PROMPT},
+                                      {"role": "user", "content": prompt}],
+                            temperature=0.7,
+                            max_tokens=500
+                        )
+                        timings["generate"].append(time.perf_counter() - start)
+                    except Exception as e:
+                        row["generate_error"] = str(e)
+            rows.append(row)
+
+    per_file = {path: quality_summary([r["rank"] for r in rows if r["file"] == path], top_k) for path in paths}
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "config": {
+            "backend": index.backend,
+            "embedding_model": getattr(embedder, "model_id", "upstash-builtin"),
+            "top_k": top_k,
+            "files": paths,
+            "limit": limit,
+            "expected_ids": bool(expected),
+            "hybrid": pipeline.HYBRID_SEARCH_ENABLED,
+            "rerank": pipeline.reranker.enabled,
+            "mmr": pipeline.diversifier.enabled,
+            "cache": not no_cache
+        },
+        "quality": quality_summary([r["rank"] for r in rows], top_k),
+        "quality_per_file": per_file,
+        "latency": {stage: latency_summary(values) for stage, values in timings.items() if values},
+        "misses": [{"file": r["file"], "question": r["question"], "top_ids": r["top_ids"]}
+                   for r in rows if not r["rank"]],
+        "generate_errors": [{"file": r["file"], "question": r["question"], "error": r["generate_error"]}
+                            for r in rows if "generate_error" in r],
+        "questions": rows
+    }
+
+
+def print_report(report, previous=None):
+    print("\n📊 Retrieval quality")
+    for metric, value in report["quality"].items():
+        delta = ""
+        if previous and metric in previous.get("quality", {}) and metric != "questions":
+            delta = f"  ({value - previous['quality'][metric]:+.4f})"
+        print(f"   {metric:>10}: {value}{delta}")
+
+    print("\n⏱️ Latency per stage")
+    for stage, summary in report["latency"].items():
+        delta = ""
+        old = (previous or {}).get("latency", {}).get(stage)
+        if old:
+            delta = f"  (p50 {summary['p50_ms'] - old['p50_ms']:+.2f}ms)"
+        print(f"   {stage:>10}: p50 {summary['p50_ms']:.2f}ms, p95 {summary['p95_ms']:.2f}ms, "
+              f"p99 {summary['p99_ms']:.2f}ms{delta}")
+
+    print(f"\n❌ {len(report['misses'])} questions without a relevant result in the top {report['config']['top_k']}")
+    if report.get("generate_errors"):
+        print(f"⚠️ {len(report['generate_errors'])} generation errors "
+              f"(first: {report['generate_errors'][0]['error']})")
+
+
+def main():
+    args = sys.argv[1:]
+    options = {"top_k": DEFAULT_TOP_K, "limit": None, "expected": None, "generate": False, "no_cache": False}
+    output = compare = None
+    paths = []
+    while args:
+        arg = args.pop(0)
+        if arg in ("--top-k", "--limit"):
+            options[arg[2:].replace("-", "_")] = int(args.pop(0))
+        elif arg == "--expected":
+            with open(args.pop(0), "r", encoding="utf-8") as f:
+                options["expected"] = json.load(f)
+        elif arg == "--generate":
+            options["generate"] = True
+        elif arg == "--no-cache":
+            options["no_cache"] = True
+        elif arg == "--output":
+            output = args.pop(0)
+        elif arg == "--compare":
+            compare = args.pop(0)
+        else:
+            paths.append(arg)
+
+    paths = paths or [path for path in DEFAULT_CORPORA if os.path.exists(path)]
+    report = evaluate(paths, **options)
+
+    previous = None
+    if compare:
+        with open(compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(report, previous)
+
+    if not output:
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        output = os.path.join(REPORT_DIR, f"retrieval_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, sort_keys=True)
+    print(f"💾 Report saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Hybrid Search
+BM25 keyword retrieval over the profile and Q&A corpora, fused with vector
+search results by reciprocal-rank fusion (RRF). Exact terms such as
+"TechFusion" or "Yellow Forms" are found by the inverted index in one lookup
+instead of widening the vector top_k and filtering.
+
+Documents:
+- content_chunks and interview_qa from data/digitaltwin.json (same IDs as the
+  vectors uploaded by the chat scripts)
+- Q:/A: text corpora (work_related_qa_100.txt, 100_terror_questions_complete.txt, ...)
+
+The index is rebuilt automatically when any source file changes.
+
+Usage:
+  python hybrid_search.py "TechFusion role"   - Show BM25 hits for a query
+"""
+
+import os
+import re
+import math
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+import qa_parser
+from qa_index import normalize_question, file_stamp
+from profile_loader import get_profile
+
+# Constants
+JSON_FILE = "data/digitaltwin.json"
+CORPORA = ["work_related_qa_100.txt", "100_terror_questions_complete.txt", "recruiter_qa_database.txt",
+           "comprehensive_qa_update.txt", "enhanced_elaborate_qa.txt", "corrections_update.txt"]
+HYBRID_SEARCH_ENABLED = os.getenv('HYBRID_SEARCH', '1') != '0'
+HYBRID_VECTOR_TOP_K = int(os.getenv('HYBRID_VECTOR_TOP_K', 10))
+HYBRID_BM25_TOP_K = int(os.getenv('HYBRID_BM25_TOP_K', 10))
+RRF_K = 60
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from", "how", "i", "in", "is",
+    "it", "me", "my", "of", "on", "or", "that", "the", "to", "was", "what", "when", "where", "which",
+    "who", "why", "with", "you", "your"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+@dataclass
+class Document:
+    id: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class HybridResult:
+    """Query result compatible with upstash_vector.QueryResult (id/score/metadata)"""
+    id: str
+    score: float
+    metadata: Optional[Dict[str, Any]] = None
+    data: Optional[str] = None
+    vector: Optional[List[float]] = None
+    vector_rank: Optional[int] = None
+    bm25_rank: Optional[int] = None
+    vector_score: Optional[float] = None
+    bm25_score: Optional[float] = None
+
+
+class BM25Index:
+    """In-memory inverted index with Okapi BM25 scoring"""
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+        self.rows: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.lengths: List[int] = []
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, document: Document):
+        """Add or replace a document"""
+        if document.id in self.rows:
+            self.remove(document.id)
+        row = len(self.documents)
+        tokens = tokenize(document.text)
+        self.documents.append(document)
+        self.rows[document.id] = row
+        self.lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        for token in tokens:
+            postings = self.postings.setdefault(token, {})
+            postings[row] = postings.get(row, 0) + 1
+
+    def remove(self, document_id):
+        row = self.rows.pop(document_id, None)
+        if row is None:
+            return
+        for postings in self.postings.values():
+            postings.pop(row, None)
+        self.total_length -= self.lengths[row]
+        self.lengths[row] = 0
+        self.documents[row] = None
+
+    def search(self, query: str, top_k=HYBRID_BM25_TOP_K) -> List[tuple]:
+        """Return [(document, score)] for the best-matching documents"""
+        live = len(self.rows)
+        if not live:
+            return []
+        average_length = self.total_length / live or 1.0
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (live - len(postings) + 0.5) / (len(postings) + 0.5))
+            for row, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[row] / average_length)
+                scores[row] = scores.get(row, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(self.documents[row], score) for row, score in best]
+
+
+def qa_document(doc_id, question, answer, category, source) -> Document:
+    return Document(
+        id=doc_id,
+        text=f"{question} {answer}",
+        metadata={
+            "type": "interview_qa",
+            "question": question,
+            "answer": answer,
+            "category": category,
+            "title": f"Q&A: {question[:50]}",
+            "content": answer,
+            "source": source
+        }
+    )
+
+
+def learned_qa_id(question, category) -> str:
+    """Vector ID used by chat_digitaltwin_learning.py for learned Q&A"""
+    return f"qa_{category}_{hashlib.md5(normalize_question(question).encode()).hexdigest()[:12]}"
+
+
+def load_documents(json_file=JSON_FILE, corpora: Sequence[str] = CORPORA) -> List[Document]:
+    documents = []
+    try:
+        profile = get_profile(json_file)
+        chunks, qa_entries = profile.content_chunks, profile.qa_entries
+    except (FileNotFoundError, ValueError):
+        chunks, qa_entries = [], []
+
+    for chunk in chunks:
+        metadata = chunk.get("metadata", {})
+        documents.append(Document(
+            id=chunk["id"],
+            text=f"{chunk['title']} {chunk['content']} {' '.join(metadata.get('tags', []))}",
+            metadata={
+                "title": chunk["title"],
+                "type": chunk.get("type", ""),
+                "content": chunk["content"],
+                "category": metadata.get("category", ""),
+                "tags": ",".join(metadata.get("tags", []))
+            }
+        ))
+
+    for category, entry in qa_entries:
+        documents.append(qa_document(learned_qa_id(entry["question"], category), entry["question"],
+                                     entry["answer"], category, json_file))
+
+    for path in corpora:
+        if not os.path.exists(path):
+            continue
+        stem = os.path.splitext(os.path.basename(path))[0]
+        for pair in qa_parser.iter_qa_file(path):
+            question_hash = hashlib.md5(normalize_question(pair.question).encode()).hexdigest()[:12]
+            documents.append(qa_document(f"{stem}_{question_hash}", pair.question, pair.answer,
+                                         pair.category, path))
+    return documents
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k=RRF_K, weights=None) -> Dict[str, float]:
+    """RRF score per ID: sum of weight / (k + rank) over every ranking it appears in"""
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item_id in enumerate(ranking, 1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+    return scores
+
+
+class HybridRetriever:
+    """Vector search + BM25, fused with RRF; top-k is configurable per stage"""
+
+    def __init__(self, index, json_file=JSON_FILE, corpora: Sequence[str] = CORPORA,
+                 vector_top_k=HYBRID_VECTOR_TOP_K, bm25_top_k=HYBRID_BM25_TOP_K, rrf_k=RRF_K):
+        self.index = index
+        self.json_file = json_file
+        self.corpora = list(corpora)
+        self.vector_top_k = vector_top_k
+        self.bm25_top_k = bm25_top_k
+        self.rrf_k = rrf_k
+        self.bm25 = BM25Index()
+        self.stamps = None
+        self.lock = threading.RLock()
+        self.refresh()
+
+    def _source_stamps(self):
+        return [file_stamp(path) for path in [self.json_file] + self.corpora]
+
+    def refresh(self, force=False):
+        """Rebuild the BM25 index if any source file changed"""
+        stamps = self._source_stamps()
+        with self.lock:
+            if force or stamps != self.stamps:
+                bm25 = BM25Index()
+                for document in load_documents(self.json_file, self.corpora):
+                    bm25.add(document)
+                self.bm25, self.stamps = bm25, stamps
+
+    def add(self, doc_id, question, answer, category):
+        """Make a just-learned Q&A searchable before it is compacted into the JSON file"""
+        with self.lock:
+            self.bm25.add(qa_document(doc_id, question, answer, category, "learned"))
+
+    def search(self, query, top_k=3) -> List[HybridResult]:
+        self.refresh()
+        vector_results = self.index.query(data=query, top_k=self.vector_top_k, include_metadata=True) or []
+        with self.lock:
+            bm25_results = self.bm25.search(query, top_k=self.bm25_top_k)
+
+        fused = reciprocal_rank_fusion([[r.id for r in vector_results], [d.id for d, _ in bm25_results]],
+                                       k=self.rrf_k)
+        best_possible = 2.0 / (self.rrf_k + 1)
+
+        results: Dict[str, HybridResult] = {}
+        for rank, result in enumerate(vector_results, 1):
+            results[result.id] = HybridResult(id=result.id, score=0.0, metadata=result.metadata,
+                                              data=getattr(result, 'data', None),
+                                              vector_rank=rank, vector_score=result.score)
+        for rank, (document, score) in enumerate(bm25_results, 1):
+            hit = results.setdefault(document.id, HybridResult(id=document.id, score=0.0,
+                                                               metadata=document.metadata))
+            if not hit.metadata or not hit.metadata.get("content"):
+                hit.metadata = document.metadata
+            hit.bm25_rank, hit.bm25_score = rank, score
+
+        # Drop duplicates of the same text reachable under a vector ID and a corpus ID
+        ranked, seen = [], set()
+        for item_id in sorted(fused, key=fused.get, reverse=True):
+            hit = results[item_id]
+            hit.score = fused[item_id] / best_possible
+            key = normalize_question((hit.metadata or {}).get("content", "") or item_id)
+            if key in seen:
+                continue
+            seen.add(key)
+            ranked.append(hit)
+            if len(ranked) >= top_k:
+                break
+        return ranked
+
+
+_retrievers: Dict[int, HybridRetriever] = {}
+_retrievers_lock = threading.Lock()
+
+
+def get_hybrid_retriever(index) -> HybridRetriever:
+    """One retriever (and BM25 index) per vector index for the life of the process"""
+    with _retrievers_lock:
+        if id(index) not in _retrievers:
+            _retrievers[id(index)] = HybridRetriever(index)
+        return _retrievers[id(index)]
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print('Usage: python hybrid_search.py "query text"')
+        sys.exit(1)
+
+    bm25 = BM25Index()
+    for document in load_documents():
+        bm25.add(document)
+    query = " ".join(sys.argv[1:])
+    print(f"🔎 BM25 over {len(bm25)} documents for '{query}':")
+    for document, score in bm25.search(query, top_k=5):
+        print(f"🔹 {document.id} ({score:.2f}): {document.metadata.get('title', '')}")
@@ -9,11 +9,20 @@ This allows the digital twin to learn and improve over time.
 """
 
 import os
+import sys
 import json
+import time
+import hashlib
 from datetime import datetime
 from dotenv import load_dotenv
-from upstash_vector import Index
+from local_vector import get_index
 from groq import Groq
+import qa_parser
+import profile_loader
+import rag_client
+from hybrid_search import learned_qa_id
+from qa_index import QuestionIndex
+from qa_store import get_qa_store
 
 # Load environment variables
 load_dotenv('.env.local')
@@ -22,12 +31,13 @@ load_dotenv('.env.local')
 JSON_FILE = "data/digitaltwin.json"
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 DEFAULT_MODEL = "llama-3.1-8b-instant"
+IMPORT_BATCH_SIZE = int(os.getenv('QA_IMPORT_BATCH_SIZE', 100))
 
 def setup_clients():
     """Setup Groq and Upstash clients"""
     try:
         groq_client = Groq(api_key=GROQ_API_KEY)
-        vector_index = Index.from_env()
+        vector_index = get_index()
         return groq_client, vector_index
     except Exception as e:
         print(f"❌ Error setting up clients: {str(e)}")
@@ -36,8 +46,7 @@ def setup_clients():
 def load_profile():
     """Load the digital twin profile from JSON"""
     try:
-        with open(JSON_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return profile_loader.load_profile(JSON_FILE, fresh=True)
     except Exception as e:
         print(f"❌ Error loading profile: {str(e)}")
         return None
@@ -56,7 +65,8 @@ def generate_qa_id(question):
     """Generate a unique ID for Q&A pair"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     question_slug = question.lower().replace(" ", "_")[:30]
-    return f"qa_{question_slug}_{timestamp}"
+    question_hash = hashlib.md5(question.encode()).hexdigest()[:6]
+    return f"qa_{question_slug}_{timestamp}_{question_hash}"
 
 def add_qa_to_json(profile_data, question, answer, category="interview"):
     """Add Q&A pair to JSON file in interview_qa section"""
@@ -98,33 +108,34 @@ def add_qa_to_json(profile_data, question, answer, category="interview"):
     
     return profile_data
 
+def build_qa_vector(question, answer, category, vector_id=None):
+    """Build the (id, text, metadata) vector for a Q&A pair"""
+    # Create enriched text for better retrieval
+    enriched_text = f"Interview Question: {question}\n\nAnswer: {answer}"
+    
+    return (
+        vector_id or generate_qa_id(question),
+        enriched_text,
+        {
+            "type": "interview_qa",
+            "question": question,
+            "answer": answer,
+            "category": category,
+            "title": f"Interview Q&A: {question[:50]}...",
+            "content": answer,
+            "tags": f"interview,qa,{category}",
+            "added_date": datetime.now().isoformat()
+        }
+    )
+
 def add_qa_to_vector_db(vector_index, question, answer, category):
     """Add Q&A pair to Upstash Vector Database"""
     try:
-        qa_id = generate_qa_id(question)
-        
-        # Create enriched text for better retrieval
-        enriched_text = f"Interview Question: {question}\n\nAnswer: {answer}"
-        
-        # Prepare vector with metadata
-        vector = (
-            qa_id,
-            enriched_text,
-            {
-                "type": "interview_qa",
-                "question": question,
-                "answer": answer,
-                "category": category,
-                "title": f"Interview Q&A: {question[:50]}...",
-                "content": answer,
-                "tags": f"interview,qa,{category}",
-                "added_date": datetime.now().isoformat()
-            }
-        )
+        vector = build_qa_vector(question, answer, category)
         
         # Upload to vector database
         vector_index.upsert(vectors=[vector])
-        print(f"✅ Added to vector database: {qa_id}")
+        print(f"✅ Added to vector database: {vector[0]}")
         return True
         
     except Exception as e:
@@ -163,6 +174,17 @@ def save_qa_pair(question, answer, category=None):
         category = categorize_question(question)
         print(f"📂 Auto-categorized as: {category}")
     
+    # A running rag_service.py saves it with its warm clients (and makes it answerable immediately)
+    service = rag_client.connect(sys.argv)
+    if service:
+        try:
+            result = service.save_qa_pair(question, answer, category)
+            print(f"✅ Saved through the RAG service (category: {result['category']}, "
+                  f"queue depth: {result['queue_depth']})")
+            return True
+        except rag_client.RAGServiceError as e:
+            print(f"⚠️ RAG service error ({e}), saving directly...")
+    
     # Setup clients
     groq_client, vector_index = setup_clients()
     if not vector_index:
@@ -242,38 +264,59 @@ def interactive_qa_session():
     print("Your digital twin is now smarter! 🚀")
 
 def bulk_import_from_text(file_path):
-    """Import Q&A pairs from a text file"""
+    """Import Q&A pairs from a text file through the Q&A store (vectors upserted in batches)"""
     print(f"📥 Importing Q&A pairs from {file_path}...")
+    start = time.perf_counter()
     
+    qa_store_backend = get_qa_store(json_file=JSON_FILE)
+    question_index = QuestionIndex(json_file=JSON_FILE, pending_entries=qa_store_backend.pending())
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        vector_index = get_index()
         
-        # Parse Q&A pairs (expecting format: Q: question\nA: answer\n\n)
-        qa_pairs = []
-        sections = content.split("\n\n")
+        # Stream Q&A pairs (format: Q: question\nA: answer, optional ## category headers);
+        # same bookkeeping as a learned answer: repeats resolve to the question on file
+        items, vectors = [], {}
+        for pair in qa_parser.iter_qa_file(file_path, default_category=None):
+            match = question_index.record(pair.question, pair.category or categorize_question(pair.question))
+            question, category = match["question"], match["category"]
+            items.append((question, pair.answer, category))
+            vector_id = learned_qa_id(question, category)
+            vectors[vector_id] = build_qa_vector(question, pair.answer, category, vector_id=vector_id)
         
-        for section in sections:
-            lines = section.strip().split("\n")
-            if len(lines) >= 2:
-                question_line = lines[0].strip()
-                answer_lines = lines[1:]
-                
-                if question_line.startswith("Q:") or question_line.startswith("Question:"):
-                    question = question_line.split(":", 1)[1].strip()
-                    answer = "\n".join([line.split(":", 1)[1].strip() if ":" in line else line for line in answer_lines])
-                    qa_pairs.append((question, answer))
+        if not items:
+            print("⚠️ No Q&A pairs found in file")
+            return
+        print(f"📝 Parsed {len(items)} Q&A pairs")
         
-        # Save all Q&A pairs
-        success_count = 0
-        for question, answer in qa_pairs:
-            if save_qa_pair(question, answer):
-                success_count += 1
+        # Persist through the configured Q&A store, then merge into the JSON view once
+        qa_store_backend.record_many(items)
+        merged = qa_store_backend.compact()
+        question_index.mark_synced()
+        print(f"✅ Saved to {qa_store_backend.name} store ({merged} entries merged into {JSON_FILE})")
         
-        print(f"\n✅ Imported {success_count}/{len(qa_pairs)} Q&A pairs successfully!")
+        # Upsert to the configured vector backend in batches
+        print("🔄 Adding to vector database...")
+        vectors = list(vectors.values())
+        succeeded = 0
+        for offset in range(0, len(vectors), IMPORT_BATCH_SIZE):
+            batch = vectors[offset:offset + IMPORT_BATCH_SIZE]
+            try:
+                vector_index.upsert(vectors=batch)
+                succeeded += len(batch)
+            except Exception as e:
+                print(f"❌ Batch {offset // IMPORT_BATCH_SIZE + 1} failed: {str(e)}")
+        print(f"✅ Upserted {succeeded}/{len(vectors)} Q&A vectors")
+        
+        elapsed = time.perf_counter() - start
+        rate = len(items) / elapsed if elapsed > 0 else 0.0
+        print(f"\n✅ Imported {len(items)} Q&A pairs ({succeeded}/{len(vectors)} vectors)!")
+        print(f"⚡ Throughput: {rate:.1f} pairs/sec ({elapsed:.2f}s total)")
         
     except Exception as e:
         print(f"❌ Error importing: {str(e)}")
+    finally:
+        question_index.close()
+        qa_store_backend.close()
 
 def view_saved_qa():
     """View all saved Q&A pairs"""
@@ -296,8 +339,6 @@ def view_saved_qa():
                 print(f"  {i}. {qa['question'][:60]}...")
 
 if __name__ == "__main__":
-    import sys
-    
     if len(sys.argv) > 1:
         command = sys.argv[1]
         
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Latency Stats
+Dependency-free helpers shared by the timing reports (async_rag.py,
+rag_service.py, eval_retrieval.py), so importing them does not pull in the
+Groq SDK or the vector clients.
+"""
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values (0.0 for an empty list)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
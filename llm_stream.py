@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+LLM Streaming Helpers
+Streams Groq chat completions token by token (stream=True) for the chat REPLs
+and measures time-to-first-token and tokens/sec, mirroring
+generateStreamingResponse in lib/local-rag-system.ts.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class TokenPrinter:
+    """on_token callback that prints a prefix before the first token, then tokens as they arrive"""
+
+    def __init__(self, prefix="🤖 Digital Twin: "):
+        self.prefix = prefix
+        self.started = False
+
+    def __call__(self, token):
+        if not self.started:
+            print(self.prefix, end="", flush=True)
+            self.started = True
+        print(token, end="", flush=True)
+
+
+def stream_chat_completion(client, model, messages: List[Dict[str, str]], temperature=0.7, max_tokens=500,
+                           on_token: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+    """Run a streaming completion, feeding each text delta to on_token; returns text and timings"""
+    start = time.perf_counter()
+    first_token_at = None
+    parts = []
+    chunks = 0
+    completion_tokens = None
+
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+    for chunk in stream:
+        if chunk.choices:
+            token = chunk.choices[0].delta.content
+            if token:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                parts.append(token)
+                chunks += 1
+                if on_token:
+                    on_token(token)
+        # Groq reports exact usage on the final chunk
+        usage = getattr(getattr(chunk, 'x_groq', None), 'usage', None)
+        if usage is not None:
+            completion_tokens = usage.completion_tokens
+
+    end = time.perf_counter()
+    tokens = completion_tokens if completion_tokens is not None else chunks
+    generation_seconds = end - (first_token_at or end)
+    return {
+        "text": "".join(parts),
+        "ttft": (first_token_at - start) if first_token_at else None,
+        "seconds": end - start,
+        "tokens": tokens,
+        "tokens_per_sec": tokens / generation_seconds if generation_seconds > 0 else 0.0
+    }
+
+
+def print_stream_stats(stats: Dict[str, Any]):
+    ttft = f"{stats['ttft']:.2f}s" if stats['ttft'] is not None else "n/a"
+    print(f"\n\n⏱️ First token in {ttft}, {stats['tokens']} tokens in {stats['seconds']:.2f}s "
+          f"({stats['tokens_per_sec']:.0f} tokens/sec)")
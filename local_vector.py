@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Local Vector Index
+In-process drop-in for upstash_vector.Index (upsert/query/delete/fetch/range/info/reset)
+backed by a NumPy matrix of normalized embeddings with brute-force cosine top-k.
+For a knowledge base of a few hundred chunks a single matrix-vector product is
+sub-millisecond, so no approximate (HNSW) structure is needed. Text is embedded
+locally through embeddings.py (ONNX model or hashing fallback, cached on disk).
+
+Select it with VECTOR_BACKEND=local (default: upstash). Data is persisted to
+data/local_index.npz + data/local_index.json.
+
+data/vector_seeded.json remembers which indexes already hold the profile, so
+the chat CLIs can skip the info() round trip at startup; reset() clears it.
+"""
+
+import os
+import re
+import json
+import threading
+import functools
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from embeddings import get_embedder, normalize_rows
+from retrieval_cache import bump_index_version
+
+# Constants
+LOCAL_INDEX_PATH = os.getenv('LOCAL_INDEX_PATH', 'data/local_index')
+SEEDED_MARKER_FILE = "data/vector_seeded.json"
+_FILTER_CLAUSE = re.compile(r"^\s*(\w+)\s*(=|!=)\s*'([^']*)'\s*$")
+
+
+@dataclass
+class QueryResult:
+    id: str
+    score: float
+    vector: Optional[List[float]] = None
+    metadata: Optional[Dict] = None
+    data: Optional[str] = None
+
+
+@dataclass
+class FetchResult:
+    id: str
+    vector: Optional[List[float]] = None
+    metadata: Optional[Dict] = None
+    data: Optional[str] = None
+
+
+@dataclass
+class RangeResult:
+    next_cursor: str
+    vectors: List[FetchResult] = field(default_factory=list)
+
+
+@dataclass
+class DeleteResult:
+    deleted: int
+
+
+@dataclass
+class InfoResult:
+    vector_count: int
+    pending_vector_count: int
+    index_size: int
+    dimension: int
+    similarity_function: str
+
+    @property
+    def total_vector_count(self):
+        return self.vector_count
+
+
+def parse_filter(expression: str) -> Callable[[Dict[str, Any]], bool]:
+    """Support Upstash-style equality filters: "type = 'qa' AND category != 'general'" """
+    if not expression:
+        return lambda metadata: True
+
+    clauses = []
+    for part in re.split(r"\s+AND\s+", expression, flags=re.IGNORECASE):
+        match = _FILTER_CLAUSE.match(part)
+        if not match:
+            raise ValueError(f"Unsupported filter for local index: {part!r}")
+        clauses.append(match.groups())
+
+    def predicate(metadata):
+        for key, op, value in clauses:
+            actual = str(metadata.get(key, ''))
+            if (op == '=' and actual != value) or (op == '!=' and actual == value):
+                return False
+        return True
+
+    return predicate
+
+
+def _synchronized(method):
+    """Serialize calls so background upserts never race a query on the same matrix"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class LocalIndex:
+    """NumPy-backed vector index with the upstash_vector.Index call surface"""
+
+    def __init__(self, path: Optional[str] = LOCAL_INDEX_PATH, embed: Optional[Callable] = None,
+                 dimension: Optional[int] = None):
+        self.path = path
+        self.embed = embed or get_embedder()
+        self.model_id = getattr(self.embed, 'model_id', None)
+        self.dimension = dimension
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.metadata: List[Dict[str, Any]] = []
+        self.data: List[Optional[str]] = []
+        self.matrix = np.zeros((0, dimension or 0), dtype=np.float32)
+        self.lock = threading.RLock()
+        if path:
+            self.load()
+
+    # Persistence
+
+    def load(self):
+        if not os.path.exists(f"{self.path}.npz"):
+            return
+        with np.load(f"{self.path}.npz") as arrays:
+            self.matrix = arrays['vectors'].astype(np.float32)
+        with open(f"{self.path}.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.ids = meta['ids']
+        self.metadata = meta['metadata']
+        self.data = meta['data']
+        self.rows = {vector_id: row for row, vector_id in enumerate(self.ids)}
+        self.dimension = self.matrix.shape[1] if len(self.ids) else self.dimension
+
+        if self.ids and meta.get('model') and meta['model'] != self.model_id:
+            self._reembed(meta['model'])
+
+    def _reembed(self, old_model):
+        """Re-embed stored texts after the embedding model changed"""
+        if any(text is None for text in self.data):
+            raise ValueError(f"Index was built with '{old_model}' and holds raw vectors; "
+                             f"reset it before switching to '{self.model_id}'")
+        print(f"🔄 Embedding model changed ({old_model} -> {self.model_id}), re-embedding {len(self.ids)} vectors...")
+        self.matrix = normalize_rows(np.asarray(self.embed(self.data), dtype=np.float32))
+        self.dimension = self.matrix.shape[1]
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        np.savez(f"{self.path}.tmp.npz", vectors=self.matrix)
+        with open(f"{self.path}.tmp.json", "w", encoding="utf-8") as f:
+            json.dump({'model': self.model_id, 'ids': self.ids, 'metadata': self.metadata, 'data': self.data},
+                      f, ensure_ascii=False)
+        os.replace(f"{self.path}.tmp.npz", f"{self.path}.npz")
+        os.replace(f"{self.path}.tmp.json", f"{self.path}.json")
+
+    # Upstash-compatible API
+
+    @_synchronized
+    def upsert(self, vectors, namespace: str = '') -> str:
+        # Last write wins for an ID repeated within the batch, as with sequential Upstash upserts
+        records = list({record['id']: record for record in map(self._to_record, vectors)}.values())
+        if not records:
+            return "Success"
+        texts = [r['data'] for r in records if r['vector'] is None]
+        if texts:
+            embedded = iter(self.embed(texts))
+            for record in records:
+                if record['vector'] is None:
+                    record['vector'] = next(embedded)
+
+        # Validate the whole batch before touching any index state
+        new_vectors = normalize_rows(np.asarray([r['vector'] for r in records], dtype=np.float32))
+        dimension = self.dimension if self.ids and self.dimension is not None else new_vectors.shape[1]
+        if new_vectors.shape[1] != dimension:
+            raise ValueError(f"Vector dimension {new_vectors.shape[1]} does not match index dimension {dimension}")
+
+        matrix = self.matrix if self.ids else np.zeros((0, dimension), dtype=np.float32)
+        appended = [i for i, record in enumerate(records) if record['id'] not in self.rows]
+        if appended:
+            # Grow the matrix first so every row assigned below exists
+            matrix = np.vstack([matrix, new_vectors[appended]])
+
+        self.dimension, self.matrix = dimension, matrix
+        for record, vector in zip(records, new_vectors):
+            row = self.rows.get(record['id'])
+            if row is None:
+                self.rows[record['id']] = len(self.ids)
+                self.ids.append(record['id'])
+                self.metadata.append(record['metadata'])
+                self.data.append(record['data'])
+            else:
+                self.matrix[row] = vector
+                self.metadata[row] = record['metadata']
+                self.data[row] = record['data']
+
+        self.save()
+        return "Success"
+
+    @_synchronized
+    def query(self, vector=None, top_k: int = 10, include_vectors: bool = False,
+              include_metadata: bool = False, filter: str = '', data: Optional[str] = None,
+              namespace: str = '', include_data: bool = False) -> List[QueryResult]:
+        if not self.ids:
+            return []
+        if vector is None:
+            if data is None:
+                raise ValueError("Either vector or data must be given")
+            vector = self.embed([data])[0]
+
+        query_vector = normalize_rows(np.asarray([vector], dtype=np.float32))[0]
+        similarities = self.matrix @ query_vector
+
+        if filter:
+            predicate = parse_filter(filter)
+            allowed = np.array([predicate(m or {}) for m in self.metadata], dtype=bool)
+            similarities = np.where(allowed, similarities, -np.inf)
+
+        k = min(top_k, len(self.ids))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+
+        return [
+            QueryResult(
+                id=self.ids[row],
+                score=float((1.0 + similarities[row]) / 2.0),  # Upstash COSINE score range [0, 1]
+                vector=self.matrix[row].tolist() if include_vectors else None,
+                metadata=self.metadata[row] if include_metadata else None,
+                data=self.data[row] if include_data else None
+            )
+            for row in top if np.isfinite(similarities[row])
+        ]
+
+    @_synchronized
+    def fetch(self, ids=None, include_vectors: bool = False, include_metadata: bool = False,
+              namespace: str = '', include_data: bool = False) -> List[Optional[FetchResult]]:
+        ids = [ids] if isinstance(ids, str) else (ids or [])
+        return [self._fetch_row(self.rows[i], include_vectors, include_metadata, include_data)
+                if i in self.rows else None for i in ids]
+
+    @_synchronized
+    def range(self, cursor: str = '', limit: int = 1, include_vectors: bool = False,
+              include_metadata: bool = False, namespace: str = '', include_data: bool = False,
+              prefix: Optional[str] = None) -> RangeResult:
+        start = int(cursor or 0)
+        rows = [row for row in range(start, len(self.ids))
+                if prefix is None or self.ids[row].startswith(prefix)][:limit]
+        end = rows[-1] + 1 if rows else len(self.ids)
+        return RangeResult(
+            next_cursor=str(end) if end < len(self.ids) else '',
+            vectors=[self._fetch_row(row, include_vectors, include_metadata, include_data) for row in rows]
+        )
+
+    @_synchronized
+    def delete(self, ids=None, namespace: str = '', prefix: Optional[str] = None,
+               filter: Optional[str] = None) -> DeleteResult:
+        ids = [ids] if isinstance(ids, str) else list(ids or [])
+        doomed = {self.rows[i] for i in ids if i in self.rows}
+        if prefix:
+            doomed |= {row for row, i in enumerate(self.ids) if i.startswith(prefix)}
+        if filter:
+            predicate = parse_filter(filter)
+            doomed |= {row for row, m in enumerate(self.metadata) if predicate(m or {})}
+        if not doomed:
+            return DeleteResult(deleted=0)
+
+        keep = [row for row in range(len(self.ids)) if row not in doomed]
+        self.matrix = self.matrix[keep]
+        self.ids = [self.ids[row] for row in keep]
+        self.metadata = [self.metadata[row] for row in keep]
+        self.data = [self.data[row] for row in keep]
+        self.rows = {vector_id: row for row, vector_id in enumerate(self.ids)}
+        self.save()
+        return DeleteResult(deleted=len(doomed))
+
+    @_synchronized
+    def info(self) -> InfoResult:
+        return InfoResult(
+            vector_count=len(self.ids),
+            pending_vector_count=0,
+            index_size=int(self.matrix.nbytes),
+            dimension=self.dimension or 0,
+            similarity_function="COSINE"
+        )
+
+    @_synchronized
+    def reset(self, namespace: str = '', all: bool = False) -> str:
+        self.ids, self.rows, self.metadata, self.data = [], {}, [], []
+        self.matrix = np.zeros((0, self.dimension or 0), dtype=np.float32)
+        self.save()
+        return "Success"
+
+    # Helpers
+
+    def _fetch_row(self, row, include_vectors, include_metadata, include_data):
+        return FetchResult(
+            id=self.ids[row],
+            vector=self.matrix[row].tolist() if include_vectors else None,
+            metadata=self.metadata[row] if include_metadata else None,
+            data=self.data[row] if include_data else None
+        )
+
+    @staticmethod
+    def _to_record(vector) -> Dict[str, Any]:
+        """Accept the same tuple / dict / Vector shapes as upstash_vector.Index.upsert"""
+        if isinstance(vector, (tuple, list)):
+            vector_id, payload = vector[0], vector[1]
+            metadata = vector[2] if len(vector) > 2 else None
+            data = vector[3] if len(vector) > 3 else None
+        elif isinstance(vector, dict):
+            vector_id = vector['id']
+            payload = vector.get('vector')
+            if payload is None:
+                payload = vector.get('data', vector.get('text'))
+            metadata, data = vector.get('metadata'), vector.get('data')
+        else:
+            vector_id = vector.id
+            payload = getattr(vector, 'vector', None)
+            if payload is None:
+                payload = getattr(vector, 'data', None)
+            metadata, data = getattr(vector, 'metadata', None), getattr(vector, 'data', None)
+
+        if isinstance(payload, str):
+            return {'id': str(vector_id), 'vector': None, 'data': payload, 'metadata': metadata or {}}
+        return {'id': str(vector_id), 'vector': list(payload), 'data': data, 'metadata': metadata or {}}
+
+
+class VersionedIndex:
+    """Wraps an index so every write bumps the retrieval-cache index version"""
+
+    def __init__(self, index, backend):
+        self._index = index
+        self.backend = backend
+
+    def __getattr__(self, name):
+        return getattr(self._index, name)
+
+    def upsert(self, *args, **kwargs):
+        result = self._index.upsert(*args, **kwargs)
+        bump_index_version()
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = self._index.delete(*args, **kwargs)
+        bump_index_version()
+        return result
+
+    def reset(self, *args, **kwargs):
+        result = self._index.reset(*args, **kwargs)
+        bump_index_version()
+        clear_seeded_marker()
+        return result
+
+
+def index_identity(backend) -> str:
+    """Which physical index a backend points at (REST URL or local path)"""
+    if backend == 'local':
+        return os.path.abspath(os.getenv('LOCAL_INDEX_PATH', LOCAL_INDEX_PATH))
+    return os.getenv('UPSTASH_VECTOR_REST_URL', '')
+
+
+def _read_seeded_marker(path) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def is_seeded(backend, path=SEEDED_MARKER_FILE) -> bool:
+    identity = index_identity(backend)
+    return bool(identity) and _read_seeded_marker(path).get(backend) == identity
+
+
+def mark_seeded(backend, path=SEEDED_MARKER_FILE):
+    markers = _read_seeded_marker(path)
+    markers[backend] = index_identity(backend)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(markers, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def clear_seeded_marker(path=SEEDED_MARKER_FILE):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def get_index(backend: Optional[str] = None):
+    """Return the configured vector index (VECTOR_BACKEND=upstash|local)"""
+    # Read at call time so scripts that load .env.local after importing still pick it up
+    backend = (backend or os.getenv('VECTOR_BACKEND', 'upstash')).lower()
+    if backend == 'local':
+        return VersionedIndex(LocalIndex(os.getenv('LOCAL_INDEX_PATH', LOCAL_INDEX_PATH)), backend)
+    if backend != 'upstash':
+        raise ValueError(f"Unknown VECTOR_BACKEND '{backend}' (expected 'upstash' or 'local')")
+
+    from upstash_vector import Index
+    return VersionedIndex(Index.from_env(), backend)
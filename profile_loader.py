@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Profile Loader
+Single access point for data/digitaltwin.json. The file is read once as bytes,
+its encoding detected once (BOM / UTF-8 / cp1252 / latin-1) instead of
+re-reading it per candidate encoding, and the parsed document is memoized by
+file mtime and size, so every script and every setup step in a process shares
+one parse until the file actually changes. orjson is used when installed.
+
+Section accessors (content_chunks, interview_qa, projects, qa_entries) are
+computed on first use and cached with the document.
+
+Callers that modify the profile and write it back must use
+load_profile(fresh=True) so they get a private copy, never the shared one.
+
+Usage:
+  python profile_loader.py           - Show encoding, parse time and section sizes
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+# Constants
+JSON_FILE = "data/digitaltwin.json"
+FALLBACK_ENCODINGS = ("cp1252", "latin-1")
+
+_lock = threading.Lock()
+_profiles: Dict[str, "ProfileDocument"] = {}
+
+
+def profile_stamp(path) -> Tuple[int, int]:
+    """(mtime_ns, size) - raises FileNotFoundError like open() would"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def detect_encoding(raw: bytes) -> str:
+    if raw.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    try:
+        raw.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            raw.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def parse_json(raw: bytes, encoding: str) -> Any:
+    """orjson parses UTF-8 bytes directly; anything else goes through the stdlib"""
+    if encoding == "utf-8-sig":
+        raw, encoding = raw[3:], "utf-8"
+    if orjson is not None and encoding == "utf-8":
+        return orjson.loads(raw)
+    return json.loads(raw.decode(encoding))
+
+
+class ProfileDocument:
+    """One parsed version of the profile with lazily derived sections"""
+
+    def __init__(self, path, stamp, encoding, raw: bytes):
+        self.path = path
+        self.stamp = stamp
+        self.encoding = encoding
+        self._raw = raw
+        self._data: Optional[Dict[str, Any]] = None
+        self._sections: Dict[str, Any] = {}
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = parse_json(self._raw, self.encoding)
+        return self._data
+
+    def copy(self) -> Dict[str, Any]:
+        """A private, freely mutable parse of the same bytes"""
+        return parse_json(self._raw, self.encoding)
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def _section(self, name, build):
+        if name not in self._sections:
+            self._sections[name] = build()
+        return self._sections[name]
+
+    @property
+    def content_chunks(self) -> List[Dict[str, Any]]:
+        return self._section("content_chunks", lambda: self.data.get("content_chunks", []))
+
+    @property
+    def interview_qa(self) -> Dict[str, Any]:
+        return self._section("interview_qa", lambda: self.data.get("interview_qa", {}))
+
+    @property
+    def qa_categories(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self._section("qa_categories", lambda: self.interview_qa.get("categories", {}))
+
+    @property
+    def qa_entries(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Flat (category, entry) pairs across every interview_qa category"""
+        return self._section("qa_entries", lambda: [(category, entry)
+                                                    for category, entries in self.qa_categories.items()
+                                                    for entry in entries])
+
+    @property
+    def projects(self) -> List[Dict[str, Any]]:
+        return self._section("projects", lambda: self.data.get("projects", []))
+
+
+def get_profile(path=JSON_FILE) -> ProfileDocument:
+    """Memoized profile document; re-read only when mtime or size changes"""
+    stamp = profile_stamp(path)
+    with _lock:
+        cached = _profiles.get(path)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+        with open(path, "rb") as f:
+            raw = f.read()
+        # Re-stat after reading so a write racing the read is picked up next time
+        document = ProfileDocument(path, profile_stamp(path), detect_encoding(raw), raw)
+        _profiles[path] = document
+        return document
+
+
+def load_profile(path=JSON_FILE, fresh=False) -> Dict[str, Any]:
+    """Parsed profile dict; fresh=True returns a private copy safe to modify and save"""
+    document = get_profile(path)
+    return document.copy() if fresh else document.data
+
+
+def content_chunks(path=JSON_FILE) -> List[Dict[str, Any]]:
+    return get_profile(path).content_chunks
+
+
+def interview_qa(path=JSON_FILE) -> Dict[str, Any]:
+    return get_profile(path).interview_qa
+
+
+def qa_categories(path=JSON_FILE) -> Dict[str, List[Dict[str, Any]]]:
+    return get_profile(path).qa_categories
+
+
+def projects(path=JSON_FILE) -> List[Dict[str, Any]]:
+    return get_profile(path).projects
+
+
+def clear_cache():
+    with _lock:
+        _profiles.clear()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    path = sys.argv[1] if len(sys.argv) > 1 else JSON_FILE
+    start = time.perf_counter()
+    document = get_profile(path)
+    document.data
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    get_profile(path).data
+    second = time.perf_counter() - start
+
+    print(f"📄 {path}: {document.stamp[1] / 1024:.0f} KB, encoding {document.encoding}, "
+          f"parser {'orjson' if orjson else 'json'}")
+    print(f"⏱️ First load {first * 1000:.2f}ms, memoized load {second * 1000:.3f}ms")
+    print(f"📚 {len(document.content_chunks)} content chunks, {len(document.qa_entries)} Q&A in "
+          f"{len(document.qa_categories)} categories, {len(document.projects)} projects")
@@ -1,15 +1,4 @@
-import os
-from upstash_vector import Index
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv('.env.local')
-
-# Initialize Upstash Vector
-index = Index(
-    url=os.getenv('UPSTASH_VECTOR_REST_URL'),
-    token=os.getenv('UPSTASH_VECTOR_REST_TOKEN')
-)
+import twin_ingest
 
 # Updated and corrected Q&A pairs
 corrections_data = [
@@ -94,52 +83,39 @@ corrections_data = [
 
 def upload_corrections():
     """Upload corrected Q&A pairs to Upstash Vector"""
-    success_count = 0
-    error_count = 0
-    
     print(f"Starting upload of {len(corrections_data)} corrected Q&A pairs to Upstash Vector...")
     print("=" * 80)
     
-    for item in corrections_data:
-        try:
-            # Combine question and answer for embedding
-            combined_text = f"Q: {item['question']}\nA: {item['answer']}"
-            
-            # Upsert to Upstash (will update if ID exists, create if not)
-            index.upsert(
-                vectors=[
-                    {
-                        "id": item["id"],
-                        "data": combined_text,
-                        "metadata": {
-                            "question": item["question"],
-                            "answer": item["answer"],
-                            "type": "correction_update",
-                            "category": item["id"].split("_")[0]
-                        }
-                    }
-                ]
-            )
-            
-            success_count += 1
-            print(f"✅ Updated: {item['id']}")
-            
-        except Exception as e:
-            error_count += 1
-            print(f"❌ Error updating {item['id']}: {str(e)}")
+    # Combine question and answer for embedding; upsert updates existing IDs
+    vectors = [
+        {
+            "id": item["id"],
+            "data": f"Q: {item['question']}\nA: {item['answer']}",
+            "metadata": {
+                "question": item["question"],
+                "answer": item["answer"],
+                "type": "correction_update",
+                "category": item["id"].split("_")[0]
+            }
+        }
+        for item in corrections_data
+    ]
+    
+    report = twin_ingest.upsert(vectors)
+    twin_ingest.print_report(report, label="corrections")
     
     print("=" * 80)
     print(f"\n📊 Upload Summary:")
-    print(f"✅ Successfully upserted: {success_count} vectors")
-    print(f"❌ Errors encountered: {error_count}")
-    print(f"\n🎯 Total vectors updated: {success_count}")
+    print(f"✅ Successfully upserted: {report['succeeded']} vectors")
+    print(f"❌ Errors encountered: {report['failed']}")
+    print(f"\n🎯 Total vectors updated: {report['succeeded']}")
     
     # Get info about the index
     try:
-        info = index.info()
+        info = twin_ingest.info()
         print(f"\n📈 Current Upstash Vector Database Stats:")
-        print(f"   Total vectors: {info.vector_count}")
-        print(f"   Dimension: {info.dimension}")
+        print(f"   Total vectors: {info.get('vectorCount', 'N/A')}")
+        print(f"   Dimension: {info.get('dimension', 'N/A')}")
     except Exception as e:
         print(f"\n⚠️ Could not fetch index info: {str(e)}")
 
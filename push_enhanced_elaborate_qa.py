@@ -1,13 +1,20 @@
 """
 Push Enhanced Elaborate Q&A pairs to Upstash Vector Database
 Replaces short answers with longer, more detailed, conversational responses
+
+Usage:
+  python push_enhanced_elaborate_qa.py                  - Push every Q&A pair
+  python push_enhanced_elaborate_qa.py sync [--dry-run] - Push only added/changed pairs, delete removed ones
 """
 
 import os
-import requests
+import sys
 import hashlib
 from dotenv import load_dotenv
 from datetime import datetime
+import qa_parser
+import twin_ingest
+import twin_sync
 
 # Load environment variables
 load_dotenv('.env.local')
@@ -27,40 +34,11 @@ def create_vector_id(question: str, prefix: str = "enhanced_qa") -> str:
 
 def parse_qa_file(filename: str) -> list:
     """Parse the Q&A file and return list of QA pairs"""
-    qa_pairs = []
-    
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Split by Q: to get individual QA pairs
-        sections = content.split('\nQ: ')[1:]  # Skip header
-        
-        for section in sections:
-            lines = section.strip().split('\n')
-            if len(lines) >= 2:
-                question = lines[0].strip()
-                
-                # Find the answer (starts with A:)
-                answer_lines = []
-                in_answer = False
-                for line in lines[1:]:
-                    if line.startswith('A: '):
-                        in_answer = True
-                        answer_lines.append(line[3:])  # Remove 'A: ' prefix
-                    elif in_answer:
-                        if line.startswith('Q: ') or line.startswith('## '):
-                            break
-                        answer_lines.append(line)
-                
-                if answer_lines:
-                    answer = ' '.join(answer_lines).strip()
-                    qa_pairs.append({
-                        'question': question,
-                        'answer': answer
-                    })
-        
-        return qa_pairs
+        return [
+            {'question': pair.question, 'answer': pair.answer}
+            for pair in qa_parser.iter_qa_file(filename)
+        ]
     
     except FileNotFoundError:
         print(f"❌ Error: File {filename} not found")
@@ -69,34 +47,19 @@ def parse_qa_file(filename: str) -> list:
         print(f"❌ Error parsing file: {e}")
         return []
 
-def upload_to_upstash(qa_pairs: list) -> None:
-    """Upload QA pairs to Upstash using /upsert-data endpoint"""
-    
-    endpoint = f"{UPSTASH_URL}/upsert-data"
-    headers = {
-        "Authorization": f"Bearer {UPSTASH_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    
-    success_count = 0
-    error_count = 0
-    
-    print(f"\n🚀 Starting upload of {len(qa_pairs)} enhanced Q&A pairs...\n")
-    
-    for idx, qa in enumerate(qa_pairs, 1):
+SYNC_SOURCE = "enhanced_elaborate_qa"
+
+def build_vectors(qa_pairs: list) -> list:
+    """Build Upstash vector records with deterministic IDs"""
+    vectors = []
+    for qa in qa_pairs:
         question = qa['question']
         answer = qa['answer']
         
-        # Create vector ID
-        vector_id = create_vector_id(question, prefix="enhanced_qa")
-        
-        # Prepare the data for upstash
         # Combine question and answer for embedding
-        combined_text = f"Q: {question}\nA: {answer}"
-        
-        payload = {
-            "id": vector_id,
-            "data": combined_text,
+        vectors.append({
+            "id": create_vector_id(question, prefix="enhanced_qa"),
+            "data": f"Q: {question}\nA: {answer}",
             "metadata": {
                 "question": question,
                 "answer": answer,
@@ -106,28 +69,28 @@ def upload_to_upstash(qa_pairs: list) -> None:
                 "enhanced": True,
                 "source": "elaborate_qa_update"
             }
-        }
-        
-        try:
-            response = requests.post(endpoint, json=payload, headers=headers)
-            
-            if response.status_code == 200:
-                success_count += 1
-                print(f"✅ [{idx}/{len(qa_pairs)}] Uploaded: {question[:60]}...")
-            else:
-                error_count += 1
-                print(f"❌ [{idx}/{len(qa_pairs)}] Failed: {question[:60]}...")
-                print(f"   Status: {response.status_code}, Response: {response.text}")
-        
-        except Exception as e:
-            error_count += 1
-            print(f"❌ [{idx}/{len(qa_pairs)}] Error uploading: {e}")
+        })
+    return vectors
+
+def upload_to_upstash(qa_pairs: list) -> None:
+    """Upload QA pairs to Upstash using /upsert-data endpoint"""
+    
+    print(f"\n🚀 Starting upload of {len(qa_pairs)} enhanced Q&A pairs...\n")
+    
+    report = twin_ingest.upsert(build_vectors(qa_pairs), endpoint="upsert-data",
+                                url=UPSTASH_URL, token=UPSTASH_TOKEN)
+    twin_ingest.print_report(report, label="Q&A pairs")
     
     print(f"\n{'='*60}")
-    print(f"✅ Successfully upserted: {success_count} vectors")
-    print(f"❌ Errors encountered: {error_count}")
+    print(f"✅ Successfully upserted: {report['succeeded']} vectors")
+    print(f"❌ Errors encountered: {report['failed']}")
     print(f"{'='*60}\n")
 
+def sync_to_upstash(qa_pairs: list, dry_run: bool = False) -> None:
+    """Push only the Q&A pairs that changed since the last sync"""
+    twin_sync.sync(SYNC_SOURCE, build_vectors(qa_pairs), dry_run=dry_run, endpoint="upsert-data",
+                   url=UPSTASH_URL, token=UPSTASH_TOKEN)
+
 def main():
     """Main function"""
     print("="*60)
@@ -145,7 +108,10 @@ def main():
     print(f"🎯 Target: {UPSTASH_URL}")
     
     # Upload to Upstash
-    upload_to_upstash(qa_pairs)
+    if len(sys.argv) > 1 and sys.argv[1] == "sync":
+        sync_to_upstash(qa_pairs, dry_run="--dry-run" in sys.argv)
+    else:
+        upload_to_upstash(qa_pairs)
     
     print("\n✨ Enhanced Q&A upload complete!")
 
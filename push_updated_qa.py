@@ -4,14 +4,20 @@ Push Updated Q&A Database to Upstash Vector
 This script uploads the comprehensive Q&A database with 100+ questions to Upstash Vector.
 Successfully uploads Q&A pairs using the /upsert-data endpoint which automatically 
 handles text embedding via Upstash's built-in embedding model.
+
+Usage:
+  python push_updated_qa.py                  - Push every Q&A pair
+  python push_updated_qa.py sync [--dry-run] - Push only added/changed pairs, delete removed ones
 """
 
 import os
 import sys
 from dotenv import load_dotenv
-import requests
 from datetime import datetime
 import hashlib
+import qa_parser
+import twin_ingest
+import twin_sync
 
 # Load environment variables from .env.local
 load_dotenv('.env.local')
@@ -21,7 +27,9 @@ def create_vector_id(text: str, prefix: str = "qa") -> str:
     hash_object = hashlib.md5(text.encode())
     return f"{prefix}_{hash_object.hexdigest()[:12]}"
 
-def main():
+SYNC_SOURCE = "comprehensive_qa_update"
+
+def main(mode="push", dry_run=False):
     # Get Upstash credentials
     upstash_url = os.getenv("UPSTASH_VECTOR_REST_URL")
     upstash_token = os.getenv("UPSTASH_VECTOR_REST_TOKEN")
@@ -30,11 +38,6 @@ def main():
         print("❌ Error: Upstash credentials not found in .env.local")
         return 0, ["Missing credentials"]
     
-    headers = {
-        'Authorization': f'Bearer {upstash_token}',
-        'Content-Type': 'application/json'
-    }
-    
     print("🚀 Starting Q&A database update to Upstash Vector...")
     print(f"⏰ Timestamp: {datetime.now().isoformat()}")
     print(f"📍 Upstash URL: {upstash_url[:50]}...")
@@ -43,59 +46,23 @@ def main():
     # Parse comprehensive Q&A from file
     qa_pairs = []
     try:
-        with open('comprehensive_qa_update.txt', 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Parse Q&A pairs from the file
-        # Format: Q: question\nA: answer\n
-        current_question = None
-        current_answer = []
-        current_category = "general"
-        
-        for line in content.split('\n'):
-            line = line.strip()
-            
-            # Skip empty lines and headers
-            if not line or line.startswith('#') or line.startswith('='):
-                continue
-            
-            # Detect category headers
-            if line.startswith('##'):
-                current_category = line.replace('#', '').strip().lower().replace(' ', '_')
-                continue
-            
-            # Parse question
-            if line.startswith('Q:'):
-                # Save previous Q&A if exists
-                if current_question and current_answer:
-                    qa_pairs.append({
-                        "question": current_question,
-                        "answer": ' '.join(current_answer).strip(),
-                        "category": current_category
-                    })
-                
-                current_question = line[2:].strip()
-                current_answer = []
-            
-            # Parse answer
-            elif line.startswith('A:'):
-                current_answer = [line[2:].strip()]
-            
-            # Continue multi-line answer
-            elif current_question and not line.startswith('Q:'):
-                current_answer.append(line)
-        
-        # Don't forget the last Q&A pair
-        if current_question and current_answer:
-            qa_pairs.append({
-                "question": current_question,
-                "answer": ' '.join(current_answer).strip(),
-                "category": current_category
-            })
+        # Format: ## Category header, then Q: question\nA: answer
+        qa_pairs = [
+            {
+                "question": pair.question,
+                "answer": pair.answer,
+                "category": pair.category
+            }
+            for pair in qa_parser.iter_qa_file('comprehensive_qa_update.txt')
+        ]
         
         print(f"📝 Parsed {len(qa_pairs)} Q&A pairs from comprehensive_qa_update.txt")
         
     except FileNotFoundError:
+        if mode == "sync":
+            # A sync from the sample pair would delete every previously pushed pair as "removed"
+            print("❌ comprehensive_qa_update.txt not found - aborting sync, nothing pushed or deleted")
+            return 0, ["Missing comprehensive_qa_update.txt"]
         print("⚠️  comprehensive_qa_update.txt not found, using sample Q&A pairs...")
         qa_pairs = [
             {
@@ -105,50 +72,35 @@ def main():
             }
         ]
     
-    vectors_upserted = 0
-    errors = []
-    
-    # Upsert vectors to Upstash
-    for idx, qa in enumerate(qa_pairs, 1):
-        try:
-            # Create combined text for embedding
-            combined_text = f"Q: {qa['question']}\nA: {qa['answer']}"
-            
-            # Create deterministic ID
-            vector_id = create_vector_id(combined_text, prefix="qa_updated")
-            
-            # Prepare upsert data (Upstash format - single dict, not array)
-            upsert_data = {
-                "id": vector_id,
-                "data": combined_text,
-                "metadata": {
-                    "question": qa["question"],
-                    "answer": qa["answer"],
-                    "category": qa.get("category", "general"),
-                    "updated_at": datetime.now().isoformat(),
-                    "type": "qa_pair"
-                }
+    # Create combined text for embedding with a deterministic ID per pair
+    vectors = []
+    for qa in qa_pairs:
+        combined_text = f"Q: {qa['question']}\nA: {qa['answer']}"
+        vectors.append({
+            "id": create_vector_id(combined_text, prefix="qa_updated"),
+            "data": combined_text,
+            "metadata": {
+                "question": qa["question"],
+                "answer": qa["answer"],
+                "category": qa.get("category", "general"),
+                "updated_at": datetime.now().isoformat(),
+                "type": "qa_pair"
             }
-            
-            # Upsert to Upstash via REST API (using /upsert-data for automatic embedding)
-            response = requests.post(
-                f"{upstash_url}/upsert-data",
-                headers=headers,
-                json=upsert_data
-            )
-            
-            if response.status_code == 200:
-                vectors_upserted += 1
-                print(f"✅ Upserted {idx}/{len(qa_pairs)}: {qa['question'][:60]}...")
-            else:
-                error_msg = f"❌ Error upserting Q&A {idx}: HTTP {response.status_code} - {response.text}"
-                errors.append(error_msg)
-                print(error_msg)
-            
-        except Exception as e:
-            error_msg = f"❌ Error upserting Q&A {idx}: {str(e)}"
-            errors.append(error_msg)
-            print(error_msg)
+        })
+    
+    if mode == "sync":
+        if not qa_pairs:
+            print("❌ No Q&A pairs parsed from comprehensive_qa_update.txt - aborting sync")
+            return 0, ["No Q&A pairs parsed"]
+        summary = twin_sync.sync(SYNC_SOURCE, vectors, dry_run=dry_run, endpoint="upsert-data",
+                                 url=upstash_url, token=upstash_token)
+        return summary['pushed'], summary['errors']
+    
+    # Upsert to Upstash via REST API (using /upsert-data for automatic embedding)
+    report = twin_ingest.upsert(vectors, endpoint="upsert-data", url=upstash_url, token=upstash_token)
+    twin_ingest.print_report(report, label="Q&A pairs")
+    vectors_upserted = report['succeeded']
+    errors = [f"❌ Error upserting {error}" for error in report['errors']]
     
     # Print summary
     print("\n" + "="*80)
@@ -170,7 +122,8 @@ def main():
 
 if __name__ == "__main__":
     try:
-        vectors_upserted, errors = main()
+        mode = sys.argv[1] if len(sys.argv) > 1 else "push"
+        vectors_upserted, errors = main(mode=mode, dry_run="--dry-run" in sys.argv)
         sys.exit(0 if len(errors) == 0 else 1)
     except Exception as e:
         print(f"\n💥 Fatal error: {e}")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Interview Q&A Question Index
+Persistent normalized-question index spanning every interview_qa category, so
+learning mode can find a repeated question (and bump times_asked) in constant
+time instead of scanning one guessed category.
+
+- Exact matches: case, whitespace and punctuation are folded
+- Near duplicates (optional): MinHash signatures over character shingles with
+  LSH banding, enabled with QA_NEAR_DUPLICATES=1
+"""
+
+import os
+import re
+import json
+import zlib
+import random
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional
+from profile_loader import get_profile
+
+# Constants
+JSON_FILE = "data/digitaltwin.json"
+QA_INDEX_FILE = "data/interview_qa_index.sqlite3"
+QA_NEAR_DUPLICATES = os.getenv('QA_NEAR_DUPLICATES', '0') == '1'
+QA_NEAR_DUPLICATE_THRESHOLD = float(os.getenv('QA_NEAR_DUPLICATE_THRESHOLD', 0.8))
+
+SHINGLE_SIZE = 4
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERMUTATIONS)]
+
+_PUNCTUATION = re.compile(r"[^\w\s]+", re.UNICODE)
+
+
+def normalize_question(question: str) -> str:
+    """Fold case, punctuation and whitespace: 'What's  your GPA?' -> 'what s your gpa'"""
+    return " ".join(_PUNCTUATION.sub(" ", question.lower()).split())
+
+
+def minhash_signature(text: str) -> list:
+    """MinHash signature of the character shingles of normalized text"""
+    text = normalize_question(text)
+    if len(text) < SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def estimated_similarity(sig_a, sig_b) -> float:
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERMUTATIONS
+
+
+def lsh_bands(signature) -> list:
+    rows = NUM_PERMUTATIONS // LSH_BANDS
+    return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(LSH_BANDS)]
+
+
+def file_stamp(path) -> str:
+    try:
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    except FileNotFoundError:
+        return ""
+
+
+def iter_profile_questions(json_file) -> Iterable[Dict[str, Any]]:
+    try:
+        entries = get_profile(json_file).qa_entries
+    except FileNotFoundError:
+        return
+    for category, entry in entries:
+        yield {"question": entry["question"], "category": category,
+               "times_asked": entry.get("times_asked", 1)}
+
+
+class QuestionIndex:
+    """SQLite-backed map of normalized question -> canonical question, category and times_asked"""
+
+    def __init__(self, path=QA_INDEX_FILE, json_file=JSON_FILE, near_duplicates=QA_NEAR_DUPLICATES,
+                 threshold=QA_NEAR_DUPLICATE_THRESHOLD, pending_entries=None):
+        self.json_file = json_file
+        self.near_duplicates = near_duplicates
+        self.threshold = threshold
+        # Shared by the RAG service's worker threads; every access goes through self.lock
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS questions (
+                normalized TEXT PRIMARY KEY,
+                question TEXT NOT NULL,
+                category TEXT NOT NULL,
+                times_asked INTEGER NOT NULL DEFAULT 1,
+                signature TEXT
+            )
+        """)
+        self.db.commit()
+
+        if self._meta("source_stamp") != file_stamp(json_file):
+            self.rebuild(pending_entries or ())
+
+        self.buckets = {}
+        if near_duplicates:
+            for normalized, signature in self.db.execute("SELECT normalized, signature FROM questions"):
+                if signature:
+                    self._add_to_buckets(normalized, json.loads(signature))
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _add_to_buckets(self, normalized, signature):
+        for band in lsh_bands(signature):
+            self.buckets.setdefault(band, set()).add(normalized)
+
+    def rebuild(self, pending_entries: Iterable[Dict[str, Any]] = ()):
+        """Rebuild from the JSON profile plus entries not yet compacted into it"""
+        with self.lock:
+            with self.db:
+                self.db.execute("DELETE FROM questions")
+                for entry in list(iter_profile_questions(self.json_file)) + list(pending_entries):
+                    self._upsert(entry["question"], entry["category"], entry.get("times_asked", 1))
+                self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source_stamp', ?)",
+                                (file_stamp(self.json_file),))
+
+    def _upsert(self, question, category, times_asked=1):
+        normalized = normalize_question(question)
+        signature = json.dumps(minhash_signature(question)) if self.near_duplicates else None
+        self.db.execute("""
+            INSERT INTO questions (normalized, question, category, times_asked, signature)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (normalized) DO UPDATE SET times_asked = times_asked + excluded.times_asked
+        """, (normalized, question, category, times_asked, signature))
+        return normalized, signature
+
+    def lookup(self, question) -> Optional[Dict[str, Any]]:
+        """Find an exact (normalized) or near-duplicate match for a question"""
+        with self.lock:
+            normalized = normalize_question(question)
+            row = self.db.execute(
+                "SELECT question, category, times_asked FROM questions WHERE normalized = ?", (normalized,)
+            ).fetchone()
+            if row:
+                return {"normalized": normalized, "question": row[0], "category": row[1],
+                        "times_asked": row[2], "similarity": 1.0}
+
+            if not self.near_duplicates:
+                return None
+
+            signature = minhash_signature(question)
+            candidates = set()
+            for band in lsh_bands(signature):
+                candidates |= self.buckets.get(band, set())
+
+            best, best_score = None, self.threshold
+            for candidate in candidates:
+                row = self.db.execute(
+                    "SELECT question, category, times_asked, signature FROM questions WHERE normalized = ?",
+                    (candidate,)
+                ).fetchone()
+                if not row or not row[3]:
+                    continue
+                score = estimated_similarity(signature, json.loads(row[3]))
+                if score >= best_score:
+                    best_score = score
+                    best = {"normalized": candidate, "question": row[0], "category": row[1],
+                            "times_asked": row[2], "similarity": score}
+            return best
+
+    def record(self, question, category) -> Dict[str, Any]:
+        """Register an asked question; repeats resolve to the canonical question and category"""
+        with self.lock:
+            match = self.lookup(question)
+            with self.db:
+                if match:
+                    self.db.execute("UPDATE questions SET times_asked = times_asked + 1 WHERE normalized = ?",
+                                    (match["normalized"],))
+                    match["times_asked"] += 1
+                    match["is_new"] = False
+                    return match
+
+                normalized, signature = self._upsert(question, category)
+            if signature:
+                self._add_to_buckets(normalized, json.loads(signature))
+            return {"normalized": normalized, "question": question, "category": category,
+                    "times_asked": 1, "similarity": 1.0, "is_new": True}
+
+    def mark_synced(self):
+        """Record that the JSON profile now reflects everything in the index"""
+        with self.lock:
+            with self.db:
+                self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source_stamp', ?)",
+                                (file_stamp(self.json_file),))
+
+    def close(self):
+        self.db.close()
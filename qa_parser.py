@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Q&A Text Parser
+Single-pass, streaming parser for the Q:/A: text corpora used by every import path.
+
+Format grammar (one item per line):
+  # comment                  - file title / notes, ignored
+  ## Category Name           - sets the category for the pairs that follow
+  Q: / Question:             - starts a new pair
+  A: / Answer:               - starts the answer
+  Q (Tagalog): / QT:         - Tagalog version of the question
+  A (Tagalog): / AT:         - Tagalog version of the answer
+  [editor note], ---, ===    - ignored
+  anything else              - continues the current question or answer
+"""
+
+import re
+from dataclasses import dataclass, asdict
+from typing import Iterable, Iterator, Optional
+
+# (field, pattern) pairs, checked in order; Tagalog markers first so 'Q (Tagalog):' never matches 'Q:'
+FIELD_MARKERS = [
+    ("question_tagalog", re.compile(r"^(?:QT|Q\s*\(Tagalog\)|Question\s*\(Tagalog\)):\s*", re.IGNORECASE)),
+    ("answer_tagalog", re.compile(r"^(?:AT|A\s*\(Tagalog\)|Answer\s*\(Tagalog\)):\s*", re.IGNORECASE)),
+    ("question", re.compile(r"^(?:Q|Question):\s*")),
+    ("answer", re.compile(r"^(?:A|Answer):\s*")),
+]
+SEPARATOR_LINE = re.compile(r"^(?:-{3,}|={3,}|\*{3,}|\[.*\])$")
+
+
+@dataclass
+class QAPair:
+    """One parsed question/answer record"""
+    question: str
+    answer: str
+    category: Optional[str] = None
+    question_tagalog: Optional[str] = None
+    answer_tagalog: Optional[str] = None
+    source: Optional[str] = None
+    line: int = 0
+
+    def to_dict(self):
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def category_from_header(header: str) -> str:
+    """Turn '## TECHNICAL SKILLS' into 'technical_skills'"""
+    return header.lstrip('#').strip().lower().replace(' ', '_')
+
+
+def iter_qa_lines(lines: Iterable[str], source: str = "<text>",
+                  default_category: Optional[str] = "general") -> Iterator[QAPair]:
+    """Yield QAPair records from an iterable of lines, holding only the current pair in memory"""
+    category = default_category
+    fields = {}
+    current_field = None
+    start_line = 0
+
+    def flush():
+        if fields.get("question") and fields.get("answer"):
+            return QAPair(
+                question=" ".join(fields["question"]).strip(),
+                answer=" ".join(fields["answer"]).strip(),
+                category=category,
+                question_tagalog=" ".join(fields["question_tagalog"]).strip() if "question_tagalog" in fields else None,
+                answer_tagalog=" ".join(fields["answer_tagalog"]).strip() if "answer_tagalog" in fields else None,
+                source=source,
+                line=start_line
+            )
+        return None
+
+    for line_no, raw_line in enumerate(lines, 1):
+        line = raw_line.strip()
+        if not line or SEPARATOR_LINE.match(line):
+            continue
+
+        if line.startswith('#'):
+            if line.startswith('##'):
+                pair = flush()
+                if pair:
+                    yield pair
+                fields, current_field = {}, None
+                category = category_from_header(line)
+            continue
+
+        for field, pattern in FIELD_MARKERS:
+            match = pattern.match(line)
+            if match:
+                if field == "question":
+                    pair = flush()
+                    if pair:
+                        yield pair
+                    fields = {}
+                    start_line = line_no
+                current_field = field
+                fields[field] = [line[match.end():]]
+                break
+        else:
+            if current_field:
+                fields[current_field].append(line)
+
+    pair = flush()
+    if pair:
+        yield pair
+
+
+def iter_qa_file(file_path: str, default_category: Optional[str] = "general",
+                 encoding: str = "utf-8-sig") -> Iterator[QAPair]:
+    """Stream QAPair records from a Q:/A: text file"""
+    with open(file_path, "r", encoding=encoding) as f:
+        yield from iter_qa_lines(f, source=file_path, default_category=default_category)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python qa_parser.py <file> [<file> ...]")
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        count = 0
+        categories = set()
+        for pair in iter_qa_file(path):
+            count += 1
+            categories.add(pair.category)
+        print(f"📄 {path}: {count} Q&A pairs in {len(categories)} categories")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Background Q&A Persistence
+Moves learning-mode saves off the REPL's critical path: rag_query enqueues the
+answered question and returns immediately, while a worker thread drains the
+bounded queue and coalesces whatever has accumulated into one store write
+(QAStore.record_many) and one vector upsert.
+
+The queue blocks producers when full (QA_PERSIST_QUEUE_SIZE), so memory stays
+bounded even if the vector database is slow; flush()/close() wait for
+everything queued so far and are called on exit and Ctrl-C.
+"""
+
+import os
+import time
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Constants
+QA_PERSIST_QUEUE_SIZE = int(os.getenv('QA_PERSIST_QUEUE_SIZE', 256))
+QA_PERSIST_MAX_BATCH = int(os.getenv('QA_PERSIST_MAX_BATCH', 50))
+QA_PERSIST_BATCH_WINDOW = float(os.getenv('QA_PERSIST_BATCH_WINDOW', 0.25))
+
+_STOP = object()
+
+
+class QAPersistenceWorker:
+    """Single background thread that batches Q&A store writes and vector upserts"""
+
+    def __init__(self, store, index=None, build_vector: Optional[Callable] = None,
+                 maxsize=QA_PERSIST_QUEUE_SIZE, max_batch=QA_PERSIST_MAX_BATCH,
+                 batch_window=QA_PERSIST_BATCH_WINDOW):
+        self.store = store
+        self.index = index
+        self.build_vector = build_vector
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.saved = 0
+        self.upserted = 0
+        self.batches = 0
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, name="qa-persistence", daemon=True)
+        self.thread.start()
+
+    def submit(self, question, answer, category, vector=True) -> int:
+        """Queue one Q&A pair (vector=False skips the vector upsert); returns the queue depth"""
+        self.queue.put((question, answer, category, vector))
+        return self.queue.qsize()
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def _collect(self, first):
+        """Gather items that arrive within the batch window, up to max_batch"""
+        items = [first]
+        if first is _STOP:
+            return items
+        deadline = time.monotonic() + self.batch_window
+        while len(items) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=max(0.0, timeout)) if timeout > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            items.append(item)
+            if item is _STOP:
+                break
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect(self.queue.get())
+            # close() can race a submit() from another thread, so _STOP need not come last
+            stop = any(item is _STOP for item in items)
+            if stop:
+                # Saves submitted while closing are written rather than left in the queue
+                while True:
+                    try:
+                        items.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+            batch = [item for item in items if item is not _STOP]
+            try:
+                if batch:
+                    self._write(batch)
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch):
+        self.batches += 1
+        try:
+            self.saved += self.store.record_many((q, a, c) for q, a, c, _ in batch)
+        except Exception as e:
+            self.errors.append(f"Store write ({len(batch)} Q&A): {e}")
+
+        if self.index is None or self.build_vector is None:
+            return
+        # Later answers to the same question replace earlier ones (vector IDs are deterministic)
+        vectors = {}
+        for question, answer, category, with_vector in batch:
+            if with_vector:
+                vector = self.build_vector(question, answer, category)
+                vectors[vector[0]] = vector
+        if not vectors:
+            return
+        try:
+            self.index.upsert(vectors=list(vectors.values()))
+            self.upserted += len(vectors)
+        except Exception as e:
+            self.errors.append(f"Vector upsert ({len(vectors)} vectors): {e}")
+
+    def flush(self):
+        """Block until everything queued so far has been written"""
+        self.queue.join()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.depth,
+            "saved": self.saved,
+            "upserted": self.upserted,
+            "batches": self.batches,
+            "errors": len(self.errors)
+        }
+
+
+def print_persistence_stats(worker: QAPersistenceWorker):
+    stats = worker.stats()
+    print(f"📊 Background saves: {stats['saved']} Q&A saved, {stats['upserted']} vectors upserted "
+          f"in {stats['batches']} batch(es), {stats['queued']} queued, {stats['errors']} error(s)")
+    for error in worker.errors[-3:]:
+        print(f"   ⚠️ {error}")
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Interview Q&A Store
+Pluggable persistence for learned interview_qa entries.
+
+Backends (QA_STORE_BACKEND):
+- jsonl  : append-only log, one line per interaction (default)
+- sqlite : SQLite table indexed on normalized question text
+- json   : legacy whole-file rewrite of data/digitaltwin.json
+
+Repeated questions are matched across all categories (see qa_index.py).
+The jsonl and sqlite backends keep per-turn cost constant; `compact` merges
+their pending entries into the JSON view on demand.
+
+Usage:
+  python qa_store.py compact  - Merge pending Q&A entries into data/digitaltwin.json
+  python qa_store.py status   - Show backend and number of pending entries
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterator
+from qa_index import normalize_question
+from profile_loader import load_profile
+
+# Constants
+JSON_FILE = "data/digitaltwin.json"
+QA_LOG_FILE = "data/interview_qa.jsonl"
+QA_DB_FILE = "data/interview_qa.sqlite3"
+QA_STORE_BACKEND = os.getenv('QA_STORE_BACKEND', 'jsonl')
+
+DEFAULT_CATEGORIES = ["personal", "technical", "projects", "leadership", "behavioral", "career", "general"]
+
+
+def new_qa_entry(question, answer, category, asked_at=None) -> Dict[str, Any]:
+    return {
+        "question": question,
+        "answer": answer,
+        "category": category,
+        "added_date": asked_at or datetime.now().isoformat(),
+        "times_asked": 1
+    }
+
+
+def ensure_interview_qa(profile_data):
+    """Ensure the interview_qa section exists"""
+    if "interview_qa" not in profile_data:
+        profile_data["interview_qa"] = {
+            "questions_answered": 0,
+            "last_updated": None,
+            "categories": {category: [] for category in DEFAULT_CATEGORIES}
+        }
+    return profile_data["interview_qa"]
+
+
+def build_question_lookup(profile_data) -> Dict[str, Dict[str, Any]]:
+    """Map normalized question -> existing entry across every category"""
+    lookup = {}
+    for entries in ensure_interview_qa(profile_data)["categories"].values():
+        for entry in entries:
+            lookup.setdefault(normalize_question(entry["question"]), entry)
+    return lookup
+
+
+def merge_qa_entry(profile_data, entry, lookup=None):
+    """Merge one Q&A entry into the profile, bumping times_asked for repeats in any category"""
+    interview_qa = ensure_interview_qa(profile_data)
+    if lookup is None:
+        lookup = build_question_lookup(profile_data)
+    key = normalize_question(entry["question"])
+
+    existing_qa = lookup.get(key)
+    if existing_qa is not None:
+        existing_qa["times_asked"] = existing_qa.get("times_asked", 0) + entry.get("times_asked", 1)
+        existing_qa["answer"] = entry["answer"]  # Update with latest answer
+    else:
+        new_entry = dict(entry)
+        interview_qa["categories"].setdefault(entry["category"], []).append(new_entry)
+        interview_qa["questions_answered"] = interview_qa.get("questions_answered", 0) + 1
+        lookup[key] = new_entry
+
+    interview_qa["last_updated"] = datetime.now().isoformat()
+
+
+def merge_qa_entries(profile_data, entries) -> int:
+    """Merge many entries with a single lookup build (O(1) per entry)"""
+    lookup = build_question_lookup(profile_data)
+    count = 0
+    for entry in entries:
+        merge_qa_entry(profile_data, entry, lookup)
+        count += 1
+    return count
+
+
+def read_json(path):
+    """Private copy of the profile, safe to modify and write back"""
+    return load_profile(path, fresh=True)
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file and rename it over the target so a crash never leaves it half-written"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class QAStore(ABC):
+    """Base class: subclasses persist entries and list the ones not yet merged into the JSON view"""
+
+    name = "base"
+
+    def __init__(self, json_file=JSON_FILE):
+        self.json_file = json_file
+
+    @abstractmethod
+    def record(self, question, answer, category) -> bool:
+        """Persist one Q&A pair"""
+
+    def record_many(self, items) -> int:
+        """Persist (question, answer, category) tuples; backends override to write them in one go"""
+        count = 0
+        for question, answer, category in items:
+            self.record(question, answer, category)
+            count += 1
+        return count
+
+    def pending(self) -> Iterator[Dict[str, Any]]:
+        return iter(())
+
+    def pending_count(self) -> int:
+        return sum(1 for _ in self.pending())
+
+    def compact(self) -> int:
+        """Merge pending entries into the JSON view; returns the number merged.
+        Backends that keep pending entries override this; the rest write through."""
+        return 0
+
+    def close(self):
+        pass
+
+
+class JsonQAStore(QAStore):
+    """Legacy behaviour: rewrite the whole profile on every save"""
+
+    name = "json"
+
+    def record(self, question, answer, category):
+        profile_data = read_json(self.json_file)
+        merge_qa_entry(profile_data, new_qa_entry(question, answer, category))
+        write_json_atomic(self.json_file, profile_data)
+        return True
+
+    def record_many(self, items):
+        items = list(items)
+        if not items:
+            return 0
+        profile_data = read_json(self.json_file)
+        merge_qa_entries(profile_data, (new_qa_entry(q, a, c) for q, a, c in items))
+        write_json_atomic(self.json_file, profile_data)
+        return len(items)
+
+
+class JsonlQAStore(QAStore):
+    """Append-only JSONL log; each save is a single appended line"""
+
+    name = "jsonl"
+
+    def __init__(self, json_file=JSON_FILE, log_file=QA_LOG_FILE):
+        super().__init__(json_file)
+        self.log_file = log_file
+
+    def record(self, question, answer, category):
+        return self.record_many([(question, answer, category)]) == 1
+
+    def record_many(self, items):
+        lines = [json.dumps(new_qa_entry(q, a, c), ensure_ascii=False) + "\n" for q, a, c in items]
+        if not lines:
+            return 0
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
+    @property
+    def compacting_file(self):
+        return f"{self.log_file}.compacting"
+
+    def _read_log(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append can only damage the last line; skip it
+                    continue
+
+    def pending(self):
+        yield from self._read_log(self.compacting_file)
+        yield from self._read_log(self.log_file)
+
+    def compact(self):
+        # Move the live log aside first so saves made during compaction land in a fresh log
+        if os.path.exists(self.log_file) and not os.path.exists(self.compacting_file):
+            os.replace(self.log_file, self.compacting_file)
+
+        entries = list(self._read_log(self.compacting_file))
+        if entries:
+            profile_data = read_json(self.json_file)
+            merge_qa_entries(profile_data, entries)
+            write_json_atomic(self.json_file, profile_data)
+        if os.path.exists(self.compacting_file):
+            os.remove(self.compacting_file)
+        return len(entries)
+
+
+class SqliteQAStore(QAStore):
+    """SQLite table indexed on normalized question text; repeats update in place"""
+
+    name = "sqlite"
+
+    def __init__(self, json_file=JSON_FILE, db_file=QA_DB_FILE):
+        super().__init__(json_file)
+        # The learning REPL hands writes to a background thread (see qa_persistence.py) and the RAG
+        # service shares one store across workers; every use of the connection goes through self.lock
+        self.db = sqlite3.connect(db_file, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS interview_qa (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                normalized_question TEXT NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                category TEXT NOT NULL,
+                added_date TEXT NOT NULL,
+                times_asked INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        self.db.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_interview_qa_normalized
+            ON interview_qa (normalized_question)
+        """)
+        self.db.commit()
+
+    def record(self, question, answer, category):
+        return self.record_many([(question, answer, category)]) == 1
+
+    def record_many(self, items):
+        rows = [(normalize_question(q), q, a, c, new_qa_entry(q, a, c)["added_date"]) for q, a, c in items]
+        with self.lock, self.db:
+            self.db.executemany("""
+                INSERT INTO interview_qa (normalized_question, question, answer, category, added_date, times_asked)
+                VALUES (?, ?, ?, ?, ?, 1)
+                ON CONFLICT (normalized_question)
+                DO UPDATE SET answer = excluded.answer, times_asked = times_asked + 1
+            """, rows)
+        return len(rows)
+
+    def _pending_rows(self):
+        return self.db.execute(
+            "SELECT id, question, answer, category, added_date, times_asked FROM interview_qa ORDER BY id"
+        ).fetchall()
+
+    @staticmethod
+    def _entry(row) -> Dict[str, Any]:
+        _, question, answer, category, added_date, times_asked = row
+        return {
+            "question": question,
+            "answer": answer,
+            "category": category,
+            "added_date": added_date,
+            "times_asked": times_asked
+        }
+
+    def pending(self):
+        with self.lock:
+            rows = self._pending_rows()
+        for row in rows:
+            yield self._entry(row)
+
+    def pending_count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM interview_qa").fetchone()[0]
+
+    def compact(self):
+        with self.lock:
+            # BEGIN IMMEDIATE holds SQLite's write lock from the read to the delete, so a row recorded
+            # (or a repeat counted) by another process meanwhile waits and stays pending
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._pending_rows()
+                if rows:
+                    profile_data = read_json(self.json_file)
+                    merge_qa_entries(profile_data, (self._entry(row) for row in rows))
+                    write_json_atomic(self.json_file, profile_data)
+                    # Only the rows merged above
+                    self.db.execute("DELETE FROM interview_qa WHERE id <= ?", (rows[-1][0],))
+                self.db.commit()
+            except BaseException:
+                self.db.rollback()
+                raise
+        return len(rows)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+BACKENDS = {
+    "json": JsonQAStore,
+    "jsonl": JsonlQAStore,
+    "sqlite": SqliteQAStore,
+}
+
+
+def get_qa_store(backend=None, json_file=JSON_FILE) -> QAStore:
+    """Create the configured Q&A store backend"""
+    backend = (backend or QA_STORE_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown QA_STORE_BACKEND '{backend}' (expected one of: {', '.join(BACKENDS)})")
+    return BACKENDS[backend](json_file=json_file)
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    store = get_qa_store()
+
+    if command == "compact":
+        merged = store.compact()
+        print(f"✅ Compacted {merged} pending Q&A entries into {store.json_file} ({store.name} backend)")
+    elif command == "status":
+        print(f"📦 Backend: {store.name}")
+        print(f"📝 Pending entries: {store.pending_count()}")
+    else:
+        print("Usage:")
+        print("  python qa_store.py compact  - Merge pending Q&A entries into data/digitaltwin.json")
+        print("  python qa_store.py status   - Show backend and number of pending entries")
+
+    store.close()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+RAG Service Client
+Thin stdlib-only client for rag_service.py. The chat CLIs and
+interview_qa_manager.py check for a running service first and hand their work
+to it, so they start without loading the SDKs, the index or the caches;
+without a service they fall back to running everything in-process.
+
+Usage:
+  python rag_client.py "question"     - Ask the running service
+  python rag_client.py stats          - Show service statistics
+"""
+
+import os
+import json
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional
+
+# Constants
+RAG_SERVICE_URL = os.getenv('RAG_SERVICE_URL', 'http://127.0.0.1:8765')
+RAG_SERVICE_TIMEOUT = float(os.getenv('RAG_SERVICE_TIMEOUT', 120))
+HEALTH_TIMEOUT = 0.3
+
+
+class RAGServiceError(Exception):
+    """The service answered with an error status or could not be reached"""
+
+
+class RAGClient:
+    def __init__(self, url=None, timeout=RAG_SERVICE_TIMEOUT):
+        # Read at call time so .env.local loaded after import still applies
+        self.url = (url or os.getenv('RAG_SERVICE_URL', RAG_SERVICE_URL)).rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, path, payload=None, timeout=None) -> Dict[str, Any]:
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(f"{self.url}{path}", data=data,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            raise RAGServiceError(f"{e.code}: {e.read().decode('utf-8', 'replace')}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise RAGServiceError(str(e)) from e
+
+    def available(self) -> bool:
+        try:
+            return self._request('/health', timeout=HEALTH_TIMEOUT).get('status') == 'ok'
+        except RAGServiceError:
+            return False
+
+    def rag_query(self, question, learn=False) -> Dict[str, Any]:
+        return self._request('/rag_query', {'question': question, 'learn': learn})
+
+    def search(self, question, top_k=3) -> Dict[str, Any]:
+        return self._request('/search', {'question': question, 'top_k': top_k})
+
+    def save_qa_pair(self, question, answer, category=None) -> Dict[str, Any]:
+        return self._request('/save_qa_pair', {'question': question, 'answer': answer, 'category': category})
+
+    def stats(self) -> Dict[str, Any]:
+        return self._request('/stats')
+
+
+def connect(argv=()) -> Optional[RAGClient]:
+    """A client for the running service, or None (no service, or --no-service given)"""
+    if '--no-service' in argv:
+        return None
+    client = RAGClient()
+    return client if client.available() else None
+
+
+def print_service_stats(stats):
+    print(f"📊 RAG service: up {stats['uptime_seconds']:.0f}s, {stats['workers']} workers, "
+          f"{stats['in_flight']} in flight")
+    for endpoint, summary in stats['endpoints'].items():
+        print(f"   {endpoint}: {summary['requests']} requests, {summary['errors']} errors, "
+              f"p50 {summary['p50_ms']:.0f}ms, p95 {summary['p95_ms']:.0f}ms")
+    for name, cache in stats['caches'].items():
+        print(f"   {name}: {cache.get('hits', 0)} hits / {cache.get('misses', 0)} misses, "
+              f"{cache.get('entries', 0)} entries")
+    for name, flight in stats.get('single_flight', {}).items():
+        print(f"   single-flight {name}: {flight['executed']} upstream calls, {flight['coalesced']} coalesced")
+    packing = stats.get('context_packing')
+    if packing and packing['enabled']:
+        print(f"   context packing: {packing['tokens_saved']} prompt tokens saved over {packing['queries']} queries")
+    diversity = stats.get('diversification')
+    if diversity and diversity['enabled']:
+        print(f"   MMR: avg {diversity['avg_returned']:.1f} documents/query, "
+              f"{diversity['duplicates_skipped']} near-duplicates skipped")
+    rerank = stats.get('rerank')
+    if rerank and rerank['enabled']:
+        print(f"   rerank ({rerank['model']}): p50 {rerank['p50_ms']:.1f}ms, p95 {rerank['p95_ms']:.1f}ms, "
+              f"{rerank['hit_rate']:.0%} cache hit rate")
+
+
+def chat_session(client: RAGClient, learn=False):
+    """REPL that sends every question to the service"""
+    print(f"🔌 Connected to RAG service at {client.url} (start-up work already done)")
+    print("Type 'stats' for service statistics, 'exit' to quit.\n")
+    asked = 0
+    try:
+        while True:
+            question = input("You: ")
+            if question.lower() in ["exit", "quit"]:
+                print("👋 Thanks for chatting with your Digital Twin!")
+                break
+            if question.strip().lower() == "stats":
+                print_service_stats(client.stats())
+                print()
+                continue
+            if question.strip():
+                try:
+                    result = client.rag_query(question, learn=learn)
+                except RAGServiceError as e:
+                    print(f"❌ RAG service error: {e}\n")
+                    continue
+                print(f"🤖 Digital Twin: {result['answer']}\n")
+                asked += 1
+    except (KeyboardInterrupt, EOFError):
+        print("\n\n👋 Interrupted")
+    if learn:
+        print(f"🧠 Sent {asked} questions to the service for learning (saved by the service).")
+
+
+if __name__ == "__main__":
+    import sys
+    from dotenv import load_dotenv
+
+    load_dotenv('.env.local')
+    client = connect()
+    if not client:
+        print(f"❌ No RAG service running at {RAGClient().url} (start it with: python rag_service.py)")
+        sys.exit(1)
+    if len(sys.argv) < 2:
+        print(__doc__)
+    elif sys.argv[1] == "stats":
+        print_service_stats(client.stats())
+    else:
+        print(client.rag_query(" ".join(sys.argv[1:]))['answer'])
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+RAG Service
+Long-lived local HTTP daemon that keeps the digital twin warm: one Groq client
+and one vector index (pooled HTTP connections), the profile parsed once, and
+the retrieval/semantic caches, BM25 index and Q&A question index shared by
+every request. Requests are handled by a bounded worker pool; when every
+worker is busy and the backlog is full, new connections wait in the accept
+queue instead of spawning threads.
+
+The pipeline is the learning-mode one from chat_digitaltwin_learning.py, so
+answers match the CLIs exactly; learn=true saves the Q&A like learning mode.
+
+Endpoints (JSON):
+  POST /rag_query      {"question": "...", "learn": false}
+  POST /search         {"question": "...", "top_k": 3}        - retrieval only
+  POST /save_qa_pair   {"question": "...", "answer": "...", "category": null}
+  GET  /stats          request counts, latency percentiles and cache statistics
+  GET  /health
+
+Usage:
+  python rag_service.py [--port N] [--workers N] [--check-index]
+  (the chat CLIs and interview_qa_manager.py use it automatically; --no-service opts out)
+"""
+
+import time
+_IMPORT_START = time.perf_counter()
+
+import os
+import sys
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict
+from dotenv import load_dotenv
+import chat_digitaltwin_learning as engine
+from chat_startup import run_concurrently, print_startup_times
+from hybrid_search import HYBRID_SEARCH_ENABLED, get_hybrid_retriever, learned_qa_id
+from qa_persistence import QAPersistenceWorker, print_persistence_stats
+from chat_stats import print_all_stats
+from latency_stats import percentile
+
+# Load environment variables from .env.local
+load_dotenv('.env.local')
+
+# Constants
+RAG_SERVICE_HOST = os.getenv('RAG_SERVICE_HOST', '127.0.0.1')
+RAG_SERVICE_PORT = int(os.getenv('RAG_SERVICE_PORT', 8765))
+RAG_SERVICE_WORKERS = int(os.getenv('RAG_SERVICE_WORKERS', 8))
+RAG_SERVICE_BACKLOG = int(os.getenv('RAG_SERVICE_BACKLOG', 32))
+LATENCY_WINDOW = 1000
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+
+class RAGService:
+    """Warm clients and shared caches behind the service endpoints"""
+
+    def __init__(self, workers=RAG_SERVICE_WORKERS, check_index=False):
+        self.workers = workers
+        self.started = time.time()
+        init_start = time.perf_counter()
+        ready, steps = run_concurrently({
+            "groq": engine.setup_groq_client,
+            "vector": lambda: engine.setup_vector_database(check_index=check_index),
+            "q&a store": lambda: engine.semantic_cache.seed_from_profile(engine.JSON_FILE,
+                                                                         engine.setup_qa_store())
+        })
+        self.groq_client, self.index = ready["groq"], ready["vector"]
+        if not self.groq_client or not self.index:
+            raise RuntimeError("Could not initialize the Groq client and vector index")
+        if HYBRID_SEARCH_ENABLED:
+            get_hybrid_retriever(self.index)
+        # rag_query(save_response=True) and save_qa_pair queue their writes here
+        engine.persistence_worker = QAPersistenceWorker(engine.qa_store_backend, self.index,
+                                                        build_vector=engine.build_learned_qa_vector)
+        print_startup_times(IMPORT_SECONDS, time.perf_counter() - init_start, steps)
+
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.latencies: Dict[str, deque] = {}
+
+    def track(self, endpoint, handler, *args):
+        with self.lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = handler(*args)
+            ok = True
+            return result
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+                if not ok:
+                    self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+                self.latencies.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(
+                    time.perf_counter() - start)
+
+    # Endpoints
+
+    def rag_query(self, question, learn=False) -> Dict[str, Any]:
+        start = time.perf_counter()
+        answer = engine.rag_query(self.index, self.groq_client, question, save_response=learn)
+        return {"answer": answer, "seconds": time.perf_counter() - start}
+
+    def search(self, question, top_k=3) -> Dict[str, Any]:
+        start = time.perf_counter()
+        results = engine.query_vectors(self.index, question, top_k=top_k) or []
+        return {
+            "results": [{"id": r.id, "score": r.score, "metadata": r.metadata or {}} for r in results],
+            "seconds": time.perf_counter() - start
+        }
+
+    def save_qa_pair(self, question, answer, category=None) -> Dict[str, Any]:
+        # Same bookkeeping as a learned answer in rag_query: repeats resolve to the question on file
+        match = engine.question_index.record(question, category or engine.categorize_question(question))
+        question, category = match["question"], match["category"]
+        engine.semantic_cache.add(question, answer)
+        if HYBRID_SEARCH_ENABLED:
+            get_hybrid_retriever(self.index).add(learned_qa_id(question, category), question, answer, category)
+        depth = engine.persistence_worker.submit(question, answer, category)
+        return {"question": question, "category": category, "is_new": match["is_new"],
+                "times_asked": match["times_asked"], "queue_depth": depth}
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            endpoints = {
+                endpoint: {
+                    "requests": count,
+                    "errors": self.errors.get(endpoint, 0),
+                    "p50_ms": 1000 * percentile(list(self.latencies[endpoint]), 50),
+                    "p95_ms": 1000 * percentile(list(self.latencies[endpoint]), 95)
+                }
+                for endpoint, count in self.requests.items()
+            }
+            in_flight = self.in_flight
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "workers": self.workers,
+            "in_flight": in_flight,
+            "backend": self.index.backend,
+            "endpoints": endpoints,
+            "caches": {
+                "retrieval": engine.retrieval_cache.stats(),
+                "semantic": engine.semantic_cache.stats()
+            },
+            "single_flight": {
+                "retrieval": engine.retrieval_flight.stats(),
+                "generation": engine.generation_flight.stats()
+            },
+            "context_packing": engine.context_packer.stats(),
+            "diversification": engine.diversifier.stats(),
+            "rerank": engine.reranker.stats(),
+            "persistence": engine.persistence_worker.stats()
+        }
+
+    def close(self):
+        """Flush queued saves and fold them into the JSON profile"""
+        if engine.persistence_worker.depth:
+            print(f"💾 Flushing {engine.persistence_worker.depth} queued Q&A saves...")
+        engine.persistence_worker.close()
+        print_persistence_stats(engine.persistence_worker)
+        engine.compact_qa_store()
+        print_all_stats(engine.retrieval_cache, engine.semantic_cache, engine.retrieval_flight,
+                        engine.generation_flight, engine.context_packer, engine.diversifier, engine.reranker)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands each connection to a fixed-size thread pool"""
+
+    def __init__(self, address, handler, service, workers=RAG_SERVICE_WORKERS, backlog=RAG_SERVICE_BACKLOG):
+        super().__init__(address, handler)
+        self.service = service
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag-worker")
+        # Running + queued connections; the accept loop blocks beyond this
+        self.slots = threading.BoundedSemaphore(workers + backlog)
+
+    def process_request(self, request, client_address):
+        self.slots.acquire()
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class RAGRequestHandler(BaseHTTPRequestHandler):
+    server_version = "DigitalTwinRAG/1.0"
+
+    def _send(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == '/health':
+            self._send(200, {"status": "ok", "backend": service.index.backend})
+        elif self.path == '/stats':
+            self._send(200, service.stats())
+        else:
+            self._send(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        service = self.server.service
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            question = (body.get('question') or '').strip()
+            if not question:
+                self._send(400, {"error": "question is required"})
+                return
+
+            if self.path == '/rag_query':
+                result = service.track('rag_query', service.rag_query, question, bool(body.get('learn')))
+            elif self.path == '/search':
+                result = service.track('search', service.search, question, int(body.get('top_k', 3)))
+            elif self.path == '/save_qa_pair':
+                if not body.get('answer'):
+                    self._send(400, {"error": "answer is required"})
+                    return
+                result = service.track('save_qa_pair', service.save_qa_pair, question, body['answer'],
+                                       body.get('category'))
+            else:
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+                return
+            self._send(200, result)
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid request: {e}"})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        # One line per request on stdout instead of the default stderr access log
+        print(f"🌐 {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+
+def main():
+    args = sys.argv[1:]
+    port, workers, check_index = RAG_SERVICE_PORT, RAG_SERVICE_WORKERS, False
+    while args:
+        arg = args.pop(0)
+        if arg == '--port':
+            port = int(args.pop(0))
+        elif arg == '--workers':
+            workers = int(args.pop(0))
+        elif arg == '--check-index':
+            check_index = True
+        else:
+            print(__doc__)
+            return
+
+    print("🤖 Digital Twin RAG Service")
+    print("=" * 50)
+    try:
+        service = RAGService(workers=workers, check_index=check_index)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return
+
+    server = PooledHTTPServer((RAG_SERVICE_HOST, port), RAGRequestHandler, service, workers=workers)
+    print(f"✅ Listening on http://{RAG_SERVICE_HOST}:{port} with {workers} workers (Ctrl-C to stop)\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down...")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
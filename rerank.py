@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Rerank Stage
+Optional second-stage scoring of the retrieval candidate pool in
+query_vectors, so a wrong top hit from the single dense score (the
+TechFusion cases debug_metadata.py and verify_cleanup.py chase) can be
+corrected before diversification and prompt packing.
+
+- ONNX cross-encoder (e.g. ms-marco-MiniLM-L-6-v2 exported to model.onnx +
+  tokenizer.json) when RERANK_MODEL_DIR exists and onnxruntime/tokenizers are
+  installed; all (query, candidate) pairs of a query go through one batched
+  forward pass on the CPU
+- Lexical-overlap fallback otherwise: query-term coverage of the candidate
+  text, blended with the retrieval score
+
+Scores are kept in an LRU cache keyed by (normalized query, candidate id) and
+dropped when the vector index changes; only the scorer's own score is cached,
+the lexical blend with the current retrieval score is redone on every call.
+Every query reports the stage's latency; RERANK=0 (or --no-rerank in the chat
+scripts) disables it.
+
+Usage:
+  python rerank.py "query text"     - Rerank the index's top candidates for a query
+"""
+
+import os
+import copy
+import time
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from hybrid_search import tokenize
+from qa_index import normalize_question
+from retrieval_cache import current_index_version, INDEX_VERSION_FILE
+
+# Constants
+RERANK_ENABLED = os.getenv('RERANK', '1') != '0'
+RERANK_MODEL_DIR = os.getenv('RERANK_MODEL_DIR', 'models/ms-marco-MiniLM-L-6-v2')
+RERANK_TOP_N = int(os.getenv('RERANK_TOP_N', 10))
+RERANK_CACHE_SIZE = int(os.getenv('RERANK_CACHE_SIZE', 4096))
+# Share of the lexical fallback score taken from term overlap (the rest is the retrieval score)
+RERANK_LEXICAL_WEIGHT = float(os.getenv('RERANK_LEXICAL_WEIGHT', 0.3))
+MAX_SEQUENCE_LENGTH = 512
+LATENCY_WINDOW = 1000
+
+
+def candidate_text(result) -> str:
+    metadata = result.metadata or {}
+    text = metadata.get('content') or getattr(result, 'data', None) or ''
+    title = metadata.get('title', '')
+    return f"{title}: {text}" if title and text else text or title
+
+
+class CrossEncoder:
+    """ONNX sequence-pair classifier; one relevance logit per (query, passage)"""
+
+    def __init__(self, model_dir=RERANK_MODEL_DIR):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQUENCE_LENGTH)
+        self.tokenizer.enable_padding()
+        self.session = onnxruntime.InferenceSession(os.path.join(model_dir, "model.onnx"),
+                                                    providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.model_id = f"onnx-{os.path.basename(os.path.normpath(model_dir))}"
+
+    def score(self, query, results) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch([(query, candidate_text(r)) for r in results])
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        }
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        logits = self.session.run(None, feeds)[0].reshape(len(results), -1)[:, -1]
+        # Sigmoid keeps scores in [0, 1] like the Upstash cosine scores
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def combine(self, result, score) -> float:
+        return score
+
+
+class LexicalScorer:
+    """Query-term coverage of the candidate text, blended with the retrieval score by combine()"""
+
+    model_id = "lexical-overlap"
+
+    def __init__(self, weight=RERANK_LEXICAL_WEIGHT):
+        self.weight = weight
+
+    def score(self, query, results) -> np.ndarray:
+        terms = set(tokenize(query))
+        scores = np.zeros(len(results), dtype=np.float32)
+        for row, result in enumerate(results):
+            scores[row] = len(terms & set(tokenize(candidate_text(result)))) / len(terms) if terms else 0.0
+        return scores
+
+    def combine(self, result, score) -> float:
+        # Applied per call: fused scores move when BM25 learns a document, without an index-version bump
+        return (1 - self.weight) * (result.score or 0.0) + self.weight * score
+
+
+def load_scorer(model_dir=RERANK_MODEL_DIR):
+    """Cross-encoder if one is installed locally, otherwise the lexical fallback"""
+    if os.path.exists(os.path.join(model_dir, "model.onnx")):
+        try:
+            return CrossEncoder(model_dir)
+        except ImportError:
+            print("⚠️ onnxruntime/tokenizers not installed - using lexical reranking")
+    return LexicalScorer()
+
+
+class Reranker:
+    """Reorders the top-N candidates by the scorer; cached per (query, candidate id)"""
+
+    def __init__(self, enabled=RERANK_ENABLED, top_n=RERANK_TOP_N, max_entries=RERANK_CACHE_SIZE,
+                 scorer=None, version_file=INDEX_VERSION_FILE):
+        self.enabled = enabled
+        self.top_n = top_n
+        self.max_entries = max_entries
+        self.scorer = scorer
+        self.version_file = version_file
+        self.version = current_index_version(version_file)
+        self.entries: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.lock = threading.Lock()
+
+    def pool(self, top_k) -> int:
+        """How many candidates to retrieve for a top_k request"""
+        return max(top_k, self.top_n) if self.enabled else top_k
+
+    def _get_scorer(self):
+        with self.lock:
+            if self.scorer is None:
+                self.scorer = load_scorer()
+            return self.scorer
+
+    def _check_version(self):
+        version = current_index_version(self.version_file)
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    def rerank(self, query, results) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+        """(results, report) - the top-N candidates reordered by rerank score, the rest after them"""
+        results = list(results or [])
+        if not self.enabled or len(results) <= 1:
+            return results, None
+
+        start = time.perf_counter()
+        scorer = self._get_scorer()
+        head, tail = results[:self.top_n], results[self.top_n:]
+        normalized = normalize_question(query)
+
+        scores: List[Optional[float]] = []
+        with self.lock:
+            self._check_version()
+            for result in head:
+                key = (normalized, result.id)
+                score = self.entries.get(key)
+                if score is not None:
+                    self.entries.move_to_end(key)
+                scores.append(score)
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        if missing:
+            # One batched forward pass for every uncached candidate
+            fresh = scorer.score(query, [head[i] for i in missing])
+            with self.lock:
+                for i, score in zip(missing, fresh):
+                    scores[i] = float(score)
+                    self.entries[(normalized, head[i].id)] = float(score)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+        # The cache holds the scorer's own score only; the current retrieval score is blended in here
+        scores = [scorer.combine(result, score) for result, score in zip(head, scores)]
+        reranked = []
+        for result, score in sorted(zip(head, scores), key=lambda pair: pair[1], reverse=True):
+            result = copy.copy(result)
+            result.score = score
+            reranked.append(result)
+
+        seconds = time.perf_counter() - start
+        with self.lock:
+            self.queries += 1
+            self.hits += len(head) - len(missing)
+            self.misses += len(missing)
+            self.latencies.append(seconds)
+        return reranked + tail, {"model": scorer.model_id, "candidates": len(head),
+                                 "cached": len(head) - len(missing), "seconds": seconds,
+                                 "top_changed": reranked[0].id != head[0].id}
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            latencies = sorted(self.latencies)
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "model": self.scorer.model_id if self.scorer else None,
+                "queries": self.queries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "p50_ms": 1000 * latencies[len(latencies) // 2] if latencies else 0.0,
+                "p95_ms": 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+            }
+
+
+def print_rerank_report(report: Optional[Dict[str, Any]]):
+    if not report:
+        return
+    print(f"🔁 Reranked {report['candidates']} candidates with {report['model']} in "
+          f"{report['seconds'] * 1000:.1f}ms ({report['cached']} cached"
+          f"{', top hit changed' if report['top_changed'] else ''})")
+
+
+def print_rerank_stats(reranker: Reranker):
+    stats = reranker.stats()
+    if not stats["enabled"]:
+        print("🔁 Reranking disabled")
+        return
+    print(f"🔁 Rerank ({stats['model'] or 'not loaded'}): {stats['queries']} queries, "
+          f"p50 {stats['p50_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms, "
+          f"{stats['hits']} cached / {stats['misses']} scored ({stats['hit_rate']:.0%} hit rate)")
+
+
+if __name__ == "__main__":
+    import sys
+    from dotenv import load_dotenv
+    from local_vector import get_index
+
+    load_dotenv('.env.local')
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    query = " ".join(sys.argv[1:])
+    candidates = get_index().query(data=query, top_k=RERANK_TOP_N, include_metadata=True)
+    reranked, report = Reranker(enabled=True).rerank(query, candidates)
+    before = {r.id: rank for rank, r in enumerate(candidates, 1)}
+    print_rerank_report(report)
+    for rank, result in enumerate(reranked, 1):
+        title = (result.metadata or {}).get('title', '')
+        print(f"{rank}. (was {before[result.id]}) {result.id} ({result.score:.4f}): {title[:60]}")
@@ -2,11 +2,11 @@
 """
 Reset Upstash Vector Database
 Clears all vectors to allow fresh upload
+(run `python vector_snapshot.py export` first to be able to restore without re-embedding)
 """
 
-import os
 from dotenv import load_dotenv
-from upstash_vector import Index
+from local_vector import get_index
 
 # Load environment variables
 load_dotenv('.env.local')
@@ -15,10 +15,7 @@ def reset_database():
     """Reset the vector database"""
     try:
         # Initialize index
-        index = Index(
-            url=os.getenv('UPSTASH_VECTOR_REST_URL'),
-            token=os.getenv('UPSTASH_VECTOR_REST_TOKEN')
-        )
+        index = get_index()
         
         print("🔄 Resetting Upstash Vector database...")
         
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Retrieval Cache
+LRU + TTL cache of vector search results for rag_query, keyed by normalized
+question text, so repeated interview questions skip the vector round trip.
+
+Every write to the index (upsert/delete/reset through get_index(), twin_ingest,
+embed_digitaltwin.py) bumps a shared version file; cached results from an older
+version are discarded on the next lookup, even across processes.
+"""
+
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from qa_index import normalize_question
+
+# Constants
+INDEX_VERSION_FILE = "data/index_version"
+RETRIEVAL_CACHE_SIZE = int(os.getenv('RETRIEVAL_CACHE_SIZE', 256))
+RETRIEVAL_CACHE_TTL = float(os.getenv('RETRIEVAL_CACHE_TTL', 3600))
+
+
+def current_index_version(path=INDEX_VERSION_FILE) -> str:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def bump_index_version(path=INDEX_VERSION_FILE) -> str:
+    """Mark the vector index as changed; invalidates every retrieval cache"""
+    version = uuid.uuid4().hex
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_path, path)
+    return version
+
+
+class RetrievalCache:
+    """In-memory LRU of query results with per-entry TTL and index-version invalidation"""
+
+    def __init__(self, max_entries=RETRIEVAL_CACHE_SIZE, ttl=RETRIEVAL_CACHE_TTL,
+                 version_file=INDEX_VERSION_FILE):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_file = version_file
+        self.version = current_index_version(version_file)
+        self.entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(question, **params) -> Tuple:
+        return (normalize_question(question),) + tuple(sorted(params.items()))
+
+    def _check_version(self):
+        version = current_index_version(self.version_file)
+        if version != self.version:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.version = version
+
+    def get(self, question, **params) -> Optional[Any]:
+        key = self.key(question, **params)
+        with self.lock:
+            self._check_version()
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, question, results, **params):
+        key = self.key(question, **params)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, results)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
+def print_cache_stats(cache: RetrievalCache, label="Retrieval cache"):
+    stats = cache.stats()
+    print(f"📊 {label}: {stats['hits']} hits / {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} cached, "
+          f"{stats['evictions']} evicted, {stats['invalidations']} invalidated by index changes")
@@ -6,8 +6,12 @@ Focuses on common recruiter questions for entry-level tech positions
 
 import json
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profile_loader
+
 # 100 Comprehensive Recruiter Q&A Pairs
 RECRUITER_QA = [
     {
@@ -176,8 +180,7 @@ MORE_QA = [
 def load_current_data():
     """Load existing digital twin data"""
     try:
-        with open('data/digitaltwin.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return profile_loader.load_profile(fresh=True)
     except FileNotFoundError:
         print("Error: data/digitaltwin.json not found")
         return None
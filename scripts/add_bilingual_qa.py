@@ -4,9 +4,14 @@ Focus on: work abroad, technical skills, soft skills, work preferences
 All answers aligned with Lovely Pearl Alan's actual profile
 """
 
+import os
+import sys
 import json
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profile_loader
+
 # Bilingual Q&A pairs - English and Tagalog versions
 BILINGUAL_QA = [
     # WORKING ABROAD
@@ -211,8 +216,7 @@ BILINGUAL_QA = [
 
 def load_digital_twin_data():
     """Load existing digital twin data"""
-    with open('data/digitaltwin.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return profile_loader.load_profile(fresh=True)
 
 def save_digital_twin_data(data):
     """Save updated digital twin data"""
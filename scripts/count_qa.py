@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
-import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profile_loader
 
 # Count current Q&A
-with open('data/digitaltwin.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+categories = profile_loader.qa_categories()
 
-total = sum(len(v) for v in data.get('interview_qa', {}).get('categories', {}).values())
+total = sum(len(v) for v in categories.values())
 print(f"Current total interview Q&A pairs: {total}")
 
-categories = data.get('interview_qa', {}).get('categories', {})
 for cat, questions in categories.items():
     print(f"  {cat}: {len(questions)} questions")
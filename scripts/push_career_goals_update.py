@@ -4,30 +4,16 @@ Updates all career-related Q&A pairs to reflect AI Data Analyst focus
 """
 
 import os
-import json
-from dotenv import load_dotenv
-from upstash_vector import Index
+import sys
 
-# Load environment variables
-load_dotenv('.env.local')
-
-def get_upstash_index():
-    """Initialize Upstash Vector index"""
-    url = os.getenv('UPSTASH_VECTOR_REST_URL')
-    token = os.getenv('UPSTASH_VECTOR_REST_TOKEN')
-    
-    if not url or not token:
-        raise ValueError("Missing Upstash credentials")
-    
-    return Index(url=url, token=token)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import twin_ingest
 
 def push_career_goals_updates():
     """Push updated career goals Q&A to Upstash"""
     print("Starting upload of AI Data Analyst career goals updates...")
     print("=" * 80)
     
-    index = get_upstash_index()
-    
     # Career goals Q&A updates
     career_updates = [
         {
@@ -69,31 +55,25 @@ def push_career_goals_updates():
         }
     ]
     
-    success_count = 0
-    error_count = 0
-    
-    for item in career_updates:
-        try:
-            # Upsert to Upstash with metadata
-            index.upsert(
-                vectors=[{
-                    "id": item["id"],
-                    "data": f"Q: {item['question']}\nA: {item['answer']}",
-                    "metadata": {
-                        "type": "qa",
-                        "question": item["question"],
-                        "answer": item["answer"],
-                        "category": item["category"],
-                        "tags": ",".join(item.get("tags", [])),
-                        "language": item.get("language", "English")
-                    }
-                }]
-            )
-            print(f"✅ Updated: {item['id']}")
-            success_count += 1
-        except Exception as e:
-            print(f"❌ Error updating {item['id']}: {str(e)}")
-            error_count += 1
+    # Upsert to Upstash with metadata
+    report = twin_ingest.upsert(
+        {
+            "id": item["id"],
+            "data": f"Q: {item['question']}\nA: {item['answer']}",
+            "metadata": {
+                "type": "qa",
+                "question": item["question"],
+                "answer": item["answer"],
+                "category": item["category"],
+                "tags": ",".join(item.get("tags", [])),
+                "language": item.get("language", "English")
+            }
+        }
+        for item in career_updates
+    )
+    twin_ingest.print_report(report, label="career goals vectors")
+    success_count = report['succeeded']
+    error_count = report['failed']
     
     print("=" * 80)
     print(f"\n📊 Upload Summary:")
@@ -103,10 +83,10 @@ def push_career_goals_updates():
     
     # Get stats
     try:
-        info = index.info()
+        info = twin_ingest.info()
         print(f"\n📈 Current Upstash Vector Database Stats:")
-        print(f"   Total vectors: {info.total_vector_count}")
-        print(f"   Dimension: {info.dimension}")
+        print(f"   Total vectors: {info.get('vectorCount', 'N/A')}")
+        print(f"   Dimension: {info.get('dimension', 'N/A')}")
     except Exception as e:
         print(f"\n⚠️  Could not fetch database stats: {str(e)}")
     
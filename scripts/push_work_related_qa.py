@@ -4,17 +4,10 @@ Focus: Relocation, International Work, Career Preferences, Professional Scenario
 """
 
 import os
-from dotenv import load_dotenv
-from upstash_vector import Index
+import sys
 
-# Load environment variables
-load_dotenv('.env.local')
-
-# Initialize Upstash Vector client
-index = Index(
-    url=os.getenv('UPSTASH_VECTOR_REST_URL'),
-    token=os.getenv('UPSTASH_VECTOR_REST_TOKEN')
-)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import twin_ingest
 
 # 100 Work-Related Q&A vectors
 work_qa_vectors = [
@@ -277,25 +270,13 @@ work_qa_vectors = [
 
 print(f"Starting upload of {len(work_qa_vectors)} work-related Q&A vectors...")
 
-# Upload vectors in batches
-batch_size = 20
-total_uploaded = 0
-
-for i in range(0, len(work_qa_vectors), batch_size):
-    batch = work_qa_vectors[i:i + batch_size]
-    
-    # Prepare vectors for upload
-    vectors_to_upload = [
-        (vec["id"], vec["text"], vec["metadata"])
-        for vec in batch
-    ]
-    
-    try:
-        index.upsert(vectors=vectors_to_upload)
-        total_uploaded += len(batch)
-        print(f"✓ Uploaded batch {i//batch_size + 1}/{(len(work_qa_vectors) + batch_size - 1)//batch_size} ({total_uploaded} vectors)")
-    except Exception as e:
-        print(f"✗ Error uploading batch {i//batch_size + 1}: {str(e)}")
+# Upload all vectors in one pipelined run (batch size adapts to upload speed)
+report = twin_ingest.upsert(
+    (vec["id"], vec["text"], vec["metadata"])
+    for vec in work_qa_vectors
+)
+twin_ingest.print_report(report, label="vectors")
+total_uploaded = report['succeeded']
 
 print(f"\n{'='*60}")
 print(f"Upload Complete!")
@@ -312,9 +293,9 @@ print(f"{'='*60}")
 
 # Get info about the index
 try:
-    info = index.info()
+    info = twin_ingest.info()
     print(f"\nUpstash Vector Database Info:")
-    print(f"Total vectors in database: {info.get('total_vector_count', 'N/A')}")
+    print(f"Total vectors in database: {info.get('vectorCount', 'N/A')}")
     print(f"Dimension: {info.get('dimension', 'N/A')}")
 except Exception as e:
     print(f"Could not fetch index info: {str(e)}")
@@ -4,13 +4,17 @@ Add emphasis on AI and machine learning in data analysis
 Remove Software Engineer as alternative career path
 """
 
+import os
+import sys
 import json
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profile_loader
+
 def load_digital_twin_data():
     """Load existing digital twin data"""
-    with open('data/digitaltwin.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return profile_loader.load_profile(fresh=True)
 
 def save_digital_twin_data(data):
     """Save updated digital twin data"""
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Semantic Answer Cache
+Sits in front of retrieval + Groq generation: an incoming question is embedded
+and compared with the questions already answered; above a cosine threshold the
+stored answer is returned without any vector query or LLM call.
+
+- Seeded from interview_qa in data/digitaltwin.json (plus pending learned entries)
+- Size-bounded with least-recently-used eviction
+- SEMANTIC_CACHE=0 (or --no-semantic-cache in the chat scripts) bypasses it
+"""
+
+import os
+import time
+import threading
+from typing import Any, Dict, Iterable, Optional
+import numpy as np
+from embeddings import get_embedder
+from qa_index import normalize_question
+from profile_loader import get_profile
+
+# Constants
+JSON_FILE = "data/digitaltwin.json"
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE', '1') != '0'
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.92))
+SEMANTIC_CACHE_SIZE = int(os.getenv('SEMANTIC_CACHE_SIZE', 2000))
+
+
+class SemanticCache:
+    """Question-embedding similarity cache of generated answers"""
+
+    def __init__(self, threshold=SEMANTIC_CACHE_THRESHOLD, max_entries=SEMANTIC_CACHE_SIZE,
+                 enabled=SEMANTIC_CACHE_ENABLED, embedder=None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.embedder = embedder
+        self.questions = []
+        self.answers = []
+        self.last_used = []
+        self.rows: Dict[str, int] = {}
+        self.matrix = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+
+    def _embed(self, texts) -> np.ndarray:
+        if self.embedder is None:
+            self.embedder = get_embedder()
+        return np.asarray(self.embedder.embed(list(texts)), dtype=np.float32)
+
+    def seed(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Load question/answer entries in one embedding batch; later entries win"""
+        with self.lock:
+            if not self.enabled:
+                return 0
+            latest = {}
+            for entry in entries:
+                if entry.get("question") and entry.get("answer"):
+                    latest[normalize_question(entry["question"])] = (entry["question"], entry["answer"])
+            new = [(key, q, a) for key, (q, a) in latest.items() if key not in self.rows]
+            for key, (question, answer) in latest.items():
+                if key in self.rows:
+                    self.answers[self.rows[key]] = answer
+            if not new:
+                return 0
+
+            vectors = self._embed(q for _, q, _ in new)
+            now = time.monotonic()
+            for key, question, answer in new:
+                self.rows[key] = len(self.questions)
+                self.questions.append(question)
+                self.answers.append(answer)
+                self.last_used.append(now)
+            self.matrix = vectors if self.matrix is None else np.vstack([self.matrix, vectors])
+            self._evict()
+            return len(new)
+
+    def seed_from_profile(self, json_file=JSON_FILE, pending_entries: Iterable[Dict[str, Any]] = ()) -> int:
+        try:
+            entries = [entry for _, entry in get_profile(json_file).qa_entries]
+        except (FileNotFoundError, ValueError):
+            entries = []
+        return self.seed(entries + list(pending_entries))
+
+    def lookup(self, question) -> Optional[Dict[str, Any]]:
+        """Return the cached answer for the most similar known question, if above the threshold"""
+        with self.lock:
+            if not self.enabled or not self.questions:
+                return None
+
+            row = self.rows.get(normalize_question(question))
+            if row is not None:
+                similarity = 1.0
+            else:
+                similarities = self.matrix @ self._embed([question])[0]
+                row = int(np.argmax(similarities))
+                similarity = float(similarities[row])
+
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.last_used[row] = time.monotonic()
+            return {"question": self.questions[row], "answer": self.answers[row], "similarity": similarity}
+
+    def add(self, question, answer):
+        """Cache a freshly generated answer"""
+        with self.lock:
+            if not self.enabled:
+                return
+            key = normalize_question(question)
+            row = self.rows.get(key)
+            if row is not None:
+                self.answers[row] = answer
+                self.last_used[row] = time.monotonic()
+                return
+            self.seed([{"question": question, "answer": answer}])
+
+    def _evict(self):
+        overflow = len(self.questions) - self.max_entries
+        if overflow <= 0:
+            return
+        keep = sorted(np.argsort(self.last_used)[overflow:])
+        self.questions = [self.questions[i] for i in keep]
+        self.answers = [self.answers[i] for i in keep]
+        self.last_used = [self.last_used[i] for i in keep]
+        self.matrix = self.matrix[keep]
+        self.rows = {normalize_question(q): i for i, q in enumerate(self.questions)}
+        self.evictions += overflow
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.questions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "threshold": self.threshold
+        }
+
+
+def print_semantic_stats(cache: SemanticCache):
+    stats = cache.stats()
+    if not stats["enabled"]:
+        print("📊 Semantic cache: bypassed")
+        return
+    print(f"📊 Semantic cache: {stats['hits']} hits / {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} answers cached, "
+          f"threshold {stats['threshold']:.2f}, {stats['evictions']} evicted")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Request Coalescing
+When several callers ask for the same thing at the same moment (overlapping
+recruiter question sets in parallel practice sessions, the RAG service's
+worker pool, async evaluation runs), only the first caller performs the
+upstream call; the others wait for it and share its result or exception.
+
+Keys are the normalized question plus the parameters that change the result
+(top_k, model, temperature, ...), built with flight_key(). Nothing is cached
+after the call completes - that is the retrieval/semantic caches' job.
+"""
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+from qa_index import normalize_question
+
+
+def flight_key(text, **params) -> Tuple:
+    return (normalize_question(text),) + tuple(sorted(params.items()))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Counters:
+    def __init__(self, name):
+        self.name = name
+        self.executed = 0
+        self.coalesced = 0
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.executed + self.coalesced
+        return {
+            "name": self.name,
+            "requests": requests,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesce_rate": self.coalesced / requests if requests else 0.0
+        }
+
+
+class SingleFlight(_Counters):
+    """Thread-based coalescing: concurrent do() calls with the same key share one execution"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.lock = threading.Lock()
+        self.calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight(_Counters):
+    """asyncio version: concurrent awaits of the same key share one task"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+        self.waiters: Dict[asyncio.Future, int] = {}
+
+    async def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        future = self.calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.executed += 1
+            future = self.calls[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            future.add_done_callback(lambda done: self._forget(key, done))
+
+        self.waiters[future] = self.waiters.get(future, 0) + 1
+        try:
+            # shield: a cancelled waiter must not cancel the call the others still wait on
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if self.waiters[future] == 1 and not future.done():
+                # Last waiter gone: nobody needs the result, stop the upstream call
+                future.cancel()
+            raise
+        finally:
+            self.waiters[future] -= 1
+            if not self.waiters[future]:
+                del self.waiters[future]
+
+    def _forget(self, key, future):
+        if self.calls.get(key) is future:
+            del self.calls[key]
+
+
+def print_flight_stats(*flights):
+    for flight in flights:
+        stats = flight.stats()
+        print(f"📊 Single-flight {stats['name']}: {stats['executed']} upstream calls for "
+              f"{stats['requests']} requests ({stats['coalesced']} coalesced, {stats['coalesce_rate']:.0%})")
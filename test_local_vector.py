@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+LocalIndex regression checks (no network, no files on disk)
+
+Usage:
+  python test_local_vector.py      (or: python -m pytest test_local_vector.py)
+"""
+
+import numpy as np
+from embeddings import HashingEmbedder
+from local_vector import LocalIndex
+
+
+def new_index():
+    return LocalIndex(path=None, embed=HashingEmbedder().embed)
+
+
+def test_upsert_duplicate_new_id_in_one_batch():
+    index = new_index()
+    index.upsert([('a', 'hello world', {'n': 1}), ('a', 'hello there', {'n': 2})])
+
+    assert index.ids == ['a']
+    assert index.matrix.shape[0] == len(index.ids) == len(index.metadata) == len(index.data)
+    assert index.fetch(ids=['a'], include_metadata=True, include_data=True)[0].data == 'hello there'
+    assert index.query(data='hello there', top_k=1, include_metadata=True)[0].metadata == {'n': 2}
+
+
+def test_upsert_duplicate_mixed_with_existing_ids():
+    index = new_index()
+    index.upsert([('a', 'first', {}), ('b', 'second', {})])
+    index.upsert([('c', 'third', {}), ('a', 'first again', {}), ('c', 'third again', {})])
+
+    assert index.ids == ['a', 'b', 'c']
+    assert index.matrix.shape[0] == 3
+    assert [r.data for r in index.fetch(ids=['a', 'c'], include_data=True)] == ['first again', 'third again']
+
+
+def test_upsert_dimension_mismatch_leaves_index_unchanged():
+    index = new_index()
+    index.upsert([('a', 'hello world', {})])
+    try:
+        index.upsert([('b', np.ones(3).tolist(), {})])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("dimension mismatch was accepted")
+
+    assert index.ids == ['a'] and 'b' not in index.rows
+    assert index.matrix.shape[0] == 1
+
+
+def test_upsert_empty_batch():
+    index = new_index()
+    assert index.upsert([]) == "Success"
+    assert index.ids == []
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
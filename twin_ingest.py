@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Twin Ingest - Shared async ingestion for the Upstash Vector push scripts
+- One pooled httpx.AsyncClient per run
+- Adaptive batch sizing with bounded concurrency
+- Retry with jittered exponential backoff on 429/5xx
+- Optional local embeddings (TWIN_INGEST_LOCAL_EMBEDDINGS=1) for indexes created
+  with a custom dimension: text is embedded and cached on disk by embeddings.py
+  and sent as raw vectors instead of through the built-in model
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+from typing import Any, Dict, Iterable, List
+import httpx
+from dotenv import load_dotenv
+from retrieval_cache import bump_index_version
+
+# Load environment variables from .env.local
+load_dotenv('.env.local')
+
+# Constants
+UPSTASH_MAX_BATCH = 1000
+DEFAULT_CONCURRENCY = int(os.getenv('TWIN_INGEST_CONCURRENCY', 4))
+DEFAULT_BATCH_SIZE = int(os.getenv('TWIN_INGEST_BATCH_SIZE', 50))
+MAX_BATCH_BYTES = int(os.getenv('TWIN_INGEST_MAX_BATCH_BYTES', 1024 * 1024))
+MAX_RETRIES = int(os.getenv('TWIN_INGEST_MAX_RETRIES', 5))
+LOCAL_EMBEDDINGS = os.getenv('TWIN_INGEST_LOCAL_EMBEDDINGS', '0') == '1'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+TARGET_BATCH_SECONDS = 2.0
+
+
+class IngestError(Exception):
+    """Raised when an Upstash request fails after all retries"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def to_record(vector) -> Dict[str, Any]:
+    """Normalize a tuple or dict vector into an Upstash REST record"""
+    if isinstance(vector, (tuple, list)):
+        vector_id, payload = vector[0], vector[1]
+        metadata = vector[2] if len(vector) > 2 else {}
+        key = 'data' if isinstance(payload, str) else 'vector'
+        return {'id': vector_id, key: payload, 'metadata': metadata or {}}
+
+    record = {'id': vector['id'], 'metadata': vector.get('metadata') or {}}
+    if vector.get('vector') is not None:
+        record['vector'] = list(vector['vector'])
+        if vector.get('data') is not None:
+            record['data'] = vector['data']
+    else:
+        record['data'] = vector.get('data', vector.get('text', ''))
+    return record
+
+
+def embed_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach locally computed (disk-cached) vectors to text records, keeping the text as data"""
+    from embeddings import embed
+
+    pending = [record for record in records if 'vector' not in record]
+    if pending:
+        for record, vector in zip(pending, embed(record['data'] for record in pending)):
+            record['vector'] = vector.tolist()
+    return records
+
+
+class BatchSizer:
+    """Grows the batch size while uploads are fast, halves it on failure"""
+
+    def __init__(self, initial=DEFAULT_BATCH_SIZE, minimum=1, maximum=UPSTASH_MAX_BATCH,
+                 target_seconds=TARGET_BATCH_SECONDS):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.size = max(minimum, min(initial, maximum))
+
+    def success(self, seconds):
+        if seconds < self.target_seconds / 2:
+            self.size = min(self.maximum, self.size * 2)
+        elif seconds > self.target_seconds:
+            self.size = max(self.minimum, self.size // 2)
+
+    def failure(self):
+        self.size = max(self.minimum, self.size // 2)
+
+
+class TwinIngest:
+    """Async Upstash Vector REST client used by every ingestion entry point"""
+
+    def __init__(self, url=None, token=None, concurrency=DEFAULT_CONCURRENCY,
+                 batch_size=DEFAULT_BATCH_SIZE, max_batch_bytes=MAX_BATCH_BYTES,
+                 max_retries=MAX_RETRIES, timeout=30.0, local_embeddings=LOCAL_EMBEDDINGS):
+        self.url = (url or os.getenv('UPSTASH_VECTOR_REST_URL') or '').rstrip('/')
+        self.token = token or os.getenv('UPSTASH_VECTOR_REST_TOKEN')
+        if not self.url or not self.token:
+            raise ValueError("Missing Upstash credentials (UPSTASH_VECTOR_REST_URL / UPSTASH_VECTOR_REST_TOKEN)")
+
+        self.concurrency = max(1, concurrency)
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.local_embeddings = local_embeddings
+        self.client = None
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            base_url=self.url,
+            headers={'Authorization': f'Bearer {self.token}'},
+            limits=httpx.Limits(max_connections=self.concurrency,
+                                max_keepalive_connections=self.concurrency),
+            timeout=self.timeout
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+
+    async def request(self, path, payload=None, method='POST'):
+        """Send one request, retrying 429/5xx and network errors with jittered backoff"""
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, f"/{path.lstrip('/')}", json=payload)
+                if response.status_code == 200:
+                    return response.json().get('result')
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise IngestError(f"HTTP {response.status_code} - {response.text}", response.status_code)
+                retry_after = response.headers.get('Retry-After')
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise IngestError(f"Network error: {e}") from e
+                retry_after = None
+
+            attempt += 1
+            delay = random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+
+    async def upsert(self, vectors: Iterable, endpoint=None) -> Dict[str, Any]:
+        """Upsert vectors in adaptive, concurrently pipelined batches"""
+        records = [to_record(vector) for vector in vectors]
+        if self.local_embeddings:
+            records = embed_records(records)
+        # Records that carry vectors (given, or embedded locally above) must skip server-side embedding,
+        # whatever endpoint the caller asked for
+        if records and all('vector' in r for r in records):
+            endpoint = 'upsert'
+        elif endpoint is None:
+            endpoint = 'upsert-data'
+
+        sizer = BatchSizer(initial=self.batch_size)
+        report = new_report(len(records))
+        position = 0
+        batch_no = 0
+
+        def next_batch():
+            nonlocal position, batch_no
+            if position >= len(records):
+                return None, None
+            batch, batch_bytes = [], 2
+            while position < len(records) and len(batch) < sizer.size:
+                size = len(json.dumps(records[position], ensure_ascii=False).encode('utf-8')) + 1
+                if batch and batch_bytes + size > self.max_batch_bytes:
+                    break
+                batch.append(records[position])
+                batch_bytes += size
+                position += 1
+            batch_no += 1
+            return batch_no, batch
+
+        async def worker():
+            while True:
+                number, batch = next_batch()
+                if batch is None:
+                    return
+                start = time.perf_counter()
+                try:
+                    await self.request(endpoint, batch)
+                    seconds = time.perf_counter() - start
+                    sizer.success(seconds)
+                    record_batch(report, number, batch, seconds)
+                except IngestError as e:
+                    sizer.failure()
+                    record_batch(report, number, batch, time.perf_counter() - start, error=str(e))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        report['seconds'] = time.perf_counter() - start
+        report['batches'].sort(key=lambda b: b['batch'])
+        if report['succeeded']:
+            bump_index_version()
+        return report
+
+    async def delete(self, ids: Iterable[str]) -> Dict[str, Any]:
+        """Delete vectors by ID in concurrent batches of up to 1000"""
+        ids = list(ids)
+        report = new_report(len(ids))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def delete_batch(number, batch):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    await self.request('delete', batch)
+                    record_batch(report, number, batch, time.perf_counter() - start)
+                except IngestError as e:
+                    record_batch(report, number, batch, time.perf_counter() - start, error=str(e))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            delete_batch(number, ids[i:i + UPSTASH_MAX_BATCH])
+            for number, i in enumerate(range(0, len(ids), UPSTASH_MAX_BATCH), 1)
+        ))
+        report['seconds'] = time.perf_counter() - start
+        report['batches'].sort(key=lambda b: b['batch'])
+        if report['succeeded']:
+            bump_index_version()
+        return report
+
+    async def query(self, data, top_k=3, include_metadata=True, filter=None) -> List[Dict[str, Any]]:
+        """Query by text using Upstash's built-in embedding model (or a cached local embedding)"""
+        payload = {'topK': top_k, 'includeMetadata': include_metadata}
+        if filter:
+            payload['filter'] = filter
+        if self.local_embeddings:
+            from embeddings import embed
+            payload['vector'] = embed([data])[0].tolist()
+            return await self.request('query', payload) or []
+        payload['data'] = data
+        return await self.request('query-data', payload) or []
+
+    async def info(self) -> Dict[str, Any]:
+        """Fetch index statistics"""
+        return await self.request('info', method='GET') or {}
+
+
+def new_report(total):
+    return {'total': total, 'succeeded': 0, 'failed': 0, 'batches': [], 'errors': [], 'seconds': 0.0}
+
+
+def record_batch(report, number, batch, seconds, error=None):
+    ids = [item['id'] if isinstance(item, dict) else item for item in batch]
+    report['batches'].append({'batch': number, 'ids': ids, 'count': len(ids),
+                              'seconds': seconds, 'ok': error is None, 'error': error})
+    if error is None:
+        report['succeeded'] += len(ids)
+    else:
+        report['failed'] += len(ids)
+        report['errors'].append(f"Batch {number} ({len(ids)} vectors): {error}")
+
+
+def print_report(report, label="vectors"):
+    """Print a per-batch summary of an upsert or delete run"""
+    for batch in report['batches']:
+        status = "✅" if batch['ok'] else "❌"
+        print(f"{status} Batch {batch['batch']}: {batch['count']} {label} in {batch['seconds']:.2f}s")
+    rate = report['succeeded'] / report['seconds'] if report['seconds'] > 0 else 0.0
+    print(f"\n📊 {label[:1].upper() + label[1:]}: {report['succeeded']}/{report['total']} succeeded "
+          f"in {len(report['batches'])} batch(es), {report['seconds']:.2f}s ({rate:.1f}/sec)")
+    for error in report['errors']:
+        print(f"   ❌ {error}")
+
+
+async def _run(method, *args, options=None, **kwargs):
+    async with TwinIngest(**(options or {})) as ingest:
+        return await getattr(ingest, method)(*args, **kwargs)
+
+
+def upsert(vectors, endpoint=None, **options):
+    """Synchronous entry point: upsert vectors in one pipelined run"""
+    return asyncio.run(_run('upsert', vectors, endpoint=endpoint, options=options))
+
+
+def delete(ids, **options):
+    """Synchronous entry point: delete vectors by ID"""
+    return asyncio.run(_run('delete', ids, options=options))
+
+
+def query(data, top_k=3, include_metadata=True, filter=None, **options):
+    """Synchronous entry point: text query"""
+    return asyncio.run(_run('query', data, top_k=top_k, include_metadata=include_metadata,
+                            filter=filter, options=options))
+
+
+def info(**options):
+    """Synchronous entry point: index statistics"""
+    return asyncio.run(_run('info', options=options))
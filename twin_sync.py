@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Twin Sync - Content-hash incremental sync for the Q&A push scripts
+Keeps a local manifest (id -> content hash -> last pushed timestamp) per source
+so only added or changed pairs are re-embedded, and vanished pairs are deleted.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+import twin_ingest
+
+# Constants
+MANIFEST_FILE = "data/sync_manifest.json"
+VOLATILE_METADATA_KEYS = {"timestamp", "updated_at", "added_date", "pushed_at"}
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Hash the embedded text plus stable metadata of a vector record"""
+    metadata = {k: v for k, v in (record.get('metadata') or {}).items()
+                if k not in VOLATILE_METADATA_KEYS}
+    payload = json.dumps({'data': record.get('data'), 'vector': record.get('vector'), 'metadata': metadata},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SyncManifest:
+    """Local record of what each source last pushed to the vector database"""
+
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        self.sources = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.sources = json.load(f).get('sources', {})
+
+    def entries(self, source) -> Dict[str, Dict[str, str]]:
+        return self.sources.setdefault(source, {})
+
+    def diff(self, source, records: List[Dict[str, Any]]) -> Dict[str, list]:
+        """Split records into added/changed/unchanged and list IDs no longer present"""
+        known = self.entries(source)
+        result = {'added': [], 'changed': [], 'unchanged': [], 'removed': []}
+        seen = set()
+
+        for record in records:
+            seen.add(record['id'])
+            entry = known.get(record['id'])
+            if entry is None:
+                result['added'].append(record)
+            elif entry['hash'] != content_hash(record):
+                result['changed'].append(record)
+            else:
+                result['unchanged'].append(record)
+
+        result['removed'] = [vector_id for vector_id in known if vector_id not in seen]
+        return result
+
+    def mark_pushed(self, source, records: Iterable[Dict[str, Any]]):
+        known = self.entries(source)
+        pushed_at = datetime.now().isoformat()
+        for record in records:
+            known[record['id']] = {'hash': content_hash(record), 'pushed_at': pushed_at}
+
+    def forget(self, source, ids: Iterable[str]):
+        known = self.entries(source)
+        for vector_id in ids:
+            known.pop(vector_id, None)
+
+    def save(self):
+        """Write the manifest atomically so an interrupted run never corrupts it"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({'version': 1, 'sources': self.sources}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def succeeded_ids(report) -> set:
+    return {vector_id for batch in report['batches'] if batch['ok'] for vector_id in batch['ids']}
+
+
+def sync(source, vectors, dry_run=False, manifest_path=MANIFEST_FILE, endpoint=None, **options) -> Dict[str, Any]:
+    """Push only added/changed vectors for a source and delete the ones that disappeared
+    (endpoint applies to the upsert only; options are TwinIngest settings for both)"""
+    records = [twin_ingest.to_record(vector) for vector in vectors]
+    manifest = SyncManifest(manifest_path)
+    diff = manifest.diff(source, records)
+    to_push = diff['added'] + diff['changed']
+
+    print(f"🔎 Sync plan for '{source}': {len(diff['added'])} added, {len(diff['changed'])} changed, "
+          f"{len(diff['unchanged'])} unchanged, {len(diff['removed'])} removed")
+
+    summary = {'source': source, 'pushed': 0, 'deleted': 0, 'skipped': len(diff['unchanged']),
+               'errors': [], 'dry_run': dry_run}
+
+    if not records and diff['removed'] and not dry_run:
+        # An empty or unreadable source would otherwise wipe every vector it ever pushed
+        print(f"❌ No vectors given for '{source}' - refusing to delete {len(diff['removed'])} vectors")
+        summary['errors'].append(f"Empty source '{source}'; sync aborted")
+        return summary
+
+    if dry_run:
+        for record in to_push:
+            print(f"   ⬆️  would push {record['id']}")
+        for vector_id in diff['removed']:
+            print(f"   🗑️  would delete {vector_id}")
+        return summary
+
+    if to_push:
+        report = twin_ingest.upsert(to_push, endpoint=endpoint, **options)
+        twin_ingest.print_report(report, label="Q&A pairs pushed")
+        ok_ids = succeeded_ids(report)
+        manifest.mark_pushed(source, (r for r in to_push if r['id'] in ok_ids))
+        summary['pushed'] = report['succeeded']
+        summary['errors'].extend(report['errors'])
+
+    if diff['removed']:
+        report = twin_ingest.delete(diff['removed'], **options)
+        twin_ingest.print_report(report, label="stale vectors deleted")
+        manifest.forget(source, succeeded_ids(report))
+        summary['deleted'] = report['succeeded']
+        summary['errors'].extend(report['errors'])
+
+    manifest.save()
+    print(f"✅ Sync complete: {summary['pushed']} pushed, {summary['deleted']} deleted, "
+          f"{summary['skipped']} unchanged pairs skipped")
+    return summary
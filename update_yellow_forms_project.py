@@ -4,27 +4,24 @@ Update Yellow Forms project information in Upstash Vector database
 Removes fictional OOP content and adds correct project details
 """
 
-from upstash_vector import Index
+from local_vector import get_index
+from vector_gc import delete_in_batches
 from dotenv import load_dotenv
-import os
-import json
+import profile_loader
 
 # Load environment variables
 load_dotenv('.env.local')
 
-# Initialize Upstash Vector
-index = Index.from_env()
+# Initialize the vector index
+index = get_index()
 
 def update_yellow_forms_project():
     """Update the Yellow Forms project vector with correct information"""
     
     # Load the updated digitaltwin.json to get the correct project info
-    with open('data/digitaltwin.json', 'r', encoding='utf-8') as f:
-        profile = json.load(f)
-    
     # Find the Yellow Forms project in the projects array
     yellow_forms_project = None
-    for project in profile.get('projects', []):
+    for project in profile_loader.projects():
         if 'Yellow Forms' in project.get('title', ''):
             yellow_forms_project = project
             break
@@ -77,7 +74,7 @@ def update_yellow_forms_project():
     try:
         # Delete the old vector if it exists
         print(f"🗑️  Deleting old vector: {vector_id}")
-        index.delete(ids=[vector_id])
+        delete_in_batches(index, [vector_id])
         print("✅ Old vector deleted")
     except Exception as e:
         print(f"ℹ️  No existing vector to delete: {e}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Vector Garbage Collection
+Walks the whole index with the paginated range API, selects stale vectors by
+predicate and deletes them in large batches - no more one-off cleanup scripts
+issuing one delete per ID.
+
+Predicates (all given predicates must match):
+  --prefix P            vector ID starts with P (pushed down into range)
+  --id-regex R          vector ID matches regex R
+  --type T              metadata type equals T (e.g. interview_qa, correction_update)
+  --category C          metadata category equals C
+  --older-than DATE     timestamp/added_date/updated_at in metadata before DATE (ISO date or "30d")
+  --not-in-manifest [S] ID missing from the sync manifest (any source, or source S)
+  --match R             regex R matches the stored text or any metadata value (case-insensitive)
+
+Usage:
+  python vector_gc.py --type correction_update --match "Team Leader and Developer" --dry-run
+  python vector_gc.py --prefix qa_ --older-than 90d --yes
+"""
+
+import re
+import sys
+import json
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from dotenv import load_dotenv
+from local_vector import get_index
+from twin_sync import SyncManifest, MANIFEST_FILE
+
+# Load environment variables
+load_dotenv('.env.local')
+
+# Constants
+RANGE_PAGE_SIZE = 1000
+DELETE_BATCH_SIZE = 1000
+TIMESTAMP_KEYS = ("timestamp", "updated_at", "added_date", "pushed_at", "created_at")
+
+
+def iter_vectors(index, prefix=None, page_size=RANGE_PAGE_SIZE, include_vectors=False) -> Iterator[Any]:
+    """Yield every vector (with metadata and data) using the paginated range API"""
+    cursor = ""
+    while True:
+        options = {"prefix": prefix} if prefix else {}
+        page = index.range(cursor=cursor, limit=page_size, include_vectors=include_vectors,
+                           include_metadata=True, include_data=True, **options)
+        yield from page.vectors
+        cursor = page.next_cursor
+        if not cursor:
+            return
+
+
+def parse_cutoff(value) -> datetime:
+    """'2025-10-01' or a relative age like '30d'"""
+    match = re.fullmatch(r"(\d+)d", value)
+    if match:
+        return datetime.now() - timedelta(days=int(match.group(1)))
+    return datetime.fromisoformat(value)
+
+
+def vector_timestamp(metadata) -> Optional[datetime]:
+    for key in TIMESTAMP_KEYS:
+        value = metadata.get(key)
+        if value:
+            try:
+                return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+            except ValueError:
+                continue
+    return None
+
+
+def build_predicates(criteria: Dict[str, Any]) -> List[tuple]:
+    """(reason, predicate(vector, metadata)) pairs for the given criteria"""
+    predicates = []
+    if criteria.get("id_regex"):
+        pattern = re.compile(criteria["id_regex"])
+        predicates.append((f"id ~ {pattern.pattern}", lambda v, m: bool(pattern.search(v.id))))
+    if criteria.get("type"):
+        predicates.append((f"type = {criteria['type']}", lambda v, m: m.get("type") == criteria["type"]))
+    if criteria.get("category"):
+        predicates.append((f"category = {criteria['category']}",
+                           lambda v, m: m.get("category") == criteria["category"]))
+    if criteria.get("older_than"):
+        cutoff = parse_cutoff(criteria["older_than"])
+
+        def older(v, m):
+            stamp = vector_timestamp(m)
+            return stamp is not None and stamp < cutoff
+        predicates.append((f"older than {cutoff.date()}", older))
+    if "not_in_manifest" in criteria:
+        manifest = SyncManifest(criteria.get("manifest", MANIFEST_FILE))
+        source = criteria["not_in_manifest"]
+        sources = [manifest.entries(source)] if source else list(manifest.sources.values())
+        known = {vector_id for entries in sources for vector_id in entries}
+        predicates.append((f"not in manifest{f' ({source})' if source else ''}", lambda v, m: v.id not in known))
+    if criteria.get("match"):
+        pattern = re.compile(criteria["match"], re.IGNORECASE)
+        predicates.append((f"matches /{pattern.pattern}/", lambda v, m: bool(
+            pattern.search(v.data or "") or pattern.search(json.dumps(m, ensure_ascii=False)))))
+    return predicates
+
+
+def find_stale(index, criteria: Dict[str, Any]) -> Dict[str, Any]:
+    predicates = build_predicates(criteria)
+    if not predicates and not criteria.get("prefix"):
+        raise ValueError("Refusing to collect without at least one predicate")
+
+    scanned, stale = 0, []
+    for vector in iter_vectors(index, prefix=criteria.get("prefix")):
+        scanned += 1
+        metadata = vector.metadata or {}
+        if all(predicate(vector, metadata) for _, predicate in predicates):
+            stale.append(vector)
+    return {"scanned": scanned, "stale": stale, "reasons": [reason for reason, _ in predicates]}
+
+
+def delete_in_batches(index, ids: List[str], batch_size=DELETE_BATCH_SIZE) -> int:
+    deleted = 0
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        result = index.delete(ids=batch)
+        deleted += getattr(result, "deleted", len(batch))
+        print(f"🗑️  Batch {start // batch_size + 1}: deleted {len(batch)} vectors")
+    return deleted
+
+
+def gc(criteria: Dict[str, Any], dry_run=False, confirm: Optional[Callable[[str], str]] = input, index=None):
+    index = index or get_index()
+    result = find_stale(index, criteria)
+    stale = result["stale"]
+    conditions = result["reasons"] + ([f"prefix {criteria['prefix']}"] if criteria.get("prefix") else [])
+    print(f"🔎 Scanned {result['scanned']} vectors; {len(stale)} match: {' AND '.join(conditions)}")
+
+    for vector in stale[:50 if not dry_run else None]:
+        title = (vector.metadata or {}).get("title") or (vector.metadata or {}).get("question", "")
+        print(f"   {'would delete' if dry_run else '🗑️ '} {vector.id}  {str(title)[:60]}")
+    if not dry_run and len(stale) > 50:
+        print(f"   ... and {len(stale) - 50} more")
+
+    if dry_run or not stale:
+        return {"scanned": result["scanned"], "matched": len(stale), "deleted": 0, "dry_run": dry_run}
+
+    if confirm and confirm(f"Delete {len(stale)} vectors? (yes/no): ").lower() != "yes":
+        print("❌ Garbage collection cancelled")
+        return {"scanned": result["scanned"], "matched": len(stale), "deleted": 0, "dry_run": dry_run}
+
+    deleted = delete_in_batches(index, [vector.id for vector in stale])
+    print(f"✅ Deleted {deleted} stale vectors")
+    return {"scanned": result["scanned"], "matched": len(stale), "deleted": deleted, "dry_run": dry_run}
+
+
+def main():
+    args = sys.argv[1:]
+    criteria: Dict[str, Any] = {}
+    dry_run = False
+    confirm = input
+    value_flags = {"--prefix": "prefix", "--id-regex": "id_regex", "--type": "type", "--category": "category",
+                   "--older-than": "older_than", "--match": "match", "--manifest": "manifest"}
+    while args:
+        arg = args.pop(0)
+        if arg in value_flags:
+            criteria[value_flags[arg]] = args.pop(0)
+        elif arg == "--not-in-manifest":
+            criteria["not_in_manifest"] = args.pop(0) if args and not args[0].startswith("--") else None
+        elif arg == "--dry-run":
+            dry_run = True
+        elif arg == "--yes":
+            confirm = None
+        else:
+            print(__doc__)
+            return
+
+    try:
+        gc(criteria, dry_run=dry_run, confirm=confirm)
+    except ValueError as e:
+        print(f"❌ {e}")
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
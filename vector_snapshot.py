@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Vector Snapshots
+Exports the whole vector namespace (id, embedding, metadata, text) to a compact
+local snapshot and restores it with bulk upserts of the raw vectors - no
+re-embedding, so a reset or migration takes seconds instead of a full re-upload.
+
+Snapshot layout (data/snapshots/<name>/):
+  vectors.npy        float32 matrix, one row per vector
+  columns.json.gz    columnar ids / data / metadata (one list per metadata key)
+  snapshot.json      backend, dimension, count and creation time
+
+Usage:
+  python vector_snapshot.py export [name]              - Snapshot the configured index
+  python vector_snapshot.py restore <name|dir> [--reset] - Bulk-upsert a snapshot
+  python vector_snapshot.py list                       - Show available snapshots
+"""
+
+import os
+import sys
+import gzip
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+import numpy as np
+from dotenv import load_dotenv
+from local_vector import get_index
+from vector_gc import iter_vectors
+
+# Load environment variables
+load_dotenv('.env.local')
+
+# Constants
+SNAPSHOT_DIR = "data/snapshots"
+RESTORE_BATCH_SIZE = 1000
+_MISSING = "__missing__"
+
+
+def snapshot_path(name) -> str:
+    return name if os.path.isdir(name) else os.path.join(SNAPSHOT_DIR, name)
+
+
+def to_columns(metadata: List[Dict[str, Any]]) -> Dict[str, list]:
+    """Row dicts -> one list per key; absent keys are marked so they are not restored as null"""
+    keys = sorted({key for row in metadata for key in row})
+    return {key: [row.get(key, _MISSING) for row in metadata] for key in keys}
+
+
+def from_columns(columns: Dict[str, list], count) -> List[Dict[str, Any]]:
+    rows = [{} for _ in range(count)]
+    for key, values in columns.items():
+        for row, value in zip(rows, values):
+            if value != _MISSING:
+                row[key] = value
+    return rows
+
+
+def export_snapshot(name=None, index=None) -> str:
+    index = index or get_index()
+    name = name or datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = snapshot_path(name)
+
+    ids, data, metadata, rows = [], [], [], []
+    for vector in iter_vectors(index, include_vectors=True):
+        ids.append(vector.id)
+        data.append(vector.data)
+        metadata.append(vector.metadata or {})
+        rows.append(vector.vector)
+    if not rows:
+        raise ValueError("Index is empty - nothing to snapshot")
+    vectors = np.asarray(rows, dtype=np.float32)
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "vectors.npy"), vectors)
+    with gzip.open(os.path.join(path, "columns.json.gz"), "wt", encoding="utf-8") as f:
+        json.dump({"ids": ids, "data": data, "metadata": to_columns(metadata)}, f, ensure_ascii=False)
+    with open(os.path.join(path, "snapshot.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(),
+            "backend": getattr(index, "backend", "upstash"),
+            "count": len(ids),
+            "dimension": int(vectors.shape[1]),
+        }, f, indent=2)
+
+    size = sum(os.path.getsize(os.path.join(path, file)) for file in os.listdir(path))
+    print(f"✅ Exported {len(ids)} vectors ({vectors.shape[1]} dims) to {path} ({size / 1024:.1f} KB)")
+    return path
+
+
+def load_snapshot(name) -> Dict[str, Any]:
+    path = snapshot_path(name)
+    with open(os.path.join(path, "snapshot.json"), "r", encoding="utf-8") as f:
+        info = json.load(f)
+    with gzip.open(os.path.join(path, "columns.json.gz"), "rt", encoding="utf-8") as f:
+        columns = json.load(f)
+    info["ids"] = columns["ids"]
+    info["data"] = columns["data"]
+    info["metadata"] = from_columns(columns["metadata"], len(columns["ids"]))
+    info["vectors"] = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+    return info
+
+
+def restore_snapshot(name, reset=False, index=None, batch_size=RESTORE_BATCH_SIZE) -> int:
+    snapshot = load_snapshot(name)
+    index = index or get_index()
+
+    dimension = getattr(index.info(), "dimension", 0)
+    if dimension and snapshot["count"] and dimension != snapshot["dimension"]:
+        raise ValueError(f"Snapshot has {snapshot['dimension']}-dim vectors but the index expects {dimension}")
+    if reset:
+        index.reset()
+        print("🔄 Index reset")
+
+    records = [
+        {"id": vector_id, "vector": snapshot["vectors"][row].tolist(),
+         "metadata": snapshot["metadata"][row], "data": snapshot["data"][row]}
+        for row, vector_id in enumerate(snapshot["ids"])
+    ]
+    if getattr(index, "backend", "upstash") == "upstash":
+        import twin_ingest
+
+        report = twin_ingest.upsert(records, endpoint="upsert")
+        twin_ingest.print_report(report)
+        return report["succeeded"]
+
+    for start in range(0, len(records), batch_size):
+        index.upsert(vectors=records[start:start + batch_size])
+    print(f"✅ Restored {len(records)} vectors from {snapshot_path(name)}")
+    return len(records)
+
+
+def list_snapshots():
+    if not os.path.isdir(SNAPSHOT_DIR):
+        print("📭 No snapshots yet")
+        return
+    for name in sorted(os.listdir(SNAPSHOT_DIR)):
+        try:
+            with open(os.path.join(SNAPSHOT_DIR, name, "snapshot.json"), "r", encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            continue
+        print(f"📦 {name}: {info['count']} vectors, {info['dimension']} dims, "
+              f"{info['backend']} @ {info['created_at'][:19]}")
+
+
+def main():
+    args = sys.argv[1:]
+    command = args.pop(0) if args else ""
+    try:
+        if command == "export":
+            export_snapshot(args[0] if args else None)
+        elif command == "restore" and args:
+            restore_snapshot(args[0], reset="--reset" in args[1:])
+        elif command == "list":
+            list_snapshots()
+        else:
+            print(__doc__)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,12 @@
-import os
-from upstash_vector import Index
+from local_vector import get_index
+from vector_gc import delete_in_batches
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv('.env.local')
 
-# Initialize Upstash Vector
-index = Index(
-    url=os.getenv('UPSTASH_VECTOR_REST_URL'),
-    token=os.getenv('UPSTASH_VECTOR_REST_TOKEN')
-)
+# Initialize the vector index (Upstash by default, VECTOR_BACKEND=local for the in-process index)
+index = get_index()
 
 # Search for any remaining vectors with "Developer" in TechFusion context
 print("=" * 80)
@@ -57,12 +54,13 @@ if vectors_to_delete:
     print("=" * 80)
     
     for vector_id in vectors_to_delete:
-        try:
-            print(f"🗑️  Deleting: {vector_id}")
-            index.delete(ids=[vector_id])
-            print(f"   ✅ Deleted")
-        except Exception as e:
-            print(f"   ❌ Error: {str(e)}")
+        print(f"🗑️  Deleting: {vector_id}")
+    try:
+        # One batched request instead of one delete per ID
+        deleted = delete_in_batches(index, vectors_to_delete)
+        print(f"   ✅ Deleted {deleted} vectors")
+    except Exception as e:
+        print(f"   ❌ Error: {str(e)}")
 else:
     print("=" * 80)
     print("✅ NO OLD VECTORS FOUND - All TechFusion answers are corrected!")